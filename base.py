@@ -6,6 +6,7 @@ import pandas as pd
 from datetime import datetime, timezone
 import uuid
 import hashlib
+import inspect
 
 # print current location
 print(f"current location: {os.getcwd()}")
@@ -23,8 +24,19 @@ TIMER_FORMAT = '%Y-%m-%d %H:%M:%S'
 
 def decorator_timer(func):
     """
-    function runtime timer
+    function runtime timer, coroutine functions are timed until awaited completion,
+    returned generators are timed until consumed or closed
     """
+    def generator_wrapper(generator, f_start):
+
+        try:
+            yield from generator
+
+        finally:
+            # end timer
+            f_end = datetime.now()
+            print(f"{f_start.strftime(TIMER_FORMAT)} - {func.__name__} completed in {f_end - f_start} s")
+
     def wrapper(*args, **kwargs):
         
         # start timer
@@ -34,13 +46,32 @@ def decorator_timer(func):
         # run function
         x = func(*args, **kwargs)
 
+        # lazy results are timed while they are consumed
+        if inspect.isgenerator(x):
+            return generator_wrapper(x, f_start)
+
         # end timer
         f_end = datetime.now()
         print(f"{f_start.strftime(TIMER_FORMAT)} - {func.__name__} completed in {f_end - f_start} s")
 
         return x
     
-    return wrapper
+    async def async_wrapper(*args, **kwargs):
+        
+        # start timer
+        f_start = datetime.now()
+        print(f"{f_start.strftime(TIMER_FORMAT)} - {func.__name__} started")
+
+        # run coroutine
+        x = await func(*args, **kwargs)
+
+        # end timer
+        f_end = datetime.now()
+        print(f"{f_start.strftime(TIMER_FORMAT)} - {func.__name__} completed in {f_end - f_start} s")
+
+        return x
+
+    return async_wrapper if inspect.iscoroutinefunction(func) else wrapper
 
 
 #############################################################################
@@ -1,17 +1,155 @@
 from dept.base import *
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from time import perf_counter
+import threading
+import queue
+import math
+import gzip
+import zlib
+import io
 import boto3
 
+#############################################################################
+# VARIABLES
+#############################################################################
+
+# botocore client defaults, overridable per connection config
+AWS_CLIENT_DEFAULTS = {
+    "max_pool_connections": 10,
+    "max_attempts": 5,
+    "retry_mode": "standard",
+    "connect_timeout": 60,
+    "read_timeout": 60
+}
+
+# S3 transfer defaults of bulk transfers, overridable per call
+S3_TRANSFER_DEFAULTS = {
+    "multipart_threshold": 8388608,
+    "multipart_chunksize": 8388608,
+    "max_concurrency": 4,
+    "use_threads": True
+}
+
+# number of objects transferred concurrently by bulk transfers
+S3_TRANSFER_WORKERS = 16
+
+# S3 multipart upload part size, S3 requires at least 5 MiB for all but the last part
+S3_PART_SIZE = 67108864
+
+# number of parts uploaded concurrently while the next part is serialized
+S3_UPLOAD_CONCURRENCY = 4
+
+# number of bytes read from an S3 object body per streamed slice
+S3_READ_SIZE = 8388608
+
+# minimum number of bytes fetched per byte-range request of seekable S3 readers
+S3_RANGE_BLOCK_SIZE = 1048576
+
+# marker of float values unquoted after JSON lines serialization, escaped by to_json as \u0000
+JSONL_FLOAT_MARKER = "\x00float:"
+
+# process-wide session and client registry
+_AWS_CONNECTION_REGISTRY = {}
+_AWS_CONNECTION_REGISTRY_LOCK = threading.Lock()
+
+# per-thread resource cache, released together with its thread
+_AWS_RESOURCE_CACHE = threading.local()
+
+
 #############################################################################
 # AWS 
 #############################################################################
 
+def _aws_client_config(
+    aws_connection_config: dict=None
+    ) -> Config:
+    """
+    creates botocore client configuration, missing values are supplied from AWS_CLIENT_DEFAULTS
+
+    Parameters
+    ----------
+    aws_connection_config : dict
+        AWS connection configuration, by default None
+        -> optional keys: max_pool_connections, max_attempts, retry_mode, connect_timeout, read_timeout
+
+    Returns
+    -------
+    Config
+        botocore client configuration
+    """
+
+    client_options = {
+        option: aws_connection_config[option] if aws_connection_config.get(option) is not None else default_value
+        for option, default_value in AWS_CLIENT_DEFAULTS.items()
+    }
+
+    return Config(
+        max_pool_connections=client_options['max_pool_connections'],
+        retries={"max_attempts": client_options['max_attempts'], "mode": client_options['retry_mode']},
+        connect_timeout=client_options['connect_timeout'],
+        read_timeout=client_options['read_timeout']
+    )
+
+
+#############################################################################
+
+def _aws_session(
+    aws_connection_config: dict=None
+    ) -> object:
+    """
+    returns boto3 session of the connection config, sessions are created once per credentials
+    and reused from the process-wide registry, caller must hold _AWS_CONNECTION_REGISTRY_LOCK
+
+    Parameters
+    ----------
+    aws_connection_config : dict
+        AWS connection configuration, by default None
+
+    Returns
+    -------
+    object
+        boto3 session
+    """
+
+    session_key = md5_hash([
+        'session',
+        aws_connection_config.get('access_key'),
+        aws_connection_config.get('secret'),
+        aws_connection_config.get('region_name'),
+        aws_connection_config.get('profile_name')
+    ], case_sensitivity=True)
+
+    session = _AWS_CONNECTION_REGISTRY.get(session_key)
+
+    if session is None:
+
+        # credentials from config file if provided, otherwise system default connection configuration
+        session = boto3.session.Session(
+            aws_access_key_id=aws_connection_config.get('access_key'),
+            aws_secret_access_key=aws_connection_config.get('secret'),
+            region_name=aws_connection_config.get('region_name'),
+            profile_name=aws_connection_config.get('profile_name')
+        )
+        _AWS_CONNECTION_REGISTRY[session_key] = session
+
+    return session
+
+
+#############################################################################
+
 def _aws_connection(
     aws_connection_config: dict=None,
     service_name: str=None,
     concept: str=None
     ) -> object:
     """
-    establishes connection to S3
+    returns AWS service client/resource, connections are created once per connection config, 
+    service and concept and reused with their connection pools
+        -> clients are thread-safe and shared across threads from the process-wide registry
+        -> resources are not thread-safe and cached in thread-local storage
 
     Parameters
     ----------
@@ -21,43 +159,91 @@ def _aws_connection(
         AWS service name, by default None
     concept : str
         AWS concept, by default None
-        -> ['resource','client','waiter,'paginator']
+        -> ['resource','client']
 
     Returns
     -------
-    bool
-        True 
+    object
+        boto3 client/resource
     """       
 
-    # create session
-    aws_connection_config = drop_none_value_keys(aws_connection_config)
+    if concept not in ['client', 'resource']:
+        raise ValueError(f"AWS concept {concept} is not supported")
 
-    if aws_connection_config is not None:
-    # read credentials from config file if provided
-        
-        session = boto3.session.Session(
-            aws_access_key_id = aws_connection_config.get('access_key'),
-            aws_secret_access_key = aws_connection_config.get('secret'),
-            region_name = aws_connection_config.get('region_name'),
+    aws_connection_config = drop_none_value_keys(aws_connection_config) or {}
+
+    tokens = [concept, service_name] + [f"{k}={aws_connection_config[k]}" for k in sorted(aws_connection_config)]
+    connection_key = md5_hash(tokens, case_sensitivity=True)
+
+    # resources are cached per thread and dropped when the thread ends
+    if concept == 'resource':
+
+        resource_cache = getattr(_AWS_RESOURCE_CACHE, 'resources', None)
+        if resource_cache is None:
+            resource_cache = _AWS_RESOURCE_CACHE.resources = {}
+
+        connection = resource_cache.get(connection_key)
+        if connection is not None: return connection
+
+        # sessions are not thread-safe, resources are created under the registry lock
+        with _AWS_CONNECTION_REGISTRY_LOCK:
+            session = _aws_session(aws_connection_config)
+            connection = session.resource(
+                service_name,
+                endpoint_url=aws_connection_config.get('endpoint_url'),
+                config=_aws_client_config(aws_connection_config)
+            )
+
+        resource_cache[connection_key] = connection
+
+        return connection
+
+    # return registered client if available
+    connection = _AWS_CONNECTION_REGISTRY.get(connection_key)
+    if connection is not None: return connection
+
+    # sessions are not thread-safe, connections are created under the registry lock
+    with _AWS_CONNECTION_REGISTRY_LOCK:
+
+        connection = _AWS_CONNECTION_REGISTRY.get(connection_key)
+        if connection is not None: return connection
+
+        session = _aws_session(aws_connection_config)
+
+        connection = session.client(
+            service_name,
+            endpoint_url=aws_connection_config.get('endpoint_url'),
+            config=_aws_client_config(aws_connection_config)
         )
 
+        _AWS_CONNECTION_REGISTRY[connection_key] = connection
 
-    else:
-    # use system default connection configuration
-        
-        session = boto3.session.Session()
+    return connection
 
-    # define endpoint_url argument if provided
-    endpoint_url = aws_connection_config.get('endpoint_url')
-    if endpoint_url is not None: 
-        endpoint_string = f"endpoint_url={endpoint_url}"
-    else: 
-        endpoint_string = ''
 
-    # define connection string
-    connection_string = f"session.{concept}('{service_name}', {endpoint_string})"
-    
-    return eval(connection_string)
+#############################################################################
+
+def dispose_aws_connections() -> int:
+    """
+    removes registered sessions and clients from the connection registry and the resources
+    cached by the calling thread, call in forked worker processes before creating connections
+
+    Returns
+    -------
+    int
+        number of removed registry entries
+    """
+
+    with _AWS_CONNECTION_REGISTRY_LOCK:
+        registry_size = len(_AWS_CONNECTION_REGISTRY)
+        _AWS_CONNECTION_REGISTRY.clear()
+
+    resource_cache = getattr(_AWS_RESOURCE_CACHE, 'resources', None)
+    if resource_cache:
+        registry_size += len(resource_cache)
+        resource_cache.clear()
+
+    return registry_size
 
 
 #############################################################################
@@ -153,16 +339,484 @@ def s3_upload_file(
         raise ValueError
 
 
+#############################################################################
+
+def _s3_transfer_client(
+    s3_connection_config: dict=None,
+    max_workers: int=S3_TRANSFER_WORKERS,
+    transfer_config: dict=None
+    ) -> tuple:
+    """
+    returns shared S3 client for bulk transfers and the transfer configuration of a transfer,
+    the client is created once per connection config with a pool covering S3_TRANSFER_WORKERS objects 
+    and their parts, part concurrency per object is reduced so max_workers objects fit into the pool
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    max_workers : int, optional
+        number of objects transferred concurrently, by default S3_TRANSFER_WORKERS
+    transfer_config : dict, optional
+        TransferConfig options overriding S3_TRANSFER_DEFAULTS, by default None
+        -> ['multipart_threshold', 'multipart_chunksize', 'max_concurrency', 'use_threads']
+
+    Returns
+    -------
+    tuple
+        (S3 client, TransferConfig)
+    """
+
+    transfer_options = {**S3_TRANSFER_DEFAULTS, **drop_none_value_keys(transfer_config or {})}
+
+    # pool size does not depend on the transfer, so every bulk transfer reuses the registered client
+    s3_connection_config = dict(s3_connection_config or {})
+    s3_connection_config['max_pool_connections'] = max(
+        s3_connection_config.get('max_pool_connections') or AWS_CLIENT_DEFAULTS['max_pool_connections'],
+        S3_TRANSFER_WORKERS * S3_TRANSFER_DEFAULTS['max_concurrency']
+    )
+
+    s3 = _aws_connection(s3_connection_config, 's3', 'client')
+
+    # parts of concurrently transferred objects share the pool
+    transfer_options['max_concurrency'] = max(
+        min(transfer_options['max_concurrency'], s3_connection_config['max_pool_connections'] // max(max_workers, 1)), 1
+    )
+
+    return s3, TransferConfig(**transfer_options)
+
+
+#############################################################################
+
+def _s3_transfer_summary(
+    transfer_results: list=None,
+    duration: float=None
+    ) -> dict:
+    """
+    aggregates per-object transfer results
+
+    Parameters
+    ----------
+    transfer_results : list
+        per-object transfer results, by default None
+    duration : float
+        wall time of the bulk transfer in seconds, by default None
+
+    Returns
+    -------
+    dict
+        {"objects": list, "succeeded": int, "failed": int, "bytes": int, "duration": float, "throughput": float}
+    """
+
+    transferred_bytes = sum(r['size'] or 0 for r in transfer_results if r['error'] is None)
+
+    return {
+        "objects": transfer_results,
+        "succeeded": sum(1 for r in transfer_results if r['error'] is None),
+        "failed": sum(1 for r in transfer_results if r['error'] is not None),
+        "bytes": transferred_bytes,
+        "duration": duration,
+        "throughput": transferred_bytes / duration if duration else None
+    }
+
+
+#############################################################################
+
+@decorator_timer
+def s3_collect_files(
+    s3_connection_config: dict=None,
+    s3_bucket: str=None,
+    s3_file_paths=None,
+    local_destination_path: str=None,
+    s3_path: str=None,
+    max_workers: int=S3_TRANSFER_WORKERS,
+    transfer_config: dict=None
+    ) -> dict:
+    """
+    collects multiple files from S3 concurrently over one shared client, 
+    failed objects are reported in the results without stopping the transfer
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_paths : list/dict
+        files to collect, by default None
+        -> list of S3 object keys
+        -> list of objects returned by s3_scan_repository
+        -> S3 object key (key) + local file path (value) mapping
+    local_destination_path : str
+        local destination folder, object keys are recreated as subfolders, by default None
+        -> local file paths resolving outside the folder (.. segments, absolute keys) are reported as failed 
+           and not collected, also for S3 object key + local file path mappings
+    s3_path : str, optional
+        S3 path removed from object keys before recreating them locally, by default None
+    max_workers : int, optional
+        number of objects collected concurrently, by default S3_TRANSFER_WORKERS
+    transfer_config : dict, optional
+        TransferConfig options overriding S3_TRANSFER_DEFAULTS, by default None
+
+    Returns
+    -------
+    dict
+        per-object results and aggregate throughput (bytes per second)
+        -> {"objects": [{"s3_file_path", "local_file_path", "size", "duration", "error"}], 
+            "succeeded", "failed", "bytes", "duration", "throughput"}
+    """
+
+    try:
+
+        # establish shared S3 client connection
+        s3, s3_transfer_config = _s3_transfer_client(s3_connection_config, max_workers, transfer_config)
+
+        # map object keys to local file paths
+        if isinstance(s3_file_paths, dict):
+            file_mapping = dict(s3_file_paths)
+        else:
+            object_keys = [obj['Key'] if isinstance(obj, dict) else obj for obj in s3_file_paths]
+            prefix_length = len(s3_path or '')
+            file_mapping = {
+                k: os.path.normpath(os.path.join(local_destination_path, k[prefix_length:].lstrip('/') if k.startswith(s3_path or '') else k))
+                for k in object_keys
+            }
+
+        # object keys are untrusted input, local files must stay inside the destination folder
+        destination_root = os.path.realpath(local_destination_path) if local_destination_path is not None else None
+        outside_paths = set() if destination_root is None else {
+            k for k, f in file_mapping.items() 
+            if os.path.commonpath([destination_root, os.path.realpath(f)]) != destination_root
+        }
+
+    except Exception as e:
+        print(f"failed to prepare download from S3: {s3_bucket}")
+        print(e)
+        raise ValueError
+
+    def collect_file(s3_file_path, local_file_path):
+
+        transfer_start = perf_counter()
+        transfer_result = {"s3_file_path": s3_file_path, "local_file_path": local_file_path, "size": None, "error": None}
+
+        try:
+            if s3_file_path in outside_paths:
+                raise ValueError(f"object key resolves outside {local_destination_path}")
+            os.makedirs(os.path.dirname(os.path.abspath(local_file_path)), exist_ok=True)
+            s3.download_file(s3_bucket, s3_file_path, local_file_path, Config=s3_transfer_config)
+            transfer_result['size'] = os.path.getsize(local_file_path)
+        except Exception as e:
+            transfer_result['error'] = str(e)
+
+        transfer_result['duration'] = perf_counter() - transfer_start
+
+        return transfer_result
+
+    # collect files concurrently
+    bulk_start = perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        transfer_results = list(executor.map(lambda item: collect_file(*item), file_mapping.items()))
+
+    return _s3_transfer_summary(transfer_results, perf_counter() - bulk_start)
+
+
+#############################################################################
+
+@decorator_timer
+def s3_upload_files(
+    s3_connection_config: dict=None,
+    s3_bucket: str=None,
+    source_file_paths=None,
+    s3_destination_path: str=None,
+    source_path: str=None,
+    max_workers: int=S3_TRANSFER_WORKERS,
+    transfer_config: dict=None
+    ) -> dict:
+    """
+    uploads multiple files to S3 concurrently over one shared client, 
+    failed files are reported in the results without stopping the transfer
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    source_file_paths : list/dict
+        files to upload, by default None
+        -> list of local file paths
+        -> local file path (key) + S3 object key (value) mapping
+    s3_destination_path : str
+        S3 destination path of uploaded files, by default None
+    source_path : str, optional
+        local folder whose subfolders are recreated under s3_destination_path, by default None (file names only)
+    max_workers : int, optional
+        number of files uploaded concurrently, by default S3_TRANSFER_WORKERS
+    transfer_config : dict, optional
+        TransferConfig options overriding S3_TRANSFER_DEFAULTS, by default None
+
+    Returns
+    -------
+    dict
+        per-object results and aggregate throughput (bytes per second)
+        -> {"objects": [{"s3_file_path", "local_file_path", "size", "duration", "error"}], 
+            "succeeded", "failed", "bytes", "duration", "throughput"}
+    """
+
+    try:
+
+        # establish shared S3 client connection
+        s3, s3_transfer_config = _s3_transfer_client(s3_connection_config, max_workers, transfer_config)
+
+        # map local file paths to object keys
+        if isinstance(source_file_paths, dict):
+            file_mapping = dict(source_file_paths)
+        else:
+            s3_prefix = (s3_destination_path or '').rstrip('/')
+            file_mapping = {
+                f: '/'.join(filter(None, [
+                    s3_prefix, 
+                    os.path.relpath(f, source_path).replace(os.sep, '/') if source_path is not None else os.path.basename(f)
+                ]))
+                for f in source_file_paths
+            }
+
+    except Exception as e:
+        print(f"failed to prepare upload to S3: {s3_bucket}/{s3_destination_path}")
+        print(e)
+        raise ValueError
+
+    def upload_file(local_file_path, s3_file_path):
+
+        transfer_start = perf_counter()
+        transfer_result = {"s3_file_path": s3_file_path, "local_file_path": local_file_path, "size": None, "error": None}
+
+        try:
+            transfer_result['size'] = os.path.getsize(local_file_path)
+            s3.upload_file(local_file_path, s3_bucket, s3_file_path, Config=s3_transfer_config)
+        except Exception as e:
+            transfer_result['error'] = str(e)
+
+        transfer_result['duration'] = perf_counter() - transfer_start
+
+        return transfer_result
+
+    # upload files concurrently
+    bulk_start = perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        transfer_results = list(executor.map(lambda item: upload_file(*item), file_mapping.items()))
+
+    return _s3_transfer_summary(transfer_results, perf_counter() - bulk_start)
+
+
 #############################################################################
     
+def _regex_literal_prefix(
+    regex_pattern: str=None
+    ) -> str:
+    """
+    derives literal key prefix every match of an anchored regex pattern starts with
+
+    Parameters
+    ----------
+    regex_pattern : str
+        regex pattern, by default None
+
+    Returns
+    -------
+    str
+        literal prefix, empty if the pattern is not anchored with ^ or contains top-level alternations
+    """
+
+    if not regex_pattern or not regex_pattern.startswith('^'):
+        return ''
+
+    # alternatives outside groups need not start with the prefix, alternatives inside groups follow it
+    group_depth = 0
+    for character in re.sub(r'\\.|\[(?:\\.|[^\]])*\]', '', regex_pattern):
+        group_depth += {'(': 1, ')': -1}.get(character, 0)
+        if character == '|' and group_depth == 0:
+            return ''
+
+    literal_prefix = ''
+    i = 1
+
+    while i < len(regex_pattern):
+
+        # escaped special characters are literals, escaped letters/digits are classes (\d, \w, ...)
+        if regex_pattern[i] == '\\':
+            if i + 1 >= len(regex_pattern) or regex_pattern[i + 1].isalnum(): break
+            literal, step = regex_pattern[i + 1], 2
+        elif regex_pattern[i] in '.^$*+?{}[]()':
+            break
+        else:
+            literal, step = regex_pattern[i], 1
+
+        # quantified literal may be missing (*, ?, {0,n}) or repeated (+)
+        quantifier = regex_pattern[i + step:i + step + 1]
+        if quantifier in ['*', '?', '{']: break
+        literal_prefix += literal
+        if quantifier == '+': break
+
+        i += step
+
+    return literal_prefix
+
+
+#############################################################################
+
+def _s3_list_objects(
+    s3_client: object=None,
+    s3_bucket: str=None,
+    s3_path: str=None,
+    start_after: str=None,
+    delimiter: str=None
+    ):
+    """
+    lists S3 objects page by page
+
+    Parameters
+    ----------
+    s3_client : object
+        S3 client, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_path : str
+        S3 prefix to be listed, by default None
+    start_after : str, optional
+        key listing starts after, by default None
+    delimiter : str, optional
+        delimiter grouping keys into common prefixes, by default None
+
+    Yields
+    ------
+    dict
+        list_objects_v2 page, pages without objects have no Contents
+    """
+
+    list_arguments = drop_none_value_keys({
+        "Bucket": s3_bucket,
+        "Prefix": s3_path,
+        "StartAfter": start_after,
+        "Delimiter": delimiter
+    })
+
+    yield from s3_client.get_paginator('list_objects_v2').paginate(**list_arguments)
+
+
+#############################################################################
+
+def _s3_scan_objects(
+    s3_client: object=None,
+    s3_bucket: str=None,
+    s3_path: str=None,
+    start_after: str=None,
+    parallelism: int=None,
+    delimiter: str="/"
+    ):
+    """
+    lists S3 objects under a prefix, with parallelism the prefix is sharded into its sub-prefixes
+    listed concurrently, objects are yielded as listing pages arrive
+        -> objects are yielded in key order only without parallelism
+
+    Parameters
+    ----------
+    s3_client : object
+        S3 client, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_path : str
+        S3 prefix to be listed, by default None
+    start_after : str, optional
+        key listing starts after, by default None
+    parallelism : int, optional
+        number of sub-prefixes listed concurrently, by default None
+    delimiter : str, optional
+        delimiter separating sub-prefixes, by default "/"
+
+    Yields
+    ------
+    dict
+        S3 object
+    """
+
+    if not parallelism or parallelism <= 1:
+        for page in _s3_list_objects(s3_client, s3_bucket, s3_path, start_after):
+            yield from page.get('Contents', [])
+        return
+
+    # discover sub-prefixes, objects directly under the prefix are listed on the way
+    sub_prefixes = []
+    for page in _s3_list_objects(s3_client, s3_bucket, s3_path, None, delimiter):
+        yield from (obj for obj in page.get('Contents', []) if not start_after or obj['Key'] > start_after)
+        sub_prefixes += [common_prefix['Prefix'] for common_prefix in page.get('CommonPrefixes', [])]
+
+    # StartAfter applies to the sub-prefix containing it, preceding sub-prefixes are skipped
+    sub_prefix_start = {
+        sub_prefix: start_after if start_after and start_after.startswith(sub_prefix) else None
+        for sub_prefix in sub_prefixes
+        if not start_after or start_after.startswith(sub_prefix) or sub_prefix > start_after
+    }
+    sub_prefixes = list(sub_prefix_start)
+
+    # pages are handed over through a bounded queue, an abandoned generator stops the workers
+    page_queue = queue.Queue(maxsize=parallelism * 2)
+    stop_event = threading.Event()
+
+    def hand_over(page_objects):
+        while not stop_event.is_set():
+            try:
+                page_queue.put(page_objects, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def list_sub_prefix(sub_prefix):
+        try:
+            for page in _s3_list_objects(s3_client, s3_bucket, sub_prefix, sub_prefix_start[sub_prefix]):
+                if stop_event.is_set(): return
+                hand_over(page.get('Contents', []))
+        finally:
+            # None marks a finished worker
+            hand_over(None)
+
+    executor = ThreadPoolExecutor(max_workers=parallelism)
+
+    try:
+        futures = [executor.submit(list_sub_prefix, sub_prefix) for sub_prefix in sub_prefixes]
+
+        pending_workers = len(futures)
+        while pending_workers > 0:
+            page_objects = page_queue.get()
+            if page_objects is None:
+                pending_workers -= 1
+                continue
+            yield from page_objects
+
+        # surface listing errors
+        for future in futures:
+            future.result()
+
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+#############################################################################
+
 @decorator_timer
 def s3_scan_repository(
     s3_connection_config: dict=None,
     s3_bucket: str=None,
     s3_path: str=None,
     file_types: list=None,
-    regex_pattern: str=None
-    ) -> bool:
+    regex_pattern: str=None,
+    lazy: bool=False,
+    parallelism: int=None,
+    start_after: str=None
+    ):
     """
     scans S3 repository for files of specified file_types following a regex_pattern
 
@@ -177,43 +831,975 @@ def s3_scan_repository(
     file_types : list, optional
         list of file types to pick, by default None
     regex_pattern : str
-        file name regex pattern to use, by default None
+        regex pattern searched in the full object key, by default None
+        -> keys include s3_path, match file names only with patterns like r'(^|/)name$'
+        -> the literal start of patterns anchored with ^ narrows the listed prefix
+    lazy : bool, optional
+        return generator yielding matching objects as listing pages arrive, by default False
+        -> the logged runtime covers the consumption of the generator
+    parallelism : int, optional
+        number of sub-prefixes (split by /) listed concurrently, by default None
+        -> objects are not returned in key order
+    start_after : str, optional
+        object key the listing starts after, by default None
 
     Returns
     -------
-    bool
-        True 
+    list
+        matching S3 objects, generator if lazy is True
     """
 
     # set default values
     s3_path = s3_path or ''
-    regex_pattern = regex_pattern or '.*'
-    file_types = file_types or ['']
-    s3_object_list = []
+    file_types = tuple(file_types or [''])
+    regex = re.compile(regex_pattern or '.*')
+
+    # narrow the listing to the literal prefix of anchored patterns
+    regex_prefix = _regex_literal_prefix(regex_pattern)
+    if regex_prefix.startswith(s3_path):
+        s3_path = regex_prefix
+    elif not s3_path.startswith(regex_prefix):
+        return iter([]) if lazy == True else []
 
     try:
 
         # establish S3 client connection
         s3 = _aws_connection(s3_connection_config, 's3', 'client')
 
-        # get list of objects
-        paginator = s3.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=s3_bucket, Prefix=s3_path)
-
     except Exception as e:
         print(f"unable to read S3 repository {s3_bucket}/{s3_path}")
         print(e)
         raise ValueError
 
-    # iterate over pages and objects
-    for page in pages:
-        for obj in page['Contents']:
+    # objects are filtered as pages arrive
+    s3_objects = (
+        obj for obj in _s3_scan_objects(s3, s3_bucket, s3_path, start_after, parallelism)
+        if obj['Key'].endswith(file_types) and regex.search(obj['Key'])
+    )
+
+    if lazy == True:
+        return s3_objects
+
+    try:
+        return list(s3_objects)
 
-            # check if object ends with any of the suffixes
-            if obj['Key'].endswith(tuple(file_types)) and re.search(regex_pattern, obj['Key']):
-                s3_object_list.append(obj)
+    except Exception as e:
+        print(f"unable to read S3 repository {s3_bucket}/{s3_path}")
+        print(e)
+        raise ValueError
+
+
+#############################################################################
+
+def _s3_etag_matches(
+    local_file_path: str=None,
+    etag: str=None,
+    part_sizes: list=None
+    ) -> bool:
+    """
+    compares local file content with S3 ETag, multipart ETags (md5 of part md5s + '-<parts>') 
+    are recomputed for candidate part sizes
+
+    Parameters
+    ----------
+    local_file_path : str
+        local file path, by default None
+    etag : str
+        S3 object ETag, by default None
+    part_sizes : list, optional
+        candidate multipart part sizes in bytes, by default None
+
+    Returns
+    -------
+    bool
+        True if the local file matches the ETag
+    """
+
+    etag = etag.strip('"')
+
+    # single part upload, ETag is the md5 of the content
+    if '-' not in etag:
+        file_hash = hashlib.md5()
+        with open(local_file_path, 'rb') as f:
+            for block in iter(lambda: f.read(8388608), b''):
+                file_hash.update(block)
+        return file_hash.hexdigest() == etag
+
+    # multipart upload, part size is not stored and has to be guessed
+    part_count = int(etag.split('-')[1])
+    file_size = os.path.getsize(local_file_path)
+    mebibyte = 1048576
+
+    part_size_candidates = list(part_sizes or []) + [math.ceil(file_size / part_count / mebibyte) * mebibyte]
+
+    for part_size in dict.fromkeys(part_size_candidates):
+
+        if math.ceil(file_size / part_size) != part_count: continue
+
+        part_hashes = b''
+        with open(local_file_path, 'rb') as f:
+            for block in iter(lambda: f.read(part_size), b''):
+                part_hashes += hashlib.md5(block).digest()
+
+        if f"{hashlib.md5(part_hashes).hexdigest()}-{part_count}" == etag: return True
+
+    return False
+
+
+#############################################################################
+
+@decorator_timer
+def s3_sync(
+    s3_connection_config: dict=None,
+    s3_bucket: str=None,
+    s3_path: str=None,
+    local_path: str=None,
+    direction: str="download",
+    delete: bool=False,
+    dry_run: bool=False,
+    checksum: bool=True,
+    file_types: list=None,
+    regex_pattern: str=None,
+    max_workers: int=S3_TRANSFER_WORKERS,
+    transfer_config: dict=None
+    ) -> dict:
+    """
+    synchronizes local folder and S3 path, only new and changed files are transferred
+        -> files differing in size are changed
+        -> files of equal size are unchanged if their modification times agree: downloaded files 
+           take the S3 LastModified time, uploaded files are older than their S3 objects
+        -> remaining files are compared by MD5/ETag if checksum is True, otherwise considered changed
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_path : str
+        S3 path mirrored by the local folder, by default None
+    local_path : str
+        local folder, by default None
+    direction : str, optional
+        synchronization direction, by default "download"
+        -> 'download' - S3 path to local folder
+        -> 'upload' - local folder to S3 path
+    delete : bool, optional
+        delete target files missing in the source, by default False
+        -> deletions are skipped if any transfer failed
+    dry_run : bool, optional
+        report planned transfers and deletions without executing them, by default False
+    checksum : bool, optional
+        compare content hashes of files with equal size and disagreeing modification times, by default True
+    file_types : list, optional
+        list of file types to synchronize, by default None
+    regex_pattern : str, optional
+        regex pattern searched in the file paths relative to the synchronized folders, by default None
+    max_workers : int, optional
+        number of files transferred concurrently, by default S3_TRANSFER_WORKERS
+    transfer_config : dict, optional
+        TransferConfig options overriding S3_TRANSFER_DEFAULTS, by default None
+
+    Returns
+    -------
+    dict
+        synchronization report
+        -> {"transfer": [relative paths], "delete": [relative paths], "unchanged": int, 
+            "transfer_results": s3_collect_files/s3_upload_files results, "deleted": int,
+            "delete_errors": [{"path": relative path, "error": str}], "delete_skipped": bool}
+    """
+
+    if direction not in ['download', 'upload']:
+        raise ValueError(f"sync direction {direction} is not supported")
+
+    # a missing source folder would mark every S3 object for deletion
+    if direction == 'upload' and not os.path.isdir(local_path):
+        raise ValueError(f"local folder {local_path} does not exist")
+
+    s3_prefix = (s3_path or '').rstrip('/')
+    s3_prefix = f"{s3_prefix}/" if s3_prefix != '' else ''
+
+    # filters are applied to the relative paths, both sides are tested against the same strings
+    file_types = tuple(file_types or [''])
+    regex = re.compile(regex_pattern or '.*')
+
+    def path_selected(relative_path):
+        return relative_path.endswith(file_types) and regex.search(relative_path) is not None
+
+    # scan both sides, files are matched by their path relative to the synchronized folders
+    s3_objects = {
+        obj['Key'][len(s3_prefix):]: obj
+        for obj in s3_scan_repository(s3_connection_config, s3_bucket, s3_prefix)
+        if not obj['Key'].endswith('/') and path_selected(obj['Key'][len(s3_prefix):])
+    }
+
+    local_files = {}
+    if os.path.isdir(local_path):
+        for file_path in scan_files(local_path, None, '.*'):
+            file_path = os.path.normpath(file_path.replace('\\', '/'))
+            relative_path = os.path.relpath(file_path, local_path).replace(os.sep, '/')
+            if path_selected(relative_path): local_files[relative_path] = file_path
+
+    source_files, target_files = (s3_objects, local_files) if direction == 'download' else (local_files, s3_objects)
+
+    # compare files present on both sides
+    part_sizes = [(transfer_config or {}).get('multipart_chunksize') or S3_TRANSFER_DEFAULTS['multipart_chunksize']]
+    transfer_paths = []
+    unchanged_count = 0
+
+    for relative_path in source_files:
+
+        if relative_path not in target_files:
+            transfer_paths.append(relative_path)
+            continue
+
+        obj = s3_objects[relative_path]
+        local_file_path = local_files[relative_path]
+        local_mtime = os.path.getmtime(local_file_path)
+        s3_mtime = obj['LastModified'].timestamp()
+
+        if os.path.getsize(local_file_path) != obj['Size']:
+            changed = True
+        elif (direction == 'download' and abs(local_mtime - s3_mtime) < 1) or (direction == 'upload' and local_mtime <= s3_mtime):
+            changed = False
+        elif checksum == True:
+            changed = not _s3_etag_matches(local_file_path, obj['ETag'], part_sizes)
+        else:
+            changed = True
+
+        if changed:
+            transfer_paths.append(relative_path)
+        else:
+            unchanged_count += 1
+
+    delete_paths = [k for k in target_files if k not in source_files] if delete == True else []
+
+    sync_report = {
+        "transfer": transfer_paths,
+        "delete": delete_paths,
+        "unchanged": unchanged_count,
+        "transfer_results": None,
+        "deleted": 0,
+        "delete_errors": [],
+        "delete_skipped": False
+    }
+
+    if dry_run == True: return sync_report
+
+    # transfer new and changed files
+    if len(transfer_paths) > 0 and direction == 'download':
+
+        sync_report['transfer_results'] = s3_collect_files(
+            s3_connection_config=s3_connection_config,
+            s3_bucket=s3_bucket,
+            s3_file_paths={s3_prefix + k: os.path.join(local_path, *k.split('/')) for k in transfer_paths},
+            local_destination_path=local_path,
+            max_workers=max_workers,
+            transfer_config=transfer_config
+            )
+
+        # downloaded files take the S3 modification time to be recognized as unchanged by the next sync
+        for transfer_result in sync_report['transfer_results']['objects']:
+            if transfer_result['error'] is None:
+                s3_mtime = s3_objects[transfer_result['s3_file_path'][len(s3_prefix):]]['LastModified'].timestamp()
+                os.utime(transfer_result['local_file_path'], (s3_mtime, s3_mtime))
+
+    elif len(transfer_paths) > 0 and direction == 'upload':
+
+        sync_report['transfer_results'] = s3_upload_files(
+            s3_connection_config=s3_connection_config,
+            s3_bucket=s3_bucket,
+            source_file_paths={local_files[k]: s3_prefix + k for k in transfer_paths},
+            max_workers=max_workers,
+            transfer_config=transfer_config
+            )
+
+    # target must not lose files while the source is not completely transferred
+    if len(delete_paths) > 0 and sync_report['transfer_results'] is not None and sync_report['transfer_results']['failed'] > 0:
+        print(f"{sync_report['transfer_results']['failed']} transfers failed -> skipping deletion of {len(delete_paths)} files")
+        sync_report['delete_skipped'] = True
+        return sync_report
+
+    # delete target files missing in the source
+    if len(delete_paths) > 0 and direction == 'download':
+
+        for k in delete_paths:
+            try:
+                os.remove(local_files[k])
+                sync_report['deleted'] += 1
+            except OSError as e:
+                sync_report['delete_errors'].append({"path": k, "error": str(e)})
+
+    elif len(delete_paths) > 0 and direction == 'upload':
+
+        s3 = _aws_connection(s3_connection_config, 's3', 'client')
+
+        # only keys confirmed in Deleted are counted, per-key failures are returned in Errors
+        for start in range(0, len(delete_paths), 1000):
+            delete_response = s3.delete_objects(
+                Bucket=s3_bucket,
+                Delete={"Objects": [{"Key": s3_prefix + k} for k in delete_paths[start:start + 1000]], "Quiet": False}
+            )
+            sync_report['deleted'] += len(delete_response.get('Deleted', []))
+            sync_report['delete_errors'] += [
+                {"path": e['Key'][len(s3_prefix):], "error": f"{e.get('Code')}: {e.get('Message')}"} 
+                for e in delete_response.get('Errors', [])
+            ]
+
+    return sync_report
+
+
+#############################################################################
+# S3 STREAMS
+#############################################################################
+
+class _S3MultipartWriter:
+    """
+    write-only file object uploading written bytes to S3 as multipart upload parts,
+    full parts are uploaded by background threads while the caller keeps writing
+        -> memory is bounded by (max_concurrency + 1) * part_size
+        -> nothing is published until close(), abort() discards uploaded parts
+    """
+
+    def __init__(
+        self,
+        s3_client: object=None,
+        s3_bucket: str=None,
+        s3_key: str=None,
+        part_size: int=S3_PART_SIZE,
+        max_concurrency: int=S3_UPLOAD_CONCURRENCY
+        ):
+
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_key = s3_key
+        self.part_size = max(part_size, 5242880)
+
+        self.upload_id = s3_client.create_multipart_upload(Bucket=s3_bucket, Key=s3_key)['UploadId']
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.futures = []
+        self.buffer = BytesIO()
+        self.position = 0
+        self.closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return False
+
+    def seekable(self) -> bool:
+        return False
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def write(self, data) -> int:
+
+        self.buffer.write(data)
+        self.position += len(data)
+
+        if self.buffer.tell() >= self.part_size:
+            self._upload_buffer()
+
+        return len(data)
+
+    def _upload_buffer(self):
+
+        part_number = len(self.futures) + 1
+        part_body = self.buffer.getvalue()
+        self.buffer = BytesIO()
+
+        # wait for a free upload slot, bounds the number of parts held in memory
+        self.slots.acquire()
+
+        # stop writing once an earlier part failed
+        failed_parts = [future for future in self.futures if future.done() and future.exception() is not None]
+        if len(failed_parts) > 0:
+            self.slots.release()
+            raise failed_parts[0].exception()
+
+        self.futures.append(self.executor.submit(self._upload_part, part_number, part_body))
+
+    def _upload_part(
+        self,
+        part_number: int=None,
+        part_body: bytes=None
+        ) -> dict:
+
+        try:
+            response = self.s3_client.upload_part(
+                Bucket=self.s3_bucket,
+                Key=self.s3_key,
+                UploadId=self.upload_id,
+                PartNumber=part_number,
+                Body=part_body
+            )
+            return {"PartNumber": part_number, "ETag": response['ETag']}
+        finally:
+            self.slots.release()
+
+    def close(self):
+
+        if self.closed: return
+
+        try:
+            # last part may be smaller than part_size, an empty object is uploaded as one empty part
+            if self.buffer.tell() > 0 or len(self.futures) == 0:
+                self._upload_buffer()
+
+            parts = [future.result() for future in self.futures]
+
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.s3_bucket,
+                Key=self.s3_key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+
+        finally:
+            self.executor.shutdown(wait=True)
+            self.closed = True
+
+    def abort(self):
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.closed = True
+        self.s3_client.abort_multipart_upload(Bucket=self.s3_bucket, Key=self.s3_key, UploadId=self.upload_id)
+
+
+#############################################################################
+
+class _S3SliceReader(io.RawIOBase):
+    """
+    read-only file object over an iterable of byte slices, lets pandas and 
+    decompressors consume streamed S3 object bodies without local files
+    """
+
+    def __init__(
+        self,
+        byte_slices=None
+        ):
+
+        self.byte_slices = iter(byte_slices)
+        self.slice = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+
+        # skip empty slices, returning 0 signals end of stream
+        while len(self.slice) == 0:
+            try:
+                self.slice = memoryview(next(self.byte_slices))
+            except StopIteration:
+                return 0
+
+        size = min(len(buffer), len(self.slice))
+        buffer[:size] = self.slice[:size]
+        self.slice = self.slice[size:]
+
+        return size
+
+
+#############################################################################
+
+class _S3RangeReader(io.RawIOBase):
+    """
+    seekable read-only file object fetching S3 object content with byte-range GET requests,
+    readers like Parquet only download the footer and the column chunks they need
+    """
+
+    def __init__(
+        self,
+        s3_client: object=None,
+        s3_bucket: str=None,
+        s3_key: str=None
+        ):
+
+        self.s3_client = s3_client
+        self.s3_bucket = s3_bucket
+        self.s3_key = s3_key
+        self.size = s3_client.head_object(Bucket=s3_bucket, Key=s3_key)['ContentLength']
+        self.position = 0
+        self.requests = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int=io.SEEK_SET) -> int:
+
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.size + offset
+
+        return self.position
+
+    def readinto(self, buffer) -> int:
+
+        if self.position >= self.size or len(buffer) == 0:
+            return 0
+
+        range_end = min(self.position + len(buffer), self.size) - 1
+        response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=self.s3_key, Range=f"bytes={self.position}-{range_end}")
+        data = response['Body'].read()
+        self.requests += 1
+
+        buffer[:len(data)] = data
+        self.position += len(data)
+
+        return len(data)
+
+
+#############################################################################
+
+def _s3_object_slices(
+    s3_client: object=None,
+    s3_bucket: str=None,
+    s3_file_path: str=None,
+    compression: str=None,
+    read_size: int=S3_READ_SIZE
+    ):
+    """
+    streams S3 object body in byte slices, gzip and zstd content is decompressed on the fly
+
+    Parameters
+    ----------
+    s3_client : object
+        S3 client, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_path : str
+        S3 object key, by default None
+    compression : str, optional
+        compression of the object, by default None
+        -> ['gzip', 'zstd', None]
+    read_size : int, optional
+        number of bytes read per slice, by default S3_READ_SIZE
+
+    Yields
+    ------
+    bytes
+        object content slice
+        -> EOFError is raised for truncated gzip content
+    """
+
+    s3_body = s3_client.get_object(Bucket=s3_bucket, Key=s3_file_path)['Body']
+
+    try:
+
+        if compression not in ['gzip', 'zstd']:
+            yield from s3_body.iter_chunks(chunk_size=read_size)
+            return
+
+        # zstandard is optional and only required for zstd objects, frames are read one after another
+        if compression == 'zstd':
+            import zstandard
+            zstd_stream = zstandard.ZstdDecompressor().stream_reader(
+                _S3SliceReader(s3_body.iter_chunks(chunk_size=read_size)),
+                read_across_frames=True
+            )
+            yield from iter(lambda: zstd_stream.read(read_size), b'')
+            return
+
+        # concatenated gzip members are decompressed one after another
+        decompressor = zlib.decompressobj(wbits=31)
+        member_open = False
+
+        for compressed_slice in s3_body.iter_chunks(chunk_size=read_size):
+            while compressed_slice:
+                member_open = True
+                yield decompressor.decompress(compressed_slice)
+                if not decompressor.eof: break
+                compressed_slice = decompressor.unused_data
+                decompressor = zlib.decompressobj(wbits=31)
+                member_open = False
+
+        # a member without its trailer means the object body was cut off
+        if member_open == True:
+            raise EOFError(f"gzip content of {s3_file_path} ended before the end of the stream")
+
+    finally:
+        s3_body.close()
+
+
+#############################################################################
+
+def _s3_stream_format(
+    s3_file_path: str=None,
+    file_format: str="infer",
+    compression: str="infer"
+    ) -> tuple:
+    """
+    resolves file format and stream compression of an S3 object from its key
+
+    Parameters
+    ----------
+    s3_file_path : str
+        S3 object key, by default None
+    file_format : str, optional
+        file format, by default "infer"
+    compression : str, optional
+        stream compression, by default "infer"
+
+    Returns
+    -------
+    tuple
+        (file_format, compression)
+    """
+
+    s3_file_path = s3_file_path.lower()
+
+    if compression == 'infer':
+        compression = 'gzip' if s3_file_path.endswith('.gz') else 'zstd' if s3_file_path.endswith('.zst') else None
+
+    if file_format == 'infer':
+
+        file_extension = os.path.splitext(re.sub(r'\.(gz|zst)$', '', s3_file_path))[1]
+        file_format = {
+            ".csv": "csv",
+            ".txt": "csv",
+            ".jsonl": "jsonl",
+            ".ndjson": "jsonl",
+            ".parquet": "parquet",
+            ".pq": "parquet",
+            ".xlsx": "excel",
+            ".xls": "excel"
+        }.get(file_extension)
+
+    if file_format not in ['csv', 'jsonl', 'parquet', 'excel']:
+        raise Exception(f"file format of {s3_file_path} is not supported")
+
+    if compression not in ['gzip', 'zstd', None]:
+        raise Exception(f"compression {compression} is not supported")
+
+    return file_format, compression
+
+
+#############################################################################
+
+def _reader_chunks(
+    object_reader=None
+    ):
+    """
+    yields dataframe chunks of a pandas chunk reader and closes it when consumed or closed
+
+    Parameters
+    ----------
+    object_reader : object
+        pandas TextFileReader/JsonReader, by default None
+
+    Yields
+    ------
+    pd.DataFrame
+        dataframe chunk
+    """
+
+    with object_reader:
+        yield from object_reader
+
+
+#############################################################################
+
+def _jsonl_from_dataframe(
+    data: pd.DataFrame=None,
+    **kwargs
+    ) -> str:
+    """
+    serializes DataFrame into JSON lines with pandas to_json, float values are written with
+    their shortest round-trip digits (repr) instead of the at most 15 digits of to_json
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+
+    Returns
+    -------
+    str
+        JSON lines
+    """
+
+    # floats are passed as marked strings and unquoted after serialization, 
+    # missing and infinite values are written as null like to_json does
+    data = data.copy(deep=False)
+    for i, column_dtype in enumerate(data.dtypes):
+        if pd.api.types.is_float_dtype(column_dtype):
+            data.isetitem(i, data.iloc[:, i].map(lambda v: JSONL_FLOAT_MARKER + repr(float(v)) if np.isfinite(v) else None))
+
+    json_lines = data.to_json(**{"orient": "records", "lines": True, "date_format": "iso", **kwargs})
+
+    return re.sub(r'"\\u0000float:([^"]*)"', r'\1', json_lines)
+
+
+#############################################################################
+
+@decorator_timer
+def s3_read_dataframe(
+    s3_connection_config: dict=None,
+    s3_bucket: str=None,
+    s3_file_path: str=None,
+    file_format: str="infer",
+    compression: str="infer",
+    columns: list=None,
+    filters: list=None,
+    chunksize: int=None,
+    read_size: int=S3_READ_SIZE,
+    **kwargs
+    ):
+    """
+    reads S3 object into pandas dataframe without local files, the object body is streamed into the reader
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_path : str
+        S3 object key, by default None
+    file_format : str, optional
+        file format, by default "infer"
+        -> 'infer' - from the key extension (.csv, .txt, .jsonl, .ndjson, .parquet, .pq, .xlsx, .xls)
+           -> .json keys are not inferred as JSON lines, plain JSON arrays are not supported
+        -> 'csv' - pandas read_csv, kwargs are passed to the reader
+        -> 'jsonl' - pandas read_json of JSON lines, kwargs are passed to the reader
+        -> 'parquet' - uncompressed objects are read with byte-range requests, only the footer and 
+           the column chunks of selected columns and row groups are downloaded
+        -> 'excel' - pandas read_excel on the object content held in memory, kwargs are passed to the reader
+    compression : str, optional
+        stream compression of the object, by default "infer"
+        -> 'infer' - gzip for keys ending with .gz, zstd for keys ending with .zst
+        -> ['gzip', 'zstd', None], zstd requires the zstandard package
+    columns : list, optional
+        [parquet] columns to read, by default None
+    filters : list, optional
+        [parquet] pyarrow filters, row groups excluded by their statistics are not downloaded, by default None
+    chunksize : int, optional
+        [csv, jsonl, parquet] number of records per chunk, an iterator of dataframes is returned, by default None
+    read_size : int, optional
+        number of bytes read from the object body per slice, by default S3_READ_SIZE
+
+    Returns
+    -------
+    pd.DataFrame
+        object content, iterator of dataframe chunks if chunksize is provided
+    """
+
+    try:
+
+        file_format, compression = _s3_stream_format(s3_file_path, file_format, compression)
+
+        # establish S3 client connection
+        s3 = _aws_connection(s3_connection_config, 's3', 'client')
+
+        if file_format == 'parquet' and compression is None:
+
+            import pyarrow.parquet as pq
+
+            parquet_stream = io.BufferedReader(_S3RangeReader(s3, s3_bucket, s3_file_path), buffer_size=S3_RANGE_BLOCK_SIZE)
+
+            if chunksize is None:
+                return pq.read_table(parquet_stream, columns=columns, filters=filters).to_pandas()
+
+            if filters is not None:
+                raise Exception("filters are not supported with chunksize")
+
+            record_batches = pq.ParquetFile(parquet_stream).iter_batches(batch_size=chunksize, columns=columns)
+            return (record_batch.to_pandas() for record_batch in record_batches)
+
+        object_slices = _s3_object_slices(s3, s3_bucket, s3_file_path, compression, read_size)
+
+        # formats reading from a seekable zip/footer are held in memory
+        if file_format in ['parquet', 'excel']:
+
+            object_content = BytesIO(b''.join(object_slices))
+
+            if file_format == 'excel':
+                return pd.read_excel(object_content, **kwargs)
+
+            import pyarrow.parquet as pq
+
+            if chunksize is None:
+                return pq.read_table(object_content, columns=columns, filters=filters).to_pandas()
+
+            if filters is not None:
+                raise Exception("filters are not supported with chunksize")
+
+            record_batches = pq.ParquetFile(object_content).iter_batches(batch_size=chunksize, columns=columns)
+            return (record_batch.to_pandas() for record_batch in record_batches)
+
+        object_stream = io.BufferedReader(_S3SliceReader(object_slices), buffer_size=read_size)
+
+        if file_format == 'csv':
+            object_reader = pd.read_csv(object_stream, chunksize=chunksize, **kwargs)
+        else:
+            object_reader = pd.read_json(io.TextIOWrapper(object_stream, encoding='utf-8'), lines=True, chunksize=chunksize, **kwargs)
+
+        # chunk readers are returned as generators, decorator_timer times them until consumed
+        return object_reader if chunksize is None else _reader_chunks(object_reader)
+
+    except Exception as e:
+        print(f"failed to read from S3: {s3_bucket}/{s3_file_path}")
+        print(e)
+        raise ValueError
+
+
+#############################################################################
+
+@decorator_timer
+def s3_write_dataframe(
+    s3_connection_config: dict=None,
+    data: pd.DataFrame=None,
+    s3_bucket: str=None,
+    s3_file_path: str=None,
+    file_format: str="infer",
+    compression: str="infer",
+    chunksize: int=100000,
+    part_size: int=S3_PART_SIZE,
+    max_concurrency: int=S3_UPLOAD_CONCURRENCY,
+    **kwargs
+    ) -> dict:
+    """
+    writes pandas dataframe into S3 object without local files, serialized chunks are compressed 
+    on the fly and uploaded in multipart upload parts while the next chunk is being serialized
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_path : str
+        S3 object key, by default None
+    file_format : str, optional
+        file format, by default "infer"
+        -> 'infer' - from the key extension (.csv, .txt, .jsonl, .ndjson, .parquet, .pq, .xlsx, .xls)
+           -> .json keys are not inferred as JSON lines, plain JSON arrays are not supported
+        -> 'csv' - pandas to_csv without index, kwargs are passed to the writer
+        -> 'jsonl' - pandas to_json of JSON lines with ISO dates and round-trip float digits, kwargs are passed to the writer
+        -> 'parquet' - chunksize records per row group
+        -> 'excel' - pandas to_excel without index serialized in memory, kwargs are passed to the writer
+    compression : str, optional
+        compression codec, by default "infer"
+        -> 'csv', 'jsonl' - ['infer', 'gzip', 'zstd', None] stream compression, 'infer' - gzip for keys 
+           ending with .gz, zstd for keys ending with .zst, zstd requires the zstandard package
+        -> 'parquet' - ['infer', 'gzip', 'snappy', 'zstd', None] column compression inside the Parquet file, 'infer' - snappy
+        -> 'excel' - not supported
+    chunksize : int, optional
+        number of records serialized at once, by default 100000
+    part_size : int, optional
+        multipart upload part size in bytes, by default S3_PART_SIZE
+    max_concurrency : int, optional
+        number of parts uploaded concurrently, by default S3_UPLOAD_CONCURRENCY
+
+    Returns
+    -------
+    dict
+        upload summary
+        -> {"s3_bucket": str, "s3_file_path": str, "parts": int, "size": int}
+    """
+
+    try:
+
+        # column compression of Parquet files is not a stream compression
+        column_compression = None
+        if _s3_stream_format(s3_file_path, file_format, None)[0] == 'parquet':
+            column_compression, compression = ('snappy' if compression == 'infer' else compression), None
+
+        file_format, compression = _s3_stream_format(s3_file_path, file_format, compression)
+
+        if file_format == 'excel' and compression is not None:
+            raise Exception(f"compression {compression} is not supported for excel files")
+
+        # establish S3 client connection
+        s3 = _aws_connection(s3_connection_config, 's3', 'client')
+
+        # open multipart upload
+        s3_stream = _S3MultipartWriter(s3, s3_bucket, s3_file_path, part_size, max_concurrency)
+
+    except Exception as e:
+        print(f"failed to start upload into S3: {s3_bucket}/{s3_file_path}")
+        print(e)
+        raise ValueError
+
+    try:
+
+        # compress on the fly between the serializer and the multipart stream
+        if compression == 'gzip':
+            target_stream = gzip.GzipFile(fileobj=s3_stream, mode='wb', compresslevel=6)
+        elif compression == 'zstd':
+            import zstandard
+            target_stream = zstandard.ZstdCompressor().stream_writer(s3_stream, closefd=False)
+        else:
+            target_stream = s3_stream
+
+        if file_format in ['csv', 'jsonl']:
+
+            text_stream = io.TextIOWrapper(target_stream, encoding='utf-8', newline='')
+
+            for start in range(0, max(len(data), 1), chunksize):
+
+                df_chunk = data.iloc[start:start + chunksize]
+
+                if file_format == 'csv':
+                    df_chunk.to_csv(text_stream, **{"index": False, "header": start == 0, **kwargs})
+                elif len(df_chunk) > 0:
+                    json_lines = _jsonl_from_dataframe(df_chunk, **kwargs)
+                    text_stream.write(json_lines if json_lines.endswith('\n') else json_lines + '\n')
+
+            text_stream.flush()
+            text_stream.detach()
+
+        elif file_format == 'parquet':
+
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            pq.write_table(table, target_stream, row_group_size=chunksize, compression=column_compression or 'none')
+
+        elif file_format == 'excel':
+
+            # xlsx is a zip archive, it is serialized in memory before the upload
+            excel_content = BytesIO()
+            data.to_excel(excel_content, **{"index": False, **kwargs})
+            target_stream.write(excel_content.getvalue())
+
+        if target_stream is not s3_stream:
+            target_stream.close()
+
+        # publish object
+        s3_stream.close()
+
+    except Exception as e:
+        s3_stream.abort()
+        print(f"failed to upload into S3: {s3_bucket}/{s3_file_path}")
+        print(e)
+        raise ValueError
 
-    return s3_object_list
+    return {
+        "s3_bucket": s3_bucket,
+        "s3_file_path": s3_file_path,
+        "parts": len(s3_stream.futures),
+        "size": s3_stream.tell()
+    }
 
 
 #############################################################################
@@ -1,7 +1,18 @@
 from dept.base import *
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, URL, event
+from sqlalchemy.ext.asyncio import create_async_engine
 from io import StringIO
-import csv
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from datetime import date
+from decimal import Decimal, Context, ROUND_HALF_UP
+from time import perf_counter
+import threading
+import io
+import asyncio
+import weakref
+import queue
+import struct
 
 #############################################################################
 # VARIABLES
@@ -11,279 +22,4560 @@ DATATYPE_MAPPING = {
 
     "postgres": {
         "float64":"DOUBLE PRECISION",
+        "float32": "REAL",
+        "float16": "REAL",
+        "Float64": "DOUBLE PRECISION",
+        "Float32": "REAL",
         "int64": "BIGINT",
         "int32": "INT",
+        "int16": "SMALLINT",
+        "int8": "SMALLINT",
+        "uint32": "BIGINT",
+        "uint16": "INT",
+        "uint8": "SMALLINT",
+        "Int64": "BIGINT",
+        "Int32": "INT",
+        "Int16": "SMALLINT",
+        "Int8": "SMALLINT",
+        "UInt32": "BIGINT",
+        "UInt16": "INT",
+        "UInt8": "SMALLINT",
         "object": "TEXT",
+        "string": "TEXT",
         "datetime64[ns]": "TIMESTAMP",
-        "bool": "BOOLEAN"
+        "datetimetz": "TIMESTAMPTZ",
+        "timedelta64[ns]": "INTERVAL",
+        "bool": "BOOLEAN",
+        "boolean": "BOOLEAN",
+        # content of object columns inferred by pd.api.types.infer_dtype
+        "decimal": "NUMERIC",
+        "date": "DATE",
+        "datetime": "TIMESTAMP",
+        "integer": "BIGINT",
+        "floating": "DOUBLE PRECISION",
+        "mixed-integer-float": "DOUBLE PRECISION"
     }
 
 }
 
+# connection pool defaults, overridable per connection config
+DB_ENGINE_DEFAULTS = {
+    "pool_size": 5,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    "pool_timeout": 30
+}
+
+# postgres result column type OIDs mapped to pandas parsing dtypes for COPY extracts
+PSQL_OID_DTYPE_MAPPING = {
+    16: "bool",                     # bool
+    20: "int64",                    # int8
+    21: "int64",                    # int2
+    23: "int64",                    # int4
+    26: "int64",                    # oid
+    700: "float64",                 # float4
+    701: "float64",                 # float8
+    1700: "float64",                # numeric, converted to float64 like read_sql does, precision beyond float64 is lost
+    1082: "date",                   # date
+    1114: "datetime64[ns]",         # timestamp
+    1184: "datetime64[ns, UTC]",    # timestamptz
+    1186: "timedelta64[ns]",        # interval
+    114: "json",                    # json
+    3802: "json"                    # jsonb
+}
+
+# number of records serialized per COPY FROM STDIN slice
+COPY_SLICE_SIZE = 100000
+
+# number of characters passed to the server per COPY FROM STDIN read
+COPY_READ_SIZE = 1048576
+
+# NULL marker of CSV COPY slices serialized from DataFrames, unquoted empty strings stay empty strings
+# -> string values equal to the marker are loaded as NULL
+COPY_CSV_NULL = '\\N'
+
+# PGCOPY binary format framing
+PGCOPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + b'\x00' * 8
+PGCOPY_TRAILER = b'\xff\xff'
+PGCOPY_EPOCH = np.datetime64('2000-01-01T00:00:00', 'us')
+
+# fixed-width postgres types mapped to big-endian binary representations
+PGCOPY_BINARY_TYPES = {
+    "DOUBLE PRECISION": ">f8",
+    "REAL": ">f4",
+    "BIGINT": ">i8",
+    "INT": ">i4",
+    "SMALLINT": ">i2",
+    "BOOLEAN": "u1",
+    "TIMESTAMP": ">i8",
+    "TIMESTAMPTZ": ">i8",
+    "DATE": ">i4"
+}
+
+# variable-width postgres types sent as UTF-8 text in PGCOPY binary
+PGCOPY_TEXT_TYPES = ["TEXT", "VARCHAR", "CHAR", "NAME", "CITEXT"]
+
+# postgres catalog type names (format_type) mapped to PGCOPY_BINARY_TYPES/PGCOPY_TEXT_TYPES names
+PGCOPY_TYPE_ALIASES = {
+    "FLOAT8": "DOUBLE PRECISION",
+    "FLOAT4": "REAL",
+    "INTEGER": "INT",
+    "INT4": "INT",
+    "INT8": "BIGINT",
+    "INT2": "SMALLINT",
+    "BOOL": "BOOLEAN",
+    "TIMESTAMP WITHOUT TIME ZONE": "TIMESTAMP",
+    "TIMESTAMP WITH TIME ZONE": "TIMESTAMPTZ",
+    "CHARACTER VARYING": "VARCHAR",
+    "CHARACTER": "CHAR",
+    "BPCHAR": "CHAR",
+    "DECIMAL": "NUMERIC"
+}
+
+# share of distinct values below which downcast string columns become categoricals
+DOWNCAST_CATEGORY_RATIO = 0.5
+
+# local query result cache
+QUERY_CACHE_PATH = f"{DEPT_PATH}/sandbox/query_cache"
+QUERY_CACHE_MAX_BYTES = 1073741824
+QUERY_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+_QUERY_CACHE_LOCK = threading.Lock()
+
+# incremental extract watermarks: state key (key) + high-water mark (value)
+WATERMARK_STATE_PATH = f"{DEPT_PATH}/sandbox/watermarks.json"
+_WATERMARK_LOCK = threading.Lock()
+
+# loaded SQL files: file path (key) + (modification time, SQL string) (value)
+_SQL_TEMPLATE_CACHE = {}
+
+# named bind parameter syntax used by SQLAlchemy text()
+BIND_PARAM_PATTERN = re.compile(r"(?<![:\w\x5c]):(\w+)(?!:)")
+
+# table metadata cache per connection engine, entries expire after DB_METADATA_CACHE_TTL seconds
+# to pick up changes made by other processes, missing tables are not cached
+_DB_METADATA_CACHE = {}
+DB_METADATA_CACHE_TTL = 300
+
+# statements invalidating table metadata
+DDL_PATTERN = r'\b(CREATE|DROP|ALTER|TRUNCATE|RENAME)\b'
+
+# call instrumentation settings, instrumentation is active once a hook or sink is set
+INSTRUMENTATION_SETTINGS = {
+    "sink_path": None,
+    "slow_query_threshold": None,
+    "explain_slow_queries": False
+}
+_INSTRUMENTATION_HOOKS = []
+_INSTRUMENTATION_STATE = threading.local()
+_INSTRUMENTATION_SINK_LOCK = threading.Lock()
+
+# process-wide connection engine registry
+_DB_ENGINE_REGISTRY = {}
+_DB_ENGINE_REGISTRY_LOCK = threading.Lock()
+
+# asyncio connection engines and concurrency semaphores per event loop, 
+# asyncpg connections are bound to the event loop that created them
+_DB_ASYNC_ENGINE_REGISTRY = weakref.WeakKeyDictionary()
+
+
+#############################################################################
+# INSTRUMENTATION
+#############################################################################
+
+def _instrumentation_stack() -> list:
+    """
+    returns records of instrumented calls running in the current thread, outermost first
+
+    Returns
+    -------
+    list
+        list of call records
+    """
+
+    if not hasattr(_INSTRUMENTATION_STATE, 'stack'):
+        _INSTRUMENTATION_STATE.stack = []
+
+    return _INSTRUMENTATION_STATE.stack
+
+
+#############################################################################
+
+def _instrumentation_add(
+    metric: str=None,
+    value: float=None
+    ):
+    """
+    adds metric value to all instrumented calls running in the current thread, 
+    nested calls (e.g. db_execute inside db_upload) count towards their callers
+
+    Parameters
+    ----------
+    metric : str
+        record metric name, by default None
+    value : float
+        value to add, by default None
+    """
+
+    for record in _instrumentation_stack():
+        record[metric] = (record.get(metric) or 0) + value
+
+
+#############################################################################
+
+def _instrument_engine(
+    db_engine: object=None
+    ) -> object:
+    """
+    registers instrumentation events on a connection engine, pool events are registered on the
+    engine so they survive pools recreated by dispose()
+        -> checkouts - number of connections checked out from the pool
+        -> connect - time spent opening new DBAPI connections
+        -> execute - time spent in cursor execution, psycopg2 buffers result rows during execution
+        -> the pool has no event before checkout, time spent waiting for a free connection is part of fetch
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+
+    Returns
+    -------
+    object
+        SQLAlchemy database connection engine
+    """
+
+    @event.listens_for(db_engine, "do_connect")
+    def before_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info['connect_start'] = perf_counter()
+
+    @event.listens_for(db_engine, "connect")
+    def after_connect(dbapi_connection, connection_record):
+        connect_start = connection_record.info.pop('connect_start', None)
+        if connect_start is not None:
+            _instrumentation_add('connect', perf_counter() - connect_start)
+
+    @event.listens_for(db_engine, "checkout")
+    def after_checkout(dbapi_connection, connection_record, connection_proxy):
+        _instrumentation_add('checkouts', 1)
+
+    @event.listens_for(db_engine, "before_cursor_execute")
+    def before_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault('execute_start', []).append(perf_counter())
+
+    @event.listens_for(db_engine, "after_cursor_execute")
+    def after_execute(connection, cursor, statement, parameters, context, executemany):
+        _instrumentation_add('execute', perf_counter() - connection.info['execute_start'].pop())
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            _instrumentation_add('rowcount', cursor.rowcount)
+
+    return db_engine
+
+
+#############################################################################
+
+def _instrumentation_explain(
+    db_connection_config: dict=None,
+    query: str=None,
+    params: dict=None
+    ) -> list:
+    """
+    captures EXPLAIN (ANALYZE, BUFFERS) plan of a query, the query is executed again in a rolled back transaction
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    query : str
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+    params : dict, optional
+        values of :name bind parameters in the query, by default None
+
+    Returns
+    -------
+    list
+        JSON query plan, None if the plan could not be captured
+    """
+
+    try:
+
+        sql_string = _db_read_query(query).strip().rstrip(';')
+        db_engine = _db_connection_engine(db_connection_config)
+
+        with db_engine.connect() as c:
+            query_plan = c.execute(_db_text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql_string}"), params).scalar()
+            c.rollback()
+
+        return json.loads(query_plan) if isinstance(query_plan, str) else query_plan
+
+    except Exception as e:
+        print(f"ERROR: unable to capture query plan")
+        print(e)
+        return None
+
+
+#############################################################################
+
+def _instrumentation_emit(
+    record: dict=None
+    ):
+    """
+    passes call record to registered hooks and appends it to the JSON-lines sink
+
+    Parameters
+    ----------
+    record : dict
+        call record, by default None
+    """
+
+    for hook in list(_INSTRUMENTATION_HOOKS):
+        try:
+            hook(record)
+        except Exception as e:
+            print(f"ERROR: instrumentation hook {getattr(hook, '__name__', hook)} failed")
+            print(e)
+
+    sink_path = INSTRUMENTATION_SETTINGS['sink_path']
+    if sink_path is None: return
+
+    with _INSTRUMENTATION_SINK_LOCK:
+        with open(sink_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+
+
+#############################################################################
+
+def _db_instrumented(func):
+    """
+    decorator recording timings, row count and approximate bytes of database calls, 
+    records are emitted to hooks and sink only while instrumentation is active
+
+    Parameters
+    ----------
+    func : function
+        db_query, db_execute or db_upload
+
+    Returns
+    -------
+    function
+        instrumented function
+    """
+
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+
+        if len(_INSTRUMENTATION_HOOKS) == 0 and INSTRUMENTATION_SETTINGS['sink_path'] is None:
+            return func(*args, **kwargs)
+
+        arguments = signature.bind_partial(*args, **kwargs).arguments
+        statement = arguments.get('query') or arguments.get('target_table')
+
+        stack = _instrumentation_stack()
+        record = {
+            "call_id": uuid.uuid4().hex,
+            "parent_id": stack[-1]['call_id'] if len(stack) > 0 else None,
+            "operation": func.__name__,
+            "statement": statement if isinstance(statement, str) else str(statement),
+            "started": datetime.now().isoformat(),
+            "checkouts": 0,
+            "connect": 0,
+            "execute": 0
+        }
+
+        stack.append(record)
+        call_start = perf_counter()
+
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            stack.pop()
+            record['duration'] = perf_counter() - call_start
+
+        # remaining time is spent waiting for pooled connections and on the client fetching, transferring and converting data
+        record['fetch'] = max(record['duration'] - record['connect'] - record['execute'], 0)
+        record['success'] = result is not None and result is not False
+
+        # rows and approximate in-memory bytes of the transferred data
+        data = result if isinstance(result, pd.DataFrame) else arguments.get('data')
+        if isinstance(data, pd.DataFrame):
+            record['rows'] = len(data)
+            record['bytes'] = int(data.memory_usage(index=False, deep=True).sum())
+        else:
+            record['rows'] = record.pop('rowcount', None)
+            record['bytes'] = None
+        record.pop('rowcount', None)
+
+        # capture plans of slow queries
+        slow_query_threshold = INSTRUMENTATION_SETTINGS['slow_query_threshold']
+        record['slow'] = slow_query_threshold is not None and record['duration'] >= slow_query_threshold
+
+        if record['slow'] and record['success'] and func.__name__ == 'db_query' and INSTRUMENTATION_SETTINGS['explain_slow_queries'] == True:
+            record['explain'] = _instrumentation_explain(arguments.get('db_connection_config'), arguments.get('query'), arguments.get('params'))
+
+        _instrumentation_emit(record)
+
+        return result
+
+    return wrapper
+
+
+#############################################################################
+
+def db_instrumentation_configure(
+    sink_path: str=None,
+    slow_query_threshold: float=None,
+    explain_slow_queries: bool=False
+    ) -> dict:
+    """
+    configures instrumentation of db_query, db_execute and db_upload calls
+        -> record keys: call_id, parent_id, operation, statement, started, duration, checkouts, 
+           connect, execute, fetch, rows, bytes, success, slow, explain
+        -> timings in seconds, calls made from worker threads of parallel loads are not attributed
+
+    Parameters
+    ----------
+    sink_path : str, optional
+        JSON-lines file call records are appended to, by default None (no sink)
+    slow_query_threshold : float, optional
+        duration in seconds from which calls are flagged as slow, by default None
+    explain_slow_queries : bool, optional
+        capture EXPLAIN (ANALYZE, BUFFERS) of slow db_query calls, by default False
+        -> the query is executed a second time
+
+    Returns
+    -------
+    dict
+        instrumentation settings
+    """
+
+    INSTRUMENTATION_SETTINGS.update({
+        "sink_path": sink_path,
+        "slow_query_threshold": slow_query_threshold,
+        "explain_slow_queries": explain_slow_queries
+    })
+
+    return dict(INSTRUMENTATION_SETTINGS)
+
+
+#############################################################################
+
+def db_instrumentation_hook(
+    hook=None,
+    remove: bool=False
+    ) -> int:
+    """
+    registers callable receiving call records of instrumented calls
+
+    Parameters
+    ----------
+    hook : function
+        callable accepting a call record dictionary, by default None
+    remove : bool, optional
+        unregister the hook, by default False
+
+    Returns
+    -------
+    int
+        number of registered hooks
+    """
+
+    if remove == True:
+        if hook in _INSTRUMENTATION_HOOKS: _INSTRUMENTATION_HOOKS.remove(hook)
+    elif hook not in _INSTRUMENTATION_HOOKS:
+        _INSTRUMENTATION_HOOKS.append(hook)
+
+    return len(_INSTRUMENTATION_HOOKS)
+
+
+#############################################################################
+# DB METHODS
+#############################################################################
+
+def _db_engine_options(
+    db_connection_config: dict=None
+    ) -> dict:
+    """
+    collects connection pool options from the connection config, missing values are supplied from DB_ENGINE_DEFAULTS
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+
+    Returns
+    -------
+    dict
+        create_engine pool keyword arguments
+    """
+
+    return {
+        option: db_connection_config[option] if db_connection_config.get(option) is not None else default_value
+        for option, default_value in DB_ENGINE_DEFAULTS.items()
+    }
+
+
+#############################################################################
+
+def _db_pool_capacity(
+    db_connection_config: dict=None
+    ) -> int:
+    """
+    returns the number of connections the connection engine hands out at once
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+
+    Returns
+    -------
+    int
+        pool_size + max_overflow
+    """
+
+    engine_options = _db_engine_options(db_connection_config)
+
+    return engine_options['pool_size'] + engine_options['max_overflow']
+
+
+#############################################################################
+
+def _db_engine_key(
+    db_connection_config: dict=None
+    ) -> str:
+    """
+    generates a registry key from the normalized connection config
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+
+    Returns
+    -------
+    str
+        32-char md5 hash identifying the connection and its pool options
+    """
+
+    engine_options = _db_engine_options(db_connection_config)
+
+    tokens = [
+        str(db_connection_config.get('type')).lower(),
+        db_connection_config.get('user_name'),
+        db_connection_config.get('password'),
+        str(db_connection_config.get('host')).lower(),
+        db_connection_config.get('port'),
+        db_connection_config.get('database_name'),
+    ] + [engine_options[option] for option in sorted(engine_options)]
+
+    return md5_hash(tokens, case_sensitivity=True)
+
+
+#############################################################################
+
+def _db_connection_url(
+    db_connection_config: dict=None,
+    asynchronous: bool=False
+    ) -> object:
+    """
+    creates SQLAlchemy connection url
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    asynchronous : bool, optional
+        use asyncio driver, by default False
+
+    Returns
+    -------
+    object
+        SQLAlchemy connection url, None if connection type is not recognized
+    """
+
+    if db_connection_config['type'].lower() == 'postgres':
+
+        return URL.create(
+            drivername="postgresql+asyncpg" if asynchronous == True else "postgresql+psycopg2",
+            username=db_connection_config.get("user_name"),
+            password=db_connection_config.get("password"),
+            host=db_connection_config.get("host"),
+            port=db_connection_config.get("port"),
+            database=db_connection_config.get("database_name")
+        )
+
+    else: 
+        print(f"ERROR: connection type not recognized")
+        return None
+
+
+#############################################################################
+
+def _db_connection_engine(
+    db_connection_config: dict=None
+    ) -> object:
+    """
+    returns SQLAlchemy database connection engine, engines are created once per 
+    connection config and reused from the process-wide engine registry
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+        -> optional pool keys: pool_size, max_overflow, pool_pre_ping, pool_recycle, pool_timeout
+
+    Returns
+    -------
+    object
+        SQLAlchemy database connection engine
+    """    
+
+    try:
+
+        # return registered engine if available
+        engine_key = _db_engine_key(db_connection_config)
+        db_engine = _DB_ENGINE_REGISTRY.get(engine_key)
+        if db_engine is not None: return db_engine
+
+        with _DB_ENGINE_REGISTRY_LOCK:
+
+            # re-check in case another thread registered the engine meanwhile
+            db_engine = _DB_ENGINE_REGISTRY.get(engine_key)
+            if db_engine is not None: return db_engine
+        
+            # define connection url
+            connection_url = _db_connection_url(db_connection_config)
+            if connection_url is None: return None
+
+            # create connection engine
+            db_engine = _instrument_engine(create_engine(connection_url, **_db_engine_options(db_connection_config)))
+
+            # register engine
+            _DB_ENGINE_REGISTRY[engine_key] = db_engine
+
+            return db_engine
+        
+    except Exception as e:
+        print(f"ERROR: unable to connect to database")
+        print(e)
+
+        return None
+
+
+#############################################################################
+
+def dispose_engines(
+    db_connection_config: dict=None,
+    close: bool=True
+    ) -> int:
+    """
+    disposes registered connection engines and removes them from the engine registry
+        - call with close=False in forked worker processes to drop inherited pools 
+          without closing connections still used by the parent process
+
+    Parameters
+    ----------
+    db_connection_config : dict, optional
+        dispose only the engine of the given connection config, by default None (all engines)
+    close : bool, optional
+        close pooled connections, by default True
+
+    Returns
+    -------
+    int
+        number of disposed engines
+    """
+
+    with _DB_ENGINE_REGISTRY_LOCK:
+
+        # select engines to dispose
+        if db_connection_config is not None:
+            engine_keys = [k for k in [_db_engine_key(db_connection_config)] if k in _DB_ENGINE_REGISTRY]
+        else:
+            engine_keys = list(_DB_ENGINE_REGISTRY.keys())
+
+        # dispose engines
+        for engine_key in engine_keys:
+            _DB_ENGINE_REGISTRY.pop(engine_key).dispose(close=close)
+
+    return len(engine_keys)
+
+
+#############################################################################
+
+def _db_read_query(
+    query: str=None
+    ) -> str:
+    """
+    resolves query input into a SQL query string
+
+    Parameters
+    ----------
+    query : str
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+
+    Returns
+    -------
+    str
+        SQL query string
+    """
+
+    # read sql from file
+    if query[-4:].lower() == ".sql":
+
+        sql_string = _db_read_sql_file(query)
+
+    # collect everything from object
+    elif re.search(f"^\w+(\.)?\w+$", query, flags= re.I):
+
+        sql_string = f"SELECT * FROM {query}"
+
+    else:
+        sql_string = query
+
+    return sql_string
+
+
+#############################################################################
+
+def _db_read_sql_file(
+    file_path: str=None
+    ) -> str:
+    """
+    reads SQL file through the template cache, cached content is reloaded once the file modification time changes
+
+    Parameters
+    ----------
+    file_path : str
+        path to SQL file, by default None
+
+    Returns
+    -------
+    str
+        SQL string
+    """
+
+    file_mtime = os.path.getmtime(file_path)
+    cached_template = _SQL_TEMPLATE_CACHE.get(file_path)
+
+    if cached_template is None or cached_template[0] != file_mtime:
+        with open(file_path) as f:
+            cached_template = (file_mtime, f.read())
+        _SQL_TEMPLATE_CACHE[file_path] = cached_template
+
+    return cached_template[1]
+
+
+#############################################################################
+
+@lru_cache(maxsize=1024)
+def _db_text(
+    sql_string: str=None
+    ) -> object:
+    """
+    returns compiled SQLAlchemy text clause, clauses are cached by SQL string
+
+    Parameters
+    ----------
+    sql_string : str
+        SQL string with optional :name bind parameters, by default None
+
+    Returns
+    -------
+    object
+        SQLAlchemy text clause
+    """
+
+    return text(sql_string)
+
+
+#############################################################################
+
+def _db_subquery(
+    sql_string: str=None
+    ) -> str:
+    """
+    wraps query as derived table q, statement terminators are removed and the closing 
+    parenthesis is placed on its own line to keep it out of trailing -- comments
+
+    Parameters
+    ----------
+    sql_string : str
+        SQL query string, by default None
+
+    Returns
+    -------
+    str
+        derived table expression
+    """
+
+    return f"({sql_string.strip().rstrip(';')}\n) AS q"
+
+
+#############################################################################
+
+def _psql_render_params(
+    db_engine: object=None,
+    sql_string: str=None,
+    params: dict=None
+    ) -> str:
+    """
+    renders :name bind parameters as quoted literals by the driver, 
+    used where the server cannot bind parameters (e.g. COPY)
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    sql_string : str
+        SQL string with :name bind parameters, by default None
+    params : dict
+        bind parameter values, by default None
+
+    Returns
+    -------
+    str
+        SQL string with literal values
+    """
+
+    # translate bind parameters to driver format, literal % signs are escaped
+    driver_sql = BIND_PARAM_PATTERN.sub(lambda m: f"%({m.group(1)})s", sql_string.replace('%', '%%'))
+
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+        with dbapi_connection.cursor() as cur:
+            return cur.mogrify(driver_sql, params).decode()
+    finally:
+        dbapi_connection.close()
+
+
+#############################################################################
+
+def _psql_execute_prepared(
+    db_engine: object=None,
+    sql_string: str=None,
+    params: dict=None
+    ) -> pd.DataFrame:
+    """
+    executes query as a server-side prepared statement, each pooled connection prepares 
+    the statement once and later calls skip parsing and planning
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    sql_string : str
+        SQL query string with optional :name bind parameters, by default None
+    params : dict, optional
+        bind parameter values, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        pandas dataframe with the result set
+    """
+
+    params = params or {}
+    statement_name = f"dept_{md5_hash([sql_string], case_sensitivity=True)}"
+
+    # translate bind parameters to positional server parameters
+    param_names = list(dict.fromkeys(BIND_PARAM_PATTERN.findall(sql_string)))
+    prepared_sql = BIND_PARAM_PATTERN.sub(lambda m: f"${param_names.index(m.group(1)) + 1}", sql_string)
+
+    with db_engine.connect() as c:
+
+        # prepared statements live as long as the DBAPI connection, tracked in its pool info
+        dbapi_connection = c.connection
+        prepared_statements = dbapi_connection.info.setdefault('prepared_statements', set())
+
+        with dbapi_connection.cursor() as cur:
+
+            if statement_name not in prepared_statements:
+                cur.execute(f"PREPARE {statement_name} AS {prepared_sql}")
+                prepared_statements.add(statement_name)
+
+            if len(param_names) > 0:
+                cur.execute(f"EXECUTE {statement_name}({', '.join(['%s'] * len(param_names))})", [params[k] for k in param_names])
+            else:
+                cur.execute(f"EXECUTE {statement_name}")
+
+            rows = cur.fetchall() if cur.description is not None else []
+            columns = [d.name for d in cur.description] if cur.description is not None else []
+
+        c.commit()
+
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+#############################################################################
+
+def _dataframe_downcast(
+    data: pd.DataFrame=None,
+    category_ratio: float=DOWNCAST_CATEGORY_RATIO
+    ) -> pd.DataFrame:
+    """
+    shrinks DataFrame memory by downcasting numeric columns and converting low-cardinality strings to categoricals
+        -> float columns are downcast only if no value changes
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    category_ratio : float, optional
+        share of distinct values below which string columns become categoricals, by default DOWNCAST_CATEGORY_RATIO
+
+    Returns
+    -------
+    pd.DataFrame
+        downcast pandas dataframe
+    """
+
+    data = data.copy()
+
+    for column_name, column_data in data.items():
+
+        if pd.api.types.is_bool_dtype(column_data.dtype):
+            continue
+
+        elif pd.api.types.is_integer_dtype(column_data.dtype):
+            data[column_name] = pd.to_numeric(column_data, downcast='integer')
+
+        elif pd.api.types.is_float_dtype(column_data.dtype):
+            downcast_data = pd.to_numeric(column_data, downcast='float')
+            if downcast_data.astype(column_data.dtype).equals(column_data):
+                data[column_name] = downcast_data
+
+        elif column_data.dtype == object and len(column_data) > 0:
+            if pd.api.types.infer_dtype(column_data, skipna=True) == 'string' and column_data.nunique() < category_ratio * len(column_data):
+                data[column_name] = column_data.astype('category')
+
+    return data
+
+
+#############################################################################
+    
+@decorator_timer
+@_db_instrumented
+def db_query(
+    db_connection_config: dict=None,
+    query: str=None,
+    chunksize: int=None,
+    extract_mode: str="read_sql",
+    partition_column: str=None,
+    num_partitions: int=4,
+    bounds: tuple=None,
+    cache_ttl: int=None,
+    params: dict=None,
+    prepare: bool=False,
+    downcast: bool=False
+    ) -> pd.DataFrame:
+    """
+    _summary_
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    query : str
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+    chunksize : int, optional
+        record chunk size, result set is streamed in chunks and concatenated once, by default None
+    extract_mode : str, optional
+        result set extraction method, by default "read_sql"
+        -> 'read_sql' - rows fetched through the DBAPI cursor and converted by pandas
+        -> 'copy' - [postgres] result set exported by COPY TO STDOUT as CSV and parsed by the pandas C parser
+           while it is received, dtypes follow read_sql, see _psql_select_copy, not combinable with chunksize
+    partition_column : str, optional
+        numeric/temporal result column used to split the query into num_partitions non-overlapping ranges
+        collected concurrently over pooled connections and concatenated in range order, by default None
+        -> rows outside bounds are collected by the first/last partition, NULL values by the first partition
+        -> partitions are collected concurrently up to pool_size + max_overflow of the connection config
+        -> not combinable with chunksize
+    num_partitions : int, optional
+        number of range partitions for partition_column, by default 4
+    bounds : tuple, optional
+        (lower, upper) partition_column values used to compute ranges, by default None (min/max of the result set)
+    cache_ttl : int, optional
+        seconds a result set is served from the local query cache, by default None (cache not used)
+        -> entries older than cache_ttl are not served, regardless of the cache_ttl they were stored with
+        -> see db_query_cache_stats, db_query_cache_invalidate
+    params : dict, optional
+        values of :name bind parameters in the query, by default None
+    prepare : bool, optional
+        [postgres] execute as server-side prepared statement reused by later calls on the same pooled connection, 
+        by default False
+        -> not combinable with chunksize, extract_mode 'copy' and partition_column
+    downcast : bool, optional
+        shrink result set memory, by default False
+        -> integers and lossless floats downcast to the smallest dtype
+        -> string columns with a distinct value share below DOWNCAST_CATEGORY_RATIO converted to categoricals
+
+    Returns
+    -------
+    pd.DataFrame
+        pandas dataframe with the result set
+    """
+
+    try:
+
+        if extract_mode == 'copy' and db_connection_config['type'].lower() != 'postgres':
+            raise Exception(f"extract_mode 'copy' is not supported for {db_connection_config['type']} connections")
+
+        # collection methods cannot be combined, conflicting arguments are rejected instead of ignored
+        if chunksize is not None and (extract_mode == 'copy' or partition_column is not None):
+            raise Exception("chunksize cannot be combined with extract_mode 'copy' or partition_column")
+
+        if prepare == True and (chunksize is not None or extract_mode == 'copy' or partition_column is not None):
+            raise Exception("prepare cannot be combined with chunksize, extract_mode 'copy' or partition_column")
+
+        # read query
+        sql_string = _db_read_query(query)
+
+        # serve result set from local query cache
+        if cache_ttl is not None:
+            cache_key = _query_cache_key(db_connection_config, sql_string, params, extract_mode, downcast)
+            df = _query_cache_read(cache_key, cache_ttl)
+            if df is not None: return df
+
+        # render parameters for statements built around the query
+        if params is not None and (extract_mode == 'copy' or partition_column is not None):
+            sql_string = _psql_render_params(_db_connection_engine(db_connection_config), sql_string, params)
+
+        # collect query
+        if prepare == True:
+
+            # create connection engine
+            db_engine = _db_connection_engine(db_connection_config)
+
+            df = _psql_execute_prepared(db_engine, sql_string, params)
+
+        elif partition_column is not None:
+
+            df = _db_query_partitioned(
+                db_connection_config=db_connection_config,
+                sql_string=sql_string,
+                partition_column=partition_column,
+                num_partitions=num_partitions,
+                bounds=bounds,
+                extract_mode=extract_mode
+                )
+
+        elif extract_mode == 'copy':
+
+            # create connection engine
+            db_engine = _db_connection_engine(db_connection_config)
+
+            df = _psql_select_copy(db_engine, sql_string)
+
+        elif chunksize is None: 
+
+            # create connection engine
+            db_engine = _db_connection_engine(db_connection_config)
+
+            df = pd.read_sql(_db_text(sql_string), db_engine, params=params)
+
+        else:
+            df_chunks = list(db_query_iter(db_connection_config, sql_string, chunksize=chunksize, params=params))
+            df = pd.concat(df_chunks, ignore_index=True) if len(df_chunks) > 0 else pd.DataFrame()
+
+        if downcast == True: df = _dataframe_downcast(df)
+
+        # store result set in local query cache
+        if cache_ttl is not None:
+            _query_cache_write(cache_key, df, sql_string, cache_ttl)
+
+        return df
+    
+    except Exception as e:
+        print(e)
+        return None
+
+
+#############################################################################
+
+def _sql_literal(
+    value=None
+    ) -> str:
+    """
+    renders a partition bound as SQL literal
+
+    Parameters
+    ----------
+    value
+        numeric or temporal value, by default None
+
+    Returns
+    -------
+    str
+        SQL literal string
+    """
+
+    if isinstance(value, (datetime, pd.Timestamp, np.datetime64)):
+        return f"'{pd.Timestamp(value).isoformat()}'"
+    elif hasattr(value, 'isoformat'):
+        return f"'{value.isoformat()}'"
+    else:
+        return str(value.item() if isinstance(value, np.generic) else value)
+
+
+#############################################################################
+
+def _db_partition_predicates(
+    partition_column: str=None,
+    num_partitions: int=4,
+    lower=None,
+    upper=None
+    ) -> list:
+    """
+    splits [lower, upper] range into non-overlapping partition predicates, 
+    first and last partition are open-ended so no rows are missed
+
+    Parameters
+    ----------
+    partition_column : str
+        partition column name, by default None
+    num_partitions : int, optional
+        number of partitions, by default 4
+    lower
+        lower bound, by default None
+    upper
+        upper bound, by default None
+
+    Returns
+    -------
+    list
+        list of SQL predicate strings
+    """
+
+    column = f'q."{partition_column}"'
+
+    # compute partition boundaries
+    if isinstance(lower, (int, np.integer)) and isinstance(upper, (int, np.integer)):
+        boundaries = [int(lower) + (int(upper) - int(lower)) * i // num_partitions for i in range(1, num_partitions)]
+    else:
+        boundaries = [lower + (upper - lower) * i / num_partitions for i in range(1, num_partitions)]
+
+    # drop duplicate boundaries of narrow ranges
+    boundaries = sorted(set(boundaries), key=boundaries.index)
+
+    if len(boundaries) == 0:
+        return ["TRUE"]
+
+    predicates = [f"{column} < {_sql_literal(boundaries[0])} OR {column} IS NULL"]
+    for i in range(1, len(boundaries)):
+        predicates.append(f"{column} >= {_sql_literal(boundaries[i - 1])} AND {column} < {_sql_literal(boundaries[i])}")
+    predicates.append(f"{column} >= {_sql_literal(boundaries[-1])}")
+
+    return predicates
+
+
+#############################################################################
+
+def _db_query_partitioned(
+    db_connection_config: dict=None,
+    sql_string: str=None,
+    partition_column: str=None,
+    num_partitions: int=4,
+    bounds: tuple=None,
+    extract_mode: str="read_sql"
+    ) -> pd.DataFrame:
+    """
+    collects query result set in range partitions on a thread pool over pooled connections
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    sql_string : str
+        SQL query string, by default None
+    partition_column : str
+        numeric/temporal result column to partition by, by default None
+    num_partitions : int, optional
+        number of range partitions, by default 4
+    bounds : tuple, optional
+        (lower, upper) partition column values, by default None (min/max of the result set)
+    extract_mode : str, optional
+        result set extraction method, by default "read_sql"
+        -> ['read_sql', 'copy']
+
+    Returns
+    -------
+    pd.DataFrame
+        pandas dataframe with the result set ordered by partition
+    """
+
+    # create connection engine
+    db_engine = _db_connection_engine(db_connection_config)
+
+    # read bounds from the result set
+    if bounds is None:
+        with db_engine.connect() as c:
+            bounds = tuple(c.execute(text(f'SELECT min(q."{partition_column}"), max(q."{partition_column}") FROM {_db_subquery(sql_string)}')).one())
+
+    # empty result set
+    if bounds[0] is None:
+        predicates = ["TRUE"]
+    else:
+        predicates = _db_partition_predicates(partition_column, num_partitions, *bounds)
+
+    partition_queries = [f"SELECT * FROM {_db_subquery(sql_string)} WHERE {predicate}" for predicate in predicates]
+
+    def collect_partition(partition_query):
+        if extract_mode == 'copy':
+            return _psql_select_copy(db_engine, partition_query)
+        else:
+            return pd.read_sql(text(partition_query), db_engine)
+
+    # collect partitions concurrently, partitions waiting for a pooled connection would run into pool_timeout
+    max_workers = min(len(partition_queries), _db_pool_capacity(db_connection_config))
+
+    # results keep partition order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        df_partitions = list(executor.map(collect_partition, partition_queries))
+
+    # empty partitions are skipped to keep dtypes of collected rows
+    df_partitions = [df for df in df_partitions if len(df) > 0] or df_partitions[:1]
+
+    return pd.concat(df_partitions, ignore_index=True)
+
+
+#############################################################################
+
+def db_query_iter(
+    db_connection_config: dict=None,
+    query: str=None,
+    chunksize: int=10000,
+    params: dict=None
+    ):
+    """
+    streams query result set in DataFrame chunks using a server-side cursor, 
+    only one chunk of records is held in memory at a time
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    query : str
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+    chunksize : int, optional
+        record chunk size, by default 10000
+    params : dict, optional
+        values of :name bind parameters in the query, by default None
+
+    Yields
+    ------
+    pd.DataFrame
+        pandas dataframe with a chunk of the result set
+    """
+
+    try:
+
+        # read query
+        sql_string = _db_read_query(query)
+
+        # create connection engine
+        db_engine = _db_connection_engine(db_connection_config)
+
+        # stream records through a named server-side cursor
+        with db_engine.connect() as c:
+            c = c.execution_options(stream_results=True, yield_per=chunksize)
+
+            for df_chunk in pd.read_sql(_db_text(sql_string), c, chunksize=chunksize, params=params):
+                yield df_chunk
+
+    except Exception as e:
+        print(f"ERROR: unable to stream query result set")
+        print(e)
+        raise
+
+
+#############################################################################
+
+class _CopyOutStream(io.RawIOBase):
+    """
+    readable file object over COPY TO STDOUT output, COPY writes from a background thread 
+    while the reader parses, only up to queue_size written blocks are held in memory
+
+    Parameters
+    ----------
+    queue_size : int, optional
+        maximum number of written blocks waiting to be read, by default 4
+    block_size : int, optional
+        number of bytes collected from COPY before a block is handed over, by default COPY_READ_SIZE
+    """
+
+    def __init__(
+        self,
+        queue_size: int=4,
+        block_size: int=COPY_READ_SIZE
+        ):
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._abandoned = threading.Event()
+        self._block_size = block_size
+        self._block = bytearray()
+        self._slice = memoryview(b'')
+
+    def _put(
+        self,
+        item=None
+        ) -> bool:
+
+        # wait for free queue slot unless the reader is closed
+        while not self._abandoned.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def write(
+        self,
+        data=None
+        ) -> int:
+
+        # COPY writes one row at a time, rows are collected into blocks
+        self._block += data
+
+        if len(self._block) >= self._block_size:
+            if self._put(bytes(self._block)) == False: raise Exception("COPY TO STDOUT reader was closed")
+            self._block = bytearray()
+
+        return len(data)
+
+    def finish(
+        self,
+        error: Exception=None
+        ):
+
+        if error is None and len(self._block) > 0: self._put(bytes(self._block))
+        self._put(error)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+
+        # None marks the end of the COPY output
+        while len(self._slice) == 0:
+            item = self._queue.get()
+            if item is None:
+                self._queue.put(None)
+                return 0
+            if isinstance(item, Exception): raise item
+            self._slice = memoryview(item)
+
+        size = min(len(buffer), len(self._slice))
+        buffer[:size] = self._slice[:size]
+        self._slice = self._slice[size:]
+
+        return size
+
+    def close(self):
+
+        self._abandoned.set()
+        super().close()
+
+
+#############################################################################
+
+def _psql_temporal_values(
+    values: pd.Series=None,
+    data_type: str=None
+    ) -> pd.Series:
+    """
+    parses ISO 8601 date/timestamp text exported by COPY, infinite values become pd.Timestamp.max/min
+
+    Parameters
+    ----------
+    values : pd.Series
+        date/timestamp text, by default None
+    data_type : str
+        PSQL_OID_DTYPE_MAPPING data type, by default None
+        -> ['date', 'datetime64[ns]', 'datetime64[ns, UTC]']
+
+    Returns
+    -------
+    pd.Series
+        datetime64 values, datetime.date objects for date columns
+    """
+
+    infinite_values = values.isin(['infinity', '-infinity'])
+    timestamps = pd.to_datetime(values.mask(infinite_values), format="ISO8601")
+
+    if infinite_values.any():
+        timestamps = timestamps.mask(values == 'infinity', pd.Timestamp.max).mask(values == '-infinity', pd.Timestamp.min)
+
+    if data_type == "datetime64[ns, UTC]":
+        return timestamps.dt.tz_localize("UTC")
+    elif data_type == "date":
+        return timestamps.dt.date.where(timestamps.notna(), None)
+
+    return timestamps
+
+
+#############################################################################
+
+def _psql_select_copy(
+    db_engine: object=None,
+    sql_string: str=None
+    ) -> pd.DataFrame:
+    """
+    collects query result set through COPY TO STDOUT, read-side counterpart of _psql_copy_dataframe
+        - COPY output is parsed by the pandas C parser while it is received, the CSV text is not buffered
+        - column types are read from the result metadata and used for vectorized parsing
+        - NULL is exported as \\N to keep NULL and empty strings apart
+        - dtypes follow read_sql: numeric as float64, date as datetime.date objects, interval as timedelta64,
+          json/jsonb parsed, other types (arrays, ranges, ...) are returned as their text representation
+        - infinite dates and timestamps are returned as pd.Timestamp.max/min
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    sql_string : str
+        SQL query string, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        pandas dataframe with the result set
+    """
+
+    # gets DBAPI connection that can provide a cursor
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+        with dbapi_connection.cursor() as cur:
+
+            # read result column types without fetching rows
+            cur.execute(f"SELECT * FROM {_db_subquery(sql_string)} LIMIT 0")
+            column_types = {d.name: PSQL_OID_DTYPE_MAPPING.get(d.type_code, "object") for d in cur.description}
+
+            # export timestamptz columns as UTC timestamps, offset parsing is slow on the client, 
+            # intervals as seconds
+            column_projection = ', '.join([
+                f'q."{k}" AT TIME ZONE \'UTC\' AS "{k}"' if v == "datetime64[ns, UTC]" 
+                else f'extract(epoch FROM q."{k}") AS "{k}"' if v == "timedelta64[ns]"
+                else f'q."{k}"' 
+                for k, v in column_types.items()
+            ])
+
+            # export result set in a background thread while the parser consumes it
+            copy_stream = _CopyOutStream()
+            psql_statement = f"COPY (SELECT {column_projection} FROM {_db_subquery(sql_string)}) TO STDOUT WITH (FORMAT csv, HEADER, NULL '\\N')"
+            copy_timing = {}
+
+            def export_result_set():
+                copy_start = perf_counter()
+                try:
+                    cur.copy_expert(sql=psql_statement, file=copy_stream)
+                    copy_stream.finish()
+                except Exception as e:
+                    copy_stream.finish(e)
+                finally:
+                    copy_timing['execute'] = perf_counter() - copy_start
+
+            copy_thread = threading.Thread(target=export_result_set, daemon=True)
+            copy_thread.start()
+
+            # parse stream, integer and boolean types are inferred to resolve null presence like read_sql does,
+            # float NaN is exported as 'NaN' and has to be declared, 'Infinity'/'-Infinity' are parsed natively
+            try:
+                with io.BufferedReader(copy_stream, buffer_size=COPY_READ_SIZE) as copy_reader:
+                    df = pd.read_csv(
+                        copy_reader,
+                        dtype={k: "float64" if v in ["float64", "timedelta64[ns]"] else "object" for k, v in column_types.items() if v not in ["bool", "int64"]},
+                        na_values={k: ["\\N", "NaN"] if v == "float64" else ["\\N"] for k, v in column_types.items()},
+                        keep_default_na=False,
+                        true_values=["t"],
+                        false_values=["f"]
+                    )
+            finally:
+                copy_thread.join()
+
+            _instrumentation_add('execute', copy_timing['execute'])
+
+        dbapi_connection.commit()
+
+    finally:
+        dbapi_connection.close()
+
+    # convert temporal and json columns
+    for column_name, data_type in column_types.items():
+        if data_type in ["date", "datetime64[ns]", "datetime64[ns, UTC]"]:
+            df[column_name] = _psql_temporal_values(df[column_name], data_type)
+        elif data_type == "timedelta64[ns]":
+            df[column_name] = pd.to_timedelta(df[column_name], unit="s").dt.round("us")
+        elif data_type == "json":
+            df[column_name] = df[column_name].map(json.loads, na_action="ignore")
+
+    return df
+
+
+#############################################################################
+
+@decorator_timer
+@_db_instrumented
+def db_execute(
+    db_connection_config: dict=None,
+    query: str=None,
+    params: dict=None
+    ) -> bool:
+    """
+    _summary_
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    query : str
+        SQL statement string/file path to SQL file with a single SQL statement string, by default None
+        -> list of statements is executed by db_execute_batch on one connection in a single transaction
+    params : dict, optional
+        values of :name bind parameters in the statement, by default None
+
+    Returns
+    -------
+    bool
+        True if statement executed successfully
+    """
+
+    # execute statement list as a batch
+    if isinstance(query, (list, tuple)):
+        batch_report = db_execute_batch(db_connection_config, query)
+        return batch_report is not None and all('error' not in r for r in batch_report)
+
+    try:
+
+        # read sql from file
+        if query[-4:].lower() == ".sql":
+
+            sql_string = _db_read_sql_file(query)
+
+        else:
+            sql_string = query
+
+        # create connection engine
+        db_engine = _db_connection_engine(db_connection_config)
+
+        with db_engine.begin() as c:
+            c.execute(_db_text(sql_string), params)
+
+        # cached table metadata may be outdated after DDL
+        if re.search(DDL_PATTERN, sql_string, flags=re.I):
+            db_metadata_invalidate(db_connection_config)
+
+        return True
+    
+    except Exception as e:
+        print(e)
+        return False
+
+
+#############################################################################
+
+def _split_sql_statements(
+    sql_string: str=None
+    ) -> list:
+    """
+    splits multi-statement SQL script on top-level semicolons, 
+    semicolons inside quotes, dollar-quoted bodies and comments are kept
+
+    Parameters
+    ----------
+    sql_string : str
+        SQL script, by default None
+
+    Returns
+    -------
+    list
+        list of non-empty SQL statement strings
+    """
+
+    token_pattern = re.compile(r"""
+        (--[^\n]*)                     # line comment
+        | (/\*.*?\*/)                  # block comment
+        | ('(?:[^']|'')*')              # string literal
+        | ("(?:[^"]|"")*")              # quoted identifier
+        | (\$(\w*)\$.*?\$\6\$)            # dollar-quoted body
+        | (;)                           # statement terminator
+        """, flags=re.S | re.X)
+
+    statements = []
+    statement_start = 0
+
+    for match in token_pattern.finditer(sql_string):
+        if match.group(7) is not None:
+            statements.append(sql_string[statement_start:match.start()])
+            statement_start = match.end()
+
+    statements.append(sql_string[statement_start:])
+
+    # drop empty and comment-only statements
+    return [
+        statement.strip() for statement in statements 
+        if re.sub(r'--[^\n]*|/\*.*?\*/', '', statement, flags=re.S).strip() != ''
+    ]
+
+
+#############################################################################
+
+@decorator_timer
+def db_execute_batch(
+    db_connection_config: dict=None,
+    statements=None,
+    single_transaction: bool=True
+    ) -> list:
+    """
+    executes multiple SQL statements on one pooled connection with per-statement timing
+        - parameterized DML is executed once per parameter set (executemany)
+        - execution stops at the first failing statement
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    statements : list/str
+        SQL statements, by default None
+        -> list of SQL statement strings or (SQL statement string, params) tuples, 
+           params being a dict or a list of dicts for executemany
+        -> multi-statement SQL string/file path to SQL file, split on top-level semicolons
+    single_transaction : bool, optional
+        run all statements in one transaction rolled back on failure, by default True
+        -> False - every statement is committed on its own (autocommit), e.g. for VACUUM or CREATE INDEX CONCURRENTLY
+
+    Returns
+    -------
+    list
+        per-statement reports {"statement", "rowcount", "duration"}, the failed statement reports "error" instead,
+        None if the connection could not be established
+    """
+
+    # read statements from file/script
+    if isinstance(statements, str):
+        if statements[-4:].lower() == ".sql":
+            statements = _db_read_sql_file(statements)
+        statements = _split_sql_statements(statements)
+
+    # create connection engine
+    db_engine = _db_connection_engine(db_connection_config)
+    if db_engine is None: return None
+
+    batch_report = []
+    ddl_executed = False
+
+    try:
+
+        with db_engine.connect() as c:
+
+            if single_transaction == False:
+                c = c.execution_options(isolation_level="AUTOCOMMIT")
+
+            with c.begin():
+                for statement in statements:
+
+                    sql_string, params = statement if isinstance(statement, (list, tuple)) else (statement, None)
+                    statement_report = {"statement": sql_string.strip()[:200]}
+                    batch_report.append(statement_report)
+
+                    # execute statement and measure duration
+                    f_start = perf_counter()
+                    result = c.execute(_db_text(sql_string), params)
+                    statement_report['rowcount'] = result.rowcount
+                    statement_report['duration'] = perf_counter() - f_start
+
+                    ddl_executed = ddl_executed or re.search(DDL_PATTERN, sql_string, flags=re.I) is not None
+
+    except Exception as e:
+        print(e)
+        if len(batch_report) > 0: 
+            batch_report[-1]['error'] = str(e)
+
+    # cached table metadata may be outdated after DDL
+    if ddl_executed == True or (len(batch_report) > 0 and 'error' in batch_report[-1]):
+        db_metadata_invalidate(db_connection_config)
+
+    return batch_report
+
+
+#############################################################################
+
+@decorator_timer
+def db_create_table(
+    db_connection_config: dict=None,
+    data_schema: dict=None, 
+    table_address: str=None, 
+    ownership: str=None,
+    normalize_column_names: bool=True,
+    indexes: list=None
+    ) -> bool:
+    """
+    creates a database table
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    data_schema : dict
+        column_name (key) + data_type (value) mapping, by default None
+    table_address : str
+        target table address, by default None
+    ownership : str, optional
+        table ownership assignment, by default None
+    normalize_column_names : bool, optional
+        column names normalized to lower case, special characters replaced with _
+    indexes : list, optional
+        index definitions created with the table, by default None
+        -> column name/list of column names - CREATE INDEX ON table_address (columns)
+        -> CREATE [UNIQUE] INDEX statement - executed as is, e.g. definitions captured by _psql_table_dependencies
+
+    Returns
+    -------
+    bool
+        True if table created successfully
+    """
+
+    # execute statement
+    sql_execute_statement = _db_table_definition(data_schema, table_address, ownership, normalize_column_names, indexes)
+
+    return db_execute(db_connection_config, sql_execute_statement)
+
+
+#############################################################################
+
+def _db_table_definition(
+    data_schema: dict=None, 
+    table_address: str=None, 
+    ownership: str=None,
+    normalize_column_names: bool=True,
+    indexes: list=None
+    ) -> str:
+    """
+    generates table definition script
+
+    Parameters
+    ----------
+    data_schema : dict
+        column_name (key) + data_type (value) mapping, by default None
+    table_address : str
+        target table address, by default None
+    ownership : str, optional
+        table ownership assignment, by default None
+    normalize_column_names : bool, optional
+        column names normalized to lower case, special characters replaced with _
+    indexes : list, optional
+        index definitions, column name/list of column names/CREATE INDEX statement, by default None
+
+    Returns
+    -------
+    str
+        CREATE TABLE statement followed by the ownership assignment and index definitions
+    """
+
+    # join column definitions into SQL statement 
+    if normalize_column_names == True:
+        sql_columns_defintion = ",\n".join([f"{normalize_key(column_name)} {data_type}" for column_name, data_type in data_schema.items()])
+
+    else:
+        sql_columns_defintion = ",\n".join([f"{column_name} {data_type}" for column_name, data_type in data_schema.items()])
+
+    # generate table definition script
+    sql_table_definition = f"""
+    CREATE TABLE {table_address}(
+        {sql_columns_defintion}
+    );
+    """
+
+    # assign ownership
+    if ownership is not None:
+        ownership_assignment = f"ALTER TABLE {table_address} OWNER TO {ownership};"
+    else: 
+        ownership_assignment = ""
+
+    # generate index definitions
+    index_definitions = []
+
+    for index_definition in (indexes or []):
+
+        if isinstance(index_definition, str) and re.search(r'^\s*CREATE\s', index_definition, flags=re.I):
+            index_definitions.append(index_definition.strip().rstrip(';') + ";")
+            continue
+
+        index_columns = [index_definition] if isinstance(index_definition, str) else list(index_definition)
+        if normalize_column_names == True:
+            index_columns = [normalize_key(column_name) for column_name in index_columns]
+
+        index_definitions.append(f"CREATE INDEX ON {table_address} ({', '.join(index_columns)});")
+
+    return sql_table_definition + "\n" + ownership_assignment + "\n" + "\n".join(index_definitions)
+
+
+#############################################################################
+
+def _db_sql_data_schema(
+    data: pd.DataFrame=None,
+    db_type: str=None,
+    infer_varchar: bool=False
+    ) -> dict:
+    """
+    translates DataFrame dtypes into database data types using DATATYPE_MAPPING
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    db_type : str
+        database type, by default None
+    infer_varchar : bool, optional
+        string columns typed as VARCHAR sized by their longest value, by default False
+
+    Returns
+    -------
+    dict
+        column_name (key) + data_type (value) mapping
+    """
+
+    # read data mapping dictionary
+    datatype_mapping = DATATYPE_MAPPING[db_type.lower()]
+
+    return {
+        column_name: _db_sql_data_type(column_data, datatype_mapping, infer_varchar)
+        for column_name, column_data in data.items()
+    }
+
+
+#############################################################################
+
+def _db_sql_data_type(
+    column_data: pd.Series=None,
+    datatype_mapping: dict=None,
+    infer_varchar: bool=False
+    ) -> str:
+    """
+    translates a column dtype into a database data type, unmapped dtypes are stored as object type
+        -> categoricals are stored by the type of their categories
+        -> object columns are typed by their inferred content (decimal, date, integer, ...)
+        -> VARCHAR length is the longest value rounded up to a power of 2
+
+    Parameters
+    ----------
+    column_data : pd.Series
+        column values, by default None
+    datatype_mapping : dict
+        dtype (key) + data type (value) mapping of the database type, by default None
+    infer_varchar : bool, optional
+        string columns typed as VARCHAR sized by their longest value, by default False
+
+    Returns
+    -------
+    str
+        database data type
+    """
+
+    column_dtype = column_data.dtype
+
+    # low-cardinality columns take the type of their categories
+    if isinstance(column_dtype, pd.CategoricalDtype):
+        return _db_sql_data_type(pd.Series(column_dtype.categories), datatype_mapping, infer_varchar)
+
+    if isinstance(column_dtype, pd.DatetimeTZDtype):
+        return datatype_mapping['datetimetz']
+
+    if pd.api.types.is_datetime64_dtype(column_dtype):
+        return datatype_mapping['datetime64[ns]']
+
+    if str(column_dtype) not in ['object', 'string']:
+        return datatype_mapping.get(str(column_dtype), datatype_mapping['object'])
+
+    # type object columns by content, all-null columns stay object type
+    inferred_type = pd.api.types.infer_dtype(column_data, skipna=True)
+    if inferred_type != 'string':
+        return datatype_mapping.get(inferred_type, datatype_mapping['object'])
+
+    if infer_varchar == True:
+        max_length = column_data.str.len().max()
+        if max_length == max_length:
+            return f"VARCHAR({2 ** int(np.ceil(np.log2(max(max_length, 1))))})"
+
+    return datatype_mapping['string']
+
+
+#############################################################################
+
+class _CopyStream:
+    """
+    file-like object feeding COPY FROM STDIN with CSV text or binary data serialized slice by slice,
+    only the slice being read and up to queue_size serialized slices are held in memory
+
+    Parameters
+    ----------
+    copy_slices : iterable
+        iterable of CSV text or PGCOPY binary slices, by default None
+    background : bool, optional
+        serialize slices in a background thread while COPY sends previous slices, by default True
+    queue_size : int, optional
+        maximum number of serialized slices waiting to be sent, by default 2
+    """
+
+    def __init__(
+        self,
+        copy_slices=None,
+        background: bool=True,
+        queue_size: int=2
+        ):
+
+        self._copy_slices = iter(copy_slices)
+        self._background = background
+        self._buffer = ''
+        self._position = 0
+
+        # start serialization thread
+        if self._background == True:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._closed = threading.Event()
+            self._thread = threading.Thread(target=self._produce, daemon=True)
+            self._thread.start()
+
+    def _put(
+        self,
+        item=None
+        ) -> bool:
+
+        # wait for free queue slot unless the stream gets closed
+        while not self._closed.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def _produce(self):
+
+        try:
+            for copy_slice in self._copy_slices:
+                if self._put(copy_slice) == False: return
+            self._put(None)
+
+        except Exception as e:
+            self._put(e)
+
+    def _next_slice(self):
+
+        if self._background == False:
+            return next(self._copy_slices, None)
+
+        item = self._queue.get()
+        if isinstance(item, Exception): raise item
+
+        return item
+
+    def read(
+        self,
+        size: int=-1
+        ):
+
+        # load next slice once the current one is consumed
+        while self._position >= len(self._buffer):
+            copy_slice = self._next_slice()
+            if copy_slice is None: return self._buffer[:0]
+            self._buffer, self._position = copy_slice, 0
+
+        # return up to size characters/bytes of the current slice
+        end = len(self._buffer) if size is None or size < 0 else self._position + size
+        content = self._buffer[self._position:end]
+        self._position += len(content)
+
+        return content
+
+    def close(self):
+
+        if self._background == True: self._closed.set()
+
+
+#############################################################################
+
+def _csv_slices_from_dataframe(
+    data: pd.DataFrame=None,
+    slice_size: int=COPY_SLICE_SIZE
+    ):
+    """
+    serializes a DataFrame into CSV text slices without copying the whole frame,
+    missing values are written as COPY_CSV_NULL
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    slice_size : int, optional
+        number of rows per slice, by default COPY_SLICE_SIZE
+
+    Yields
+    ------
+    str
+        CSV text slice
+    """
+
+    for start in range(0, len(data), slice_size):
+        string_buffer = StringIO()
+        data.iloc[start:start + slice_size].to_csv(string_buffer, header=False, index=False, lineterminator='\n', na_rep=COPY_CSV_NULL)
+        yield string_buffer.getvalue()
+
+
+#############################################################################
+
+def _pgcopy_type(
+    data_type: str=None
+    ) -> str:
+    """
+    normalizes a postgres data type, catalog names (format_type) and DATATYPE_MAPPING names,
+    to its PGCOPY_BINARY_TYPES/PGCOPY_TEXT_TYPES name
+
+    Parameters
+    ----------
+    data_type : str
+        postgres data type, type modifiers are ignored, by default None
+
+    Returns
+    -------
+    str
+        normalized data type
+    """
+
+    data_type = re.sub(r'\(.*?\)', '', data_type).strip().upper()
+
+    return PGCOPY_TYPE_ALIASES.get(data_type, data_type)
+
+
+#############################################################################
+
+def _pgcopy_numeric(
+    value=None
+    ) -> bytes:
+    """
+    encodes a value as postgres NUMERIC binary: ndigits, weight, sign, dscale and base-10000 digits
+
+    Parameters
+    ----------
+    value
+        int, float, Decimal or numeric string, by default None
+
+    Returns
+    -------
+    bytes
+        NUMERIC binary representation
+    """
+
+    value = Decimal(repr(float(value)) if isinstance(value, (float, np.floating)) else str(value))
+
+    if value.is_nan(): return struct.pack('>hhHh', 0, 0, 0xC000, 0)
+    if value.is_infinite(): raise Exception("binary COPY does not support infinite NUMERIC values -> use copy_format 'csv'")
+
+    sign, digits, exponent = value.as_tuple()
+    dscale = max(-exponent, 0)
+
+    # split decimal digits at the decimal point and align both parts on base-10000 groups
+    decimal_digits = (''.join(map(str, digits)) + '0' * max(exponent, 0)).rjust(dscale + 1, '0')
+    integer_digits, fraction_digits = decimal_digits[:len(decimal_digits) - dscale], decimal_digits[len(decimal_digits) - dscale:]
+    integer_digits = integer_digits.rjust(-(-len(integer_digits) // 4) * 4, '0')
+    fraction_digits = fraction_digits.ljust(-(-len(fraction_digits) // 4) * 4, '0')
+
+    weight = len(integer_digits) // 4 - 1
+    groups = [int((integer_digits + fraction_digits)[i:i + 4]) for i in range(0, len(integer_digits) + len(fraction_digits), 4)]
+
+    # leading and trailing zero groups are not stored
+    while len(groups) > 0 and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while len(groups) > 0 and groups[-1] == 0:
+        groups.pop()
+    if len(groups) == 0: weight = 0
+
+    return struct.pack(f'>hhHh{len(groups)}H', len(groups), weight, 0x4000 if sign == 1 else 0x0000, dscale, *groups)
+
+
+#############################################################################
+
+def _pgcopy_values(
+    values: np.ndarray=None,
+    data_type: str=None,
+    column_name: str=None
+    ) -> tuple:
+    """
+    encodes non-null column values in the binary representation of a postgres data type
+
+    Parameters
+    ----------
+    values : np.ndarray
+        non-null column values, by default None
+    data_type : str
+        normalized postgres data type, by default None
+    column_name : str
+        column name used in error messages, by default None
+
+    Returns
+    -------
+    tuple
+        (uint8 payload of the concatenated values, int64 length of each value)
+    """
+
+    if data_type in PGCOPY_BINARY_TYPES:
+
+        # fixed-width big-endian values, timestamps as microseconds and dates as days since 2000-01-01
+        binary_type = np.dtype(PGCOPY_BINARY_TYPES[data_type])
+
+        if data_type in ["TIMESTAMP", "TIMESTAMPTZ"]:
+            values = (values.astype('datetime64[us]') - PGCOPY_EPOCH).astype(np.int64)
+        elif data_type == "DATE":
+            values = (values.astype('datetime64[D]') - PGCOPY_EPOCH.astype('datetime64[D]')).astype(np.int64)
+        elif binary_type.kind == 'i':
+
+            # integers must fit the target column, binary COPY does not cast or check ranges
+            values = values.astype(np.float64) if values.dtype == object else values
+            if values.dtype.kind == 'f' and len(values) > 0 and not np.all(np.mod(values, 1) == 0):
+                raise Exception(f"column {column_name} holds non-integral values for {data_type} target column")
+            type_range = np.iinfo(binary_type)
+            if len(values) > 0 and (values.min() < type_range.min or values.max() > type_range.max):
+                raise Exception(f"column {column_name} holds values out of the {data_type} range")
+
+        payload = np.ascontiguousarray(values.astype(binary_type)).view(np.uint8)
+        value_lengths = np.full(len(values), binary_type.itemsize, dtype=np.int64)
+
+        return payload, value_lengths
+
+    if data_type == "INTERVAL":
+
+        # microseconds, days and months, durations are stored as microseconds only
+        intervals = np.zeros(len(values), dtype=[('microseconds', '>i8'), ('days', '>i4'), ('months', '>i4')])
+        intervals['microseconds'] = values.astype('timedelta64[us]').astype(np.int64)
+
+        return intervals.view(np.uint8), np.full(len(values), 16, dtype=np.int64)
+
+    if data_type == "NUMERIC":
+        encoded_values = [_pgcopy_numeric(v) for v in values]
+    elif data_type == "UUID":
+        encoded_values = [uuid.UUID(str(v)).bytes for v in values]
+    elif data_type in ["JSON", "JSONB"]:
+        # jsonb is prefixed with its format version
+        prefix = b'\x01' if data_type == "JSONB" else b''
+        encoded_values = [prefix + (v if isinstance(v, str) else json.dumps(v, default=str)).encode('utf-8') for v in values]
+    elif data_type in PGCOPY_TEXT_TYPES:
+        # variable-width UTF-8 text
+        encoded_values = [str(v).encode('utf-8') for v in values]
+    else:
+        raise Exception(f"binary COPY does not support {data_type} column {column_name} -> use copy_format 'csv'")
+
+    payload = np.frombuffer(b''.join(encoded_values), dtype=np.uint8)
+    value_lengths = np.fromiter(map(len, encoded_values), dtype=np.int64, count=len(encoded_values))
+
+    return payload, value_lengths
+
+
+#############################################################################
+
+def _pgcopy_binary_encode(
+    data: pd.DataFrame=None,
+    data_schema: dict=None
+    ) -> bytes:
+    """
+    encodes DataFrame rows into PGCOPY binary tuples, column-wise with NumPy
+        - values are encoded in the data types of data_schema, binary COPY does not cast, 
+          pass the target table column types when appending to existing tables
+        - NaN/NaT/None values are sent as NULL, empty strings stay empty strings like in CSV COPY
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    data_schema : dict, optional
+        column_name (key) + data_type (value) mapping, by default None (derived from data)
+
+    Returns
+    -------
+    bytes
+        PGCOPY binary tuples without file header and trailer
+    """
+
+    data_schema = data_schema or _db_sql_data_schema(data, "postgres")
+    row_count, column_count = data.shape
+
+    # encode columns into field lengths (-1 for NULL) and concatenated non-null payload bytes
+    field_lengths = np.empty((row_count, column_count), dtype=np.int64)
+    field_payloads = []
+
+    for i, (column_name, column_data) in enumerate(data.items()):
+
+        # encode categoricals by their values, timezone-aware timestamps as UTC
+        if isinstance(column_data.dtype, pd.CategoricalDtype):
+            column_data = column_data.astype(column_data.dtype.categories.dtype)
+        if isinstance(column_data.dtype, pd.DatetimeTZDtype):
+            column_data = column_data.dt.tz_convert('UTC').dt.tz_localize(None)
+
+        null_mask = column_data.isna().to_numpy()
+        values = column_data.to_numpy()[~null_mask]
+
+        payload, value_lengths = _pgcopy_values(values, _pgcopy_type(data_schema[column_name]), column_name)
+
+        field_lengths[:, i] = -1
+        field_lengths[~null_mask, i] = value_lengths
+        field_payloads.append((payload, value_lengths, null_mask))
+
+    # compute tuple layout: int16 field count + per field int32 length and payload
+    field_sizes = 4 + np.maximum(field_lengths, 0)
+    row_sizes = 2 + field_sizes.sum(axis=1)
+    row_starts = np.cumsum(row_sizes) - row_sizes
+    field_starts = row_starts[:, None] + 2 + np.cumsum(field_sizes, axis=1) - field_sizes
+
+    tuple_buffer = np.empty(int(row_sizes.sum()), dtype=np.uint8)
+
+    # write field counts and field lengths
+    _scatter_bytes(tuple_buffer, row_starts, np.full(row_count, column_count, dtype='>i2'))
+    for i in range(column_count):
+        _scatter_bytes(tuple_buffer, field_starts[:, i], field_lengths[:, i].astype('>i4'))
+
+    # write payloads of non-null fields
+    for i, (payload, value_lengths, null_mask) in enumerate(field_payloads):
+        if len(payload) == 0: continue
+        value_starts = field_starts[~null_mask, i] + 4
+        payload_offsets = np.cumsum(value_lengths) - value_lengths
+        tuple_buffer[np.repeat(value_starts - payload_offsets, value_lengths) + np.arange(len(payload))] = payload
+
+    return tuple_buffer.tobytes()
+
+
+#############################################################################
+
+def _scatter_bytes(
+    target: np.ndarray=None,
+    positions: np.ndarray=None,
+    values: np.ndarray=None
+    ):
+    """
+    writes fixed-width values byte by byte into a uint8 buffer at given positions
+
+    Parameters
+    ----------
+    target : np.ndarray
+        uint8 buffer, by default None
+    positions : np.ndarray
+        start position of each value, by default None
+    values : np.ndarray
+        fixed-width values in their target byte order, by default None
+    """
+
+    width = values.dtype.itemsize
+    target[positions[:, None] + np.arange(width)] = np.ascontiguousarray(values).view(np.uint8).reshape(-1, width)
+
+
+#############################################################################
+
+def _binary_slices_from_dataframe(
+    data: pd.DataFrame=None,
+    slice_size: int=COPY_SLICE_SIZE,
+    data_schema: dict=None
+    ):
+    """
+    serializes a DataFrame into PGCOPY binary slices, the first slice carries the file header 
+    and the trailer is sent as the last slice
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    slice_size : int, optional
+        number of rows per slice, by default COPY_SLICE_SIZE
+    data_schema : dict, optional
+        column_name (key) + data_type (value) mapping, by default None
+        -> columns missing from the mapping are typed from data
+
+    Yields
+    ------
+    bytes
+        PGCOPY binary slice
+    """
+
+    # type columns once, slices may hold only missing values of a column
+    derived_schema = _db_sql_data_schema(data, "postgres")
+    data_schema = {k: (data_schema or {}).get(k) or derived_schema[k] for k in data.columns}
+
+    yield PGCOPY_HEADER
+
+    for start in range(0, len(data), slice_size):
+        yield _pgcopy_binary_encode(data.iloc[start:start + slice_size], data_schema)
+
+    yield PGCOPY_TRAILER
+
+
+#############################################################################
+
+def _psql_copy_stream(
+    dbapi_connection: object=None,
+    table_address: str=None,
+    column_names: list=None,
+    copy_slices=None,
+    background: bool=True,
+    copy_format: str="csv",
+    null_string: str=None
+    ) -> bool:
+    """
+    streams CSV text or PGCOPY binary slices into a table through COPY FROM STDIN
+
+    Parameters
+    ----------
+    dbapi_connection : object
+        DBAPI connection, by default None
+    table_address : str
+        target table address, by default None
+    column_names : list
+        target column names, by default None
+    copy_slices : iterable
+        iterable of CSV text or PGCOPY binary slices, by default None
+    background : bool, optional
+        serialize slices in a background thread, by default True
+    copy_format : str, optional
+        COPY format of the slices, by default "csv"
+        -> ['csv', 'binary']
+    null_string : str, optional
+        NULL marker of CSV slices, by default None (unquoted empty string)
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    data_points = ', '.join('"{}"'.format(k) for k in column_names)
+    copy_options = f"FORMAT {copy_format}"
+    if copy_format == "csv" and null_string is not None:
+        copy_options += ", NULL '{}'".format(null_string.replace("'", "''"))
+    psql_statement = f'COPY {table_address} ({data_points}) FROM STDIN WITH ({copy_options})'
+
+    copy_stream = _CopyStream(copy_slices, background=background)
+
+    try:
+        copy_start = perf_counter()
+        with dbapi_connection.cursor() as cur:
+            cur.copy_expert(sql=psql_statement, file=copy_stream, size=COPY_READ_SIZE)
+        _instrumentation_add('execute', perf_counter() - copy_start)
+
+    finally:
+        copy_stream.close()
+
+    return True
+
+
+#############################################################################
+
+def _psql_copy_dataframe(
+    db_engine: object=None,
+    table_address: str=None,
+    column_names: list=None,
+    data: pd.DataFrame=None,
+    slice_size: int=COPY_SLICE_SIZE,
+    copy_format: str="csv",
+    defer_dependencies: bool=False,
+    table_definition: str=None,
+    unique_columns: list=None,
+    prepare_transaction: str=None,
+    column_types: dict=None
+    ) -> bool:
+    """
+    streams DataFrame into a table through COPY FROM STDIN on one pooled connection in a single transaction
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    table_address : str
+        target table address, by default None
+    column_names : list
+        target column names, by default None
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    slice_size : int, optional
+        number of records serialized per COPY slice, by default COPY_SLICE_SIZE
+    copy_format : str, optional
+        COPY format, by default "csv"
+        -> ['csv', 'binary']
+    defer_dependencies : bool, optional
+        drop indexes and constraints of the table before COPY and rebuild them in the same transaction, by default False
+    table_definition : str, optional
+        table definition script executed in the same transaction before COPY, by default None
+    unique_columns : list, optional
+        column names of a unique index created in the same transaction after COPY, by default None
+    prepare_transaction : str, optional
+        prepare the transaction under this id instead of committing it, by default None
+        -> published by COMMIT PREPARED or discarded by ROLLBACK PREPARED from any connection
+    column_types : dict, optional
+        target column name (key) + target data type (value) mapping binary values are encoded in, by default None
+        -> types derived from data otherwise, binary COPY does not cast
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    # serialize data slices in the requested COPY format
+    if copy_format == "binary":
+        data_schema = dict(zip(data.columns, [(column_types or {}).get(k) for k in column_names]))
+        copy_slices = _binary_slices_from_dataframe(data, slice_size, data_schema)
+    else:
+        copy_slices = _csv_slices_from_dataframe(data, slice_size)
+
+    # stream data slices through COPY, bypassing to_sql which copies the whole frame into object arrays
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+
+        if table_definition is not None:
+            with dbapi_connection.cursor() as cur:
+                cur.execute(table_definition)
+
+        if defer_dependencies == True:
+            with dbapi_connection.cursor() as cur:
+                table_dependencies = _psql_drop_dependencies(cur, table_address)
+
+        _psql_copy_stream(
+            dbapi_connection=dbapi_connection,
+            table_address=table_address,
+            column_names=column_names,
+            copy_slices=copy_slices,
+            copy_format=copy_format,
+            null_string=COPY_CSV_NULL
+            )
+
+        # rollback restores dropped indexes and constraints together with the data
+        if defer_dependencies == True:
+            with dbapi_connection.cursor() as cur:
+                _psql_restore_dependencies(cur, table_address, table_dependencies)
+
+        # index is built once over the loaded rows, a failure rolls back the load
+        if unique_columns is not None:
+            key_points = ', '.join('"{}"'.format(k) for k in unique_columns)
+            with dbapi_connection.cursor() as cur:
+                cur.execute(f"CREATE UNIQUE INDEX ON {table_address} ({key_points});")
+
+        # the prepared transaction outlives the session, the driver's closing COMMIT is a no-op
+        if prepare_transaction is not None:
+            with dbapi_connection.cursor() as cur:
+                cur.execute(f"PREPARE TRANSACTION '{prepare_transaction}';")
+
+        dbapi_connection.commit()
+
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+
+    finally:
+        dbapi_connection.close()
+
+    return True
+
+
+#############################################################################
+
+def _psql_parallel_copy(
+    db_connection_config: dict=None,
+    data: pd.DataFrame=None,
+    table_address: str=None,
+    column_names: list=None,
+    data_schema: dict=None,
+    swap: bool=False,
+    parallelism: int=2,
+    slice_size: int=COPY_SLICE_SIZE,
+    normalize_column_names: bool=True,
+    copy_format: str="csv",
+    defer_dependencies: bool=False,
+    unique_columns: list=None,
+    column_types: dict=None
+    ) -> bool:
+    """
+    loads DataFrame row partitions concurrently over pooled connections, the load is all-or-nothing
+        -> swap=True - partitions are loaded into a staging table, the target table is dropped and 
+           the staging table renamed to the target table in a single final transaction
+        -> swap=False - partitions are copied straight into the target table, each partition in its own 
+           prepared transaction committed once all partitions are prepared (two-phase commit), 
+           index maintenance runs on all loading backends
+           -> requires max_prepared_transactions >= number of partitions on the server, 
+              otherwise the data is loaded on a single connection
+        -> swap=False, defer_dependencies=True - partitions are loaded into a staging table, indexes and 
+           constraints of the target table dropped, staging rows appended and indexes rebuilt in one transaction
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    table_address : str
+        target table address, by default None
+    column_names : list
+        target column names, by default None
+    data_schema : dict
+        column_name (key) + data_type (value) mapping used to create a swapped staging table, by default None
+    swap : bool, optional
+        replace target table by the staging table, by default False
+    parallelism : int, optional
+        number of row partitions, loaded concurrently up to the pool size of the connection engine, by default 2
+    slice_size : int, optional
+        number of records serialized per COPY slice, by default COPY_SLICE_SIZE
+    normalize_column_names : bool, optional
+        column names normalized to lower case, special characters replaced with _
+    copy_format : str, optional
+        COPY format, by default "csv"
+        -> ['csv', 'binary']
+    defer_dependencies : bool, optional
+        drop indexes and constraints of the target table before appending staging rows 
+        and rebuild them in the publishing transaction, by default False
+    unique_columns : list, optional
+        column names of a unique index created on the swapped table in the publishing transaction, by default None
+    column_types : dict, optional
+        target column name (key) + target data type (value) mapping binary values are encoded in, by default None
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    # create connection engine
+    db_engine = _db_connection_engine(db_connection_config)
+
+    # split data into contiguous row partitions
+    partition_bounds = np.linspace(0, len(data), parallelism + 1).astype(int)
+    partitions = [
+        data.iloc[partition_bounds[i]:partition_bounds[i + 1]] 
+        for i in range(parallelism) if partition_bounds[i] < partition_bounds[i + 1]
+    ]
+
+    # partitions waiting for a pooled connection would run into pool_timeout
+    max_workers = max(min(len(partitions), _db_pool_capacity(db_connection_config)), 1)
+
+    if swap == False and defer_dependencies == False:
+
+        with db_engine.connect() as c:
+            max_prepared_transactions = int(c.execute(text("SHOW max_prepared_transactions;")).scalar())
+
+        # two-phase commit is disabled on the server, single COPY keeps the load all-or-nothing
+        if max_prepared_transactions < len(partitions):
+            print(f"max_prepared_transactions {max_prepared_transactions} below {len(partitions)} partitions -> loading on a single connection")
+            return _psql_copy_dataframe(db_engine, table_address, column_names, data, slice_size, copy_format, column_types=column_types)
+
+        transaction_prefix = f"dept_copy_{uuid.uuid4().hex[:12]}"
+        transaction_ids = [f"{transaction_prefix}_{i}" for i in range(len(partitions))]
+        prepared_ids = []
+
+        def copy_partition(transaction_id, partition):
+            _psql_copy_dataframe(
+                db_engine, table_address, column_names, partition, slice_size, copy_format, 
+                prepare_transaction=transaction_id, column_types=column_types
+                )
+            prepared_ids.append(transaction_id)
+
+        try:
+
+            # copy partitions concurrently into the target table
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(copy_partition, *item) for item in zip(transaction_ids, partitions)]
+                for future in futures: future.result()
+
+        except Exception:
+
+            # discard prepared partitions, unprepared partitions are rolled back with their connections
+            with db_engine.connect() as c:
+                c = c.execution_options(isolation_level="AUTOCOMMIT")
+                for transaction_id in prepared_ids:
+                    c.execute(text(f"ROLLBACK PREPARED '{transaction_id}';"))
+            raise
+
+        # publish all partitions
+        with db_engine.connect() as c:
+            c = c.execution_options(isolation_level="AUTOCOMMIT")
+            for transaction_id in transaction_ids:
+                c.execute(text(f"COMMIT PREPARED '{transaction_id}';"))
+
+        return True
+
+    # define staging table address next to the target table
+    table_name = table_address.split('.')[-1]
+    staging_address = f"{table_address[:-len(table_name)]}{table_name[:40]}__stage_{uuid.uuid4().hex[:8]}"
+
+    # create staging table
+    if swap == True:
+        table_created = db_create_table(
+            db_connection_config=db_connection_config,
+            data_schema=data_schema,
+            table_address=staging_address,
+            ownership=db_connection_config.get('ownership'),
+            normalize_column_names=normalize_column_names
+            )
+        if table_created == False: raise Exception(f"unable to create staging table {staging_address}")
+    else:
+        with db_engine.begin() as c:
+            c.execute(text(f"CREATE UNLOGGED TABLE {staging_address} (LIKE {table_address} INCLUDING DEFAULTS);"))
+
+    try:
+
+        # load partitions concurrently
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _psql_copy_dataframe, db_engine, staging_address, column_names, partition, slice_size, copy_format, 
+                    column_types=column_types
+                    ) 
+                for partition in partitions
+            ]
+            for future in futures: future.result()
+
+        # publish staging table
+        if swap == True:
+            sql_statement = f"""
+            DROP TABLE IF EXISTS {table_address};
+            ALTER TABLE {staging_address} RENAME TO {table_name};
+            """
+            if unique_columns is not None:
+                key_points = ', '.join('"{}"'.format(k) for k in unique_columns)
+                sql_statement += f"CREATE UNIQUE INDEX ON {table_address} ({key_points});"
+        else:
+            # indexes are rebuilt after the append, index builds use parallel maintenance workers
+            data_points = ', '.join('"{}"'.format(k) for k in column_names)
+            sql_statement = f"""
+            INSERT INTO {table_address} ({data_points}) SELECT {data_points} FROM {staging_address};
+            DROP TABLE {staging_address};
+            """
+
+        with db_engine.begin() as c:
+
+            if defer_dependencies == True and swap == False:
+                with c.connection.cursor() as cur:
+                    table_dependencies = _psql_drop_dependencies(cur, table_address)
+                    cur.execute(sql_statement)
+                    _psql_restore_dependencies(cur, table_address, table_dependencies, parallelism)
+            else:
+                c.execute(text(sql_statement))
+
+    except Exception:
+
+        # remove staging table, target table stays untouched
+        with db_engine.begin() as c:
+            c.execute(text(f"DROP TABLE IF EXISTS {staging_address};"))
+        raise
+
+    return True
+
+
+#############################################################################
+
+def _psql_table_dependencies(
+    cur: object=None,
+    table_address: str=None
+    ) -> dict:
+    """
+    reads index and constraint definitions of a table from the catalog, constraints referenced 
+    by foreign keys of other tables and their indexes are left out as they cannot be dropped without cascading
+
+    Parameters
+    ----------
+    cur : object
+        DBAPI cursor, by default None
+    table_address : str
+        table address, by default None
+
+    Returns
+    -------
+    dict
+        index and constraint definitions
+        -> {"indexes": [{"name": str, "definition": str}], "constraints": [{"name": str, "type": str, "definition": str}]}
+    """
+
+    # constraints enforced through an index or referencing other tables
+    cur.execute("""
+        SELECT quote_ident(con.conname), con.contype, pg_get_constraintdef(con.oid)
+        FROM pg_catalog.pg_constraint AS con
+        WHERE con.conrelid = to_regclass(%(table_address)s)
+            AND con.contype IN ('p', 'u', 'x', 'f')
+            AND NOT EXISTS (
+                SELECT 1 FROM pg_catalog.pg_constraint AS ref
+                WHERE ref.contype = 'f' 
+                    AND ref.confrelid = con.conrelid 
+                    AND ref.conindid = con.conindid 
+                    AND ref.conrelid <> con.conrelid
+                    AND con.contype <> 'f'
+            )
+        ORDER BY con.contype = 'f', con.conname
+        """, {"table_address": table_address})
+    constraints = [{"name": r[0], "type": r[1], "definition": r[2]} for r in cur.fetchall()]
+
+    # indexes not owned by constraints
+    cur.execute("""
+        SELECT x.indexrelid::regclass::text, pg_get_indexdef(x.indexrelid)
+        FROM pg_catalog.pg_index AS x
+        WHERE x.indrelid = to_regclass(%(table_address)s)
+            AND NOT EXISTS (
+                SELECT 1 FROM pg_catalog.pg_constraint AS con
+                WHERE con.conindid = x.indexrelid AND con.conrelid = x.indrelid
+            )
+        ORDER BY 1
+        """, {"table_address": table_address})
+    indexes = [{"name": r[0], "definition": r[1]} for r in cur.fetchall()]
+
+    return {"indexes": indexes, "constraints": constraints}
+
+
+#############################################################################
+
+def _psql_drop_dependencies(
+    cur: object=None,
+    table_address: str=None
+    ) -> dict:
+    """
+    captures and drops indexes and constraints of a table ahead of a bulk load, 
+    foreign keys are dropped first so that the indexes they rely on can be dropped
+
+    Parameters
+    ----------
+    cur : object
+        DBAPI cursor inside the load transaction, by default None
+    table_address : str
+        table address, by default None
+
+    Returns
+    -------
+    dict
+        captured definitions passed to _psql_restore_dependencies
+    """
+
+    table_dependencies = _psql_table_dependencies(cur, table_address)
+
+    for constraint in sorted(table_dependencies["constraints"], key=lambda k: k["type"] != 'f'):
+        cur.execute(f"ALTER TABLE {table_address} DROP CONSTRAINT {constraint['name']};")
+
+    for index in table_dependencies["indexes"]:
+        cur.execute(f"DROP INDEX {index['name']};")
+
+    return table_dependencies
+
+
+#############################################################################
+
+def _psql_restore_dependencies(
+    cur: object=None,
+    table_address: str=None,
+    table_dependencies: dict=None,
+    parallelism: int=None
+    ) -> bool:
+    """
+    rebuilds indexes and constraints dropped by _psql_drop_dependencies and refreshes table statistics,
+    index builds run in the load transaction and use parallel maintenance workers of the server
+
+    Parameters
+    ----------
+    cur : object
+        DBAPI cursor inside the load transaction, by default None
+    table_address : str
+        table address, by default None
+    table_dependencies : dict
+        definitions captured by _psql_drop_dependencies, by default None
+    parallelism : int, optional
+        number of parallel maintenance workers per index build, by default None (server setting)
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    if parallelism is not None:
+        cur.execute(f"SET LOCAL max_parallel_maintenance_workers = {int(parallelism)};")
+
+    for index in table_dependencies["indexes"]:
+        cur.execute(index["definition"])
+
+    # foreign keys are added once the referenced unique constraints exist again
+    for constraint in sorted(table_dependencies["constraints"], key=lambda k: k["type"] == 'f'):
+        cur.execute(f"ALTER TABLE {table_address} ADD CONSTRAINT {constraint['name']} {constraint['definition']};")
+
+    cur.execute(f"ANALYZE {table_address};")
+
+    return True
+
+
+#############################################################################
+
+def _psql_upsert(
+    db_engine: object=None,
+    table_address: str=None,
+    column_names: list=None,
+    key_columns: list=None,
+    data: pd.DataFrame=None,
+    slice_size: int=COPY_SLICE_SIZE,
+    copy_format: str="csv",
+    delete_keys: pd.DataFrame=None,
+    column_types: dict=None
+    ) -> bool:
+    """
+    merges DataFrame into a table, data is streamed through COPY into a temporary staging table 
+    and merged by a single INSERT ... ON CONFLICT DO UPDATE in the same transaction
+        - key_columns must be covered by a unique index or constraint of the target table
+        - rows with duplicate keys are reduced to the last occurrence
+        - rows matching delete_keys are deleted in the same transaction
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    table_address : str
+        target table address, by default None
+    column_names : list
+        target column names, by default None
+    key_columns : list
+        target column names identifying a row, by default None
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    slice_size : int, optional
+        number of records serialized per COPY slice, by default COPY_SLICE_SIZE
+    copy_format : str, optional
+        COPY format, by default "csv"
+        -> ['csv', 'binary']
+    delete_keys : pd.DataFrame, optional
+        key_columns values of rows to delete, by default None
+    column_types : dict, optional
+        target column name (key) + target data type (value) mapping binary values are encoded in, by default None
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    # ON CONFLICT cannot update the same row twice within one statement
+    data = data.set_axis(column_names, axis=1).drop_duplicates(subset=key_columns, keep='last')
+
+    # serialize data slices in the requested COPY format
+    if copy_format == "binary":
+        data_schema = dict(zip(data.columns, [(column_types or {}).get(k) for k in column_names]))
+        copy_slices = _binary_slices_from_dataframe(data, slice_size, data_schema)
+    else:
+        copy_slices = _csv_slices_from_dataframe(data, slice_size)
+
+    # define merge statement
+    staging_name = f"dept_upsert_stage_{uuid.uuid4().hex[:8]}"
+    data_points = ', '.join('"{}"'.format(k) for k in column_names)
+    key_points = ', '.join('"{}"'.format(k) for k in key_columns)
+    update_points = ', '.join('"{0}" = EXCLUDED."{0}"'.format(k) for k in column_names if k not in key_columns)
+    conflict_action = f"DO UPDATE SET {update_points}" if update_points != '' else "DO NOTHING"
+
+    psql_statement = f"""
+    INSERT INTO {table_address} ({data_points})
+    SELECT {data_points} FROM {staging_name}
+    ON CONFLICT ({key_points}) {conflict_action};
+    """
+
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+
+        # create session staging table, dropped with the transaction
+        with dbapi_connection.cursor() as cur:
+            cur.execute(f"CREATE TEMPORARY TABLE {staging_name} (LIKE {table_address} INCLUDING DEFAULTS) ON COMMIT DROP;")
+
+        # load delta into staging table
+        _psql_copy_stream(
+            dbapi_connection=dbapi_connection,
+            table_address=staging_name,
+            column_names=column_names,
+            copy_slices=copy_slices,
+            copy_format=copy_format,
+            null_string=COPY_CSV_NULL
+            )
+
+        # merge staging table into target table
+        with dbapi_connection.cursor() as cur:
+            cur.execute(psql_statement)
+
+        # delete rows by key through a key-only staging table
+        if delete_keys is not None and len(delete_keys) > 0:
+
+            delete_staging_name = f"dept_delete_stage_{uuid.uuid4().hex[:8]}"
+            key_predicate = ' AND '.join('t."{0}" = d."{0}"'.format(k) for k in key_columns)
+
+            with dbapi_connection.cursor() as cur:
+                cur.execute(f"CREATE TEMPORARY TABLE {delete_staging_name} ON COMMIT DROP AS SELECT {key_points} FROM {table_address} WITH NO DATA;")
+
+            _psql_copy_stream(
+                dbapi_connection=dbapi_connection,
+                table_address=delete_staging_name,
+                column_names=key_columns,
+                copy_slices=_csv_slices_from_dataframe(delete_keys[key_columns], slice_size),
+                null_string=COPY_CSV_NULL
+                )
+
+            with dbapi_connection.cursor() as cur:
+                cur.execute(f"DELETE FROM {table_address} AS t USING {delete_staging_name} AS d WHERE {key_predicate};")
+
+        dbapi_connection.commit()
+
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+
+    finally:
+        dbapi_connection.close()
+
+    return True
+
+
+#############################################################################
+
+def _row_hash_token(
+    value=None,
+    data_type: str=None
+    ) -> str:
+    """
+    translates a value into its canonical row hash token, matching the text produced by _psql_row_hash_expression
+        -> missing values are returned as '' and replaced with 'null' by md5_hash
+        -> numeric columns: value rounded to the column scale, written in plain notation without trailing zeros
+        -> real columns: value rounded to float4, written like postgres float4::text
+        -> integer columns and ints: integer digits
+        -> other numbers like postgres float8::text: shortest round-trip digits, 
+           exponent notation from 1e15 on and below 1e-4, Infinity/-Infinity
+        -> timestamps are written in UTC as YYYY-MM-DD HH:MM:SS.ffffff, date columns as YYYY-MM-DD
+
+    Parameters
+    ----------
+    value
+        value to translate, by default None
+    data_type : str, optional
+        target table data type (format_type), by default None
+
+    Returns
+    -------
+    str
+        canonical token
+    """
+
+    if value is None or value is pd.NaT or value is pd.NA: return ''
+
+    if isinstance(value, (bool, np.bool_)): return 'true' if value else 'false'
+
+    if isinstance(value, (float, np.floating)) and np.isnan(value): return ''
+
+    data_type = data_type or ''
+
+    # numbers are written in the text format of the column type
+    if isinstance(value, (int, np.integer, float, np.floating, Decimal)):
+
+        if data_type.startswith('numeric'): 
+            return _numeric_text(value, data_type)
+
+        if data_type in ['real', 'double precision']: 
+            return _float_text(value, float4=(data_type == 'real'))
+
+        # integer columns of DataFrames with missing values hold floats
+        if isinstance(value, (int, np.integer)) or (data_type in ['smallint', 'integer', 'bigint'] and float(value).is_integer()):
+            return str(int(value))
+
+        return _float_text(value)
+
+    if isinstance(value, (pd.Timestamp, datetime, np.datetime64)):
+        value = pd.Timestamp(value)
+        if value.tzinfo is not None: value = value.tz_convert('UTC')
+        return value.strftime('%Y-%m-%d') if data_type == 'date' else value.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+    if isinstance(value, date): return value.isoformat()
+
+    return str(value)
+
+
+#############################################################################
+
+def _float_text(
+    value=None,
+    float4: bool=False
+    ) -> str:
+    """
+    writes a float like postgres float8::text/float4::text: shortest round-trip digits,
+    exponent notation below 1e-4 and from 1e15 (float4: 1e6) on
+
+    Parameters
+    ----------
+    value
+        float value, by default None
+    float4 : bool, optional
+        round to float4 precision, by default False
+
+    Returns
+    -------
+    str
+        float text
+    """
+
+    value = np.float32(value) if float4 == True else np.float64(value)
+
+    if np.isinf(value): return 'Infinity' if value > 0 else '-Infinity'
+
+    mantissa, exponent = np.format_float_scientific(value, unique=True, trim='-').split('e')
+
+    if int(exponent) < -4 or int(exponent) >= (6 if float4 == True else 15):
+        return f"{mantissa}e{int(exponent):+03d}"
+
+    return np.format_float_positional(value, unique=True, trim='-')
+
+
+#############################################################################
+
+def _numeric_text(
+    value=None,
+    data_type: str=None
+    ) -> str:
+    """
+    writes a number like postgres numeric::text with trailing fractional zeros trimmed,
+    floats are rounded half away from zero to the scale of the column like numeric input does
+
+    Parameters
+    ----------
+    value
+        int, float or Decimal value, by default None
+    data_type : str
+        numeric data type, e.g. numeric(12,3), by default None
+
+    Returns
+    -------
+    str
+        numeric text
+    """
+
+    value = Decimal(repr(float(value))) if isinstance(value, (float, np.floating)) else Decimal(value if isinstance(value, Decimal) else int(value))
+
+    if value.is_nan(): return 'NaN'
+    if value.is_infinite(): return 'Infinity' if value > 0 else '-Infinity'
+
+    # round to the column scale
+    scale = re.search(r'numeric\(\d+,\s*(-?\d+)\)', data_type)
+    if scale is not None:
+        value = value.quantize(Decimal(1).scaleb(-int(scale.group(1))), rounding=ROUND_HALF_UP, context=Context(prec=1000))
+
+    numeric_text = format(value, 'f')
+    if '.' in numeric_text: numeric_text = numeric_text.rstrip('0').rstrip('.')
+
+    return '0' if numeric_text == '-0' else numeric_text
+
+
+#############################################################################
+
+def _dataframe_row_hashes(
+    data: pd.DataFrame=None,
+    column_names: list=None,
+    column_types: dict=None,
+    case_sensitivity: bool=True
+    ) -> pd.Series:
+    """
+    computes per-row md5 hashes of DataFrame columns with md5_hash canonicalization 
+    ('|' separated tokens, missing values as 'null')
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    column_names : list
+        hashed columns in hashing order, by default None
+    column_types : dict, optional
+        column_name (key) + target table data type (value) mapping, by default None
+    case_sensitivity : bool, optional
+        consider case sensitivity, by default True
+
+    Returns
+    -------
+    pd.Series
+        32-char md5 hash per row
+    """
+
+    column_types = column_types or {}
+    token_columns = []
+
+    for column_name in column_names:
+
+        data_type = column_types.get(column_name)
+        column = data[column_name]
+
+        # format temporal columns vectorized
+        if pd.api.types.is_datetime64_any_dtype(column):
+            if getattr(column.dt, 'tz', None) is not None: column = column.dt.tz_convert('UTC')
+            tokens = column.dt.strftime('%Y-%m-%d' if data_type == 'date' else '%Y-%m-%d %H:%M:%S.%f').fillna('')
+        else:
+            tokens = column.map(lambda v: _row_hash_token(v, data_type), na_action=None)
+
+        token_columns.append(tokens.tolist())
+
+    row_hashes = [md5_hash(list(tokens), case_sensitivity=case_sensitivity) for tokens in zip(*token_columns)]
+
+    if len(token_columns) == 0:
+        row_hashes = [md5_hash([], case_sensitivity=case_sensitivity)] * len(data)
+
+    return pd.Series(row_hashes, index=data.index, dtype=object)
+
+
+#############################################################################
+
+def _psql_row_hash_expression(
+    column_types: dict=None,
+    case_sensitivity: bool=True
+    ) -> str:
+    """
+    generates SQL expression computing per-row md5 hashes on the server, tokens match _row_hash_token
+
+    Parameters
+    ----------
+    column_types : dict
+        column_name (key) + data type (value) mapping of hashed columns in hashing order, by default None
+    case_sensitivity : bool, optional
+        consider case sensitivity, by default True
+
+    Returns
+    -------
+    str
+        SQL expression
+    """
+
+    token_expressions = []
+
+    for column_name, data_type in column_types.items():
+
+        column = f'"{column_name}"'
+
+        # numbers are hashed in their own type, casting numeric/real to float8 adds digits absent in the DataFrame
+        if data_type in ['double precision', 'real']:
+            token = f"{column}::text"
+        elif data_type.startswith('numeric'):
+            token = f"CASE WHEN {column}::text LIKE '%.%' THEN rtrim(rtrim({column}::text, '0'), '.') ELSE {column}::text END"
+        elif data_type == 'timestamp with time zone':
+            token = f"to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS.US')"
+        elif data_type == 'timestamp without time zone':
+            token = f"to_char({column}, 'YYYY-MM-DD HH24:MI:SS.US')"
+        elif data_type == 'date':
+            token = f"to_char({column}, 'YYYY-MM-DD')"
+        else:
+            token = f"{column}::text"
+
+        token_expressions.append(f"COALESCE(NULLIF({token}, ''), 'null')")
+
+    row_text = f"concat_ws('|', {', '.join(token_expressions)})" if len(token_expressions) > 0 else "''"
+    if case_sensitivity == False: row_text = f"lower({row_text})"
+
+    return f"md5({row_text})"
+
+
+#############################################################################
+
+@decorator_timer
+def db_table_diff(
+    db_connection_config: dict=None,
+    data: pd.DataFrame=None,
+    target_table: str=None,
+    key_columns: list=None,
+    normalize_column_names: bool=True,
+    case_sensitivity: bool=True
+    ) -> dict:
+    """
+    detects changes between DataFrame and a table by per-row content hashes, table hashes are computed 
+    in SQL so only key columns and hashes are transferred
+        -> hashes cover DataFrame columns other than key_columns
+        -> key columns of DataFrame and table must share dtypes after extraction
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    data : pd.DataFrame
+        pandas dataframe with the complete new table content, by default None
+    target_table : str
+        table address, by default None
+    key_columns : list
+        column names identifying a row, by default None
+    normalize_column_names : bool, optional
+        column names normalized to lower case, special characters replaced with _
+    case_sensitivity : bool, optional
+        consider case sensitivity of values, by default True
+        -> False compares row text lower-cased by python and by the server, lower() of the server follows 
+           the database locale and may differ from python for non-ASCII text, reporting such rows as updated
+
+    Returns
+    -------
+    dict
+        key_columns values of changed rows, None if comparison failed
+        -> {"inserted": pd.DataFrame, "updated": pd.DataFrame, "deleted": pd.DataFrame}
+    """
+
+    try:
+
+        if db_connection_config['type'].lower() != 'postgres':
+            raise Exception(f"table diff is not supported for {db_connection_config['type']} connections")
+
+        # match column names of the table
+        if normalize_column_names == True:
+            data = data.set_axis([normalize_key(k) for k in data.columns], axis=1)
+            key_columns = [normalize_key(k) for k in key_columns]
+
+        table_metadata = db_table_metadata(db_connection_config, target_table)
+        if table_metadata is None or table_metadata['exists'] == False:
+            raise Exception(f"table {target_table} does not exist")
+
+        value_types = {k: table_metadata['columns'][k] for k in data.columns if k not in key_columns}
+
+        # compute table hashes on the server
+        key_points = ', '.join('"{}"'.format(k) for k in key_columns)
+        sql_string = f"SELECT {key_points}, {_psql_row_hash_expression(value_types, case_sensitivity)} AS dept_row_hash FROM {target_table}"
+        df_table = db_query(db_connection_config, sql_string, extract_mode="copy")
+        if df_table is None: raise Exception(f"unable to read row hashes of {target_table}")
+
+        # compute DataFrame hashes, duplicate keys reduce to the last occurrence like upserts do
+        df_data = data[key_columns].copy()
+        df_data['dept_row_hash'] = _dataframe_row_hashes(data, list(value_types), value_types, case_sensitivity)
+        df_data = df_data.drop_duplicates(subset=key_columns, keep='last')
+
+        # align key dtypes, COPY extracts may infer narrower types than the DataFrame
+        for k in key_columns:
+            if df_table[k].dtype != df_data[k].dtype:
+                df_table[k] = df_table[k].astype(df_data[k].dtype)
+
+        df_diff = df_data.merge(df_table, on=key_columns, how='outer', suffixes=('', '_table'), indicator=True)
+
+        return {
+            "inserted": df_diff.loc[df_diff['_merge'] == 'left_only', key_columns].reset_index(drop=True),
+            "updated": df_diff.loc[(df_diff['_merge'] == 'both') & (df_diff['dept_row_hash'] != df_diff['dept_row_hash_table']), key_columns].reset_index(drop=True),
+            "deleted": df_diff.loc[df_diff['_merge'] == 'right_only', key_columns].reset_index(drop=True)
+        }
+
+    except Exception as e:
+        print(e)
+        return None
+
+
+#############################################################################
+
+@decorator_timer
+@_db_instrumented
+def db_upload(
+    db_connection_config: dict=None,
+    data: pd.DataFrame=None,
+    target_table: str=None,
+    if_exists: str="fail",
+    chunksize: int=None,
+    normalize_column_names: bool=True,
+    parallelism: int=None,
+    copy_format: str="csv",
+    key_columns: list=None,
+    bulk_load: bool=False,
+    infer_varchar: bool=False,
+    **kwargs
+    ) -> bool:
+    """
+    uploads data from Pandas DataFrame into a database table
+    
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    target_table : str
+        table address for upload, by default None
+    if_exists : str, optional
+        behaviour if target table exists, by default "fail"
+        -> 'fail' - procedure fails
+        -> 'replace' - existing table is dropped and new one created based on the input data
+        -> 'append' 
+        -> 'upsert' - [postgres] rows are inserted or updated by key_columns through a staging table,
+           existing tables need a unique index on key_columns, new tables get it in the load transaction
+        -> 'delta' - [postgres] data is the complete table content, only rows detected by db_table_diff
+           are uploaded and rows missing in data deleted, in a single transaction, unique index requirements of 'upsert' apply
+    chunksize : int, optional
+        number of records serialized per COPY slice, by default None (COPY_SLICE_SIZE)
+    normalize_column_names : bool, optional
+        column names normalized to lower case, special characters replaced with _
+    parallelism : int, optional
+        [postgres] number of row partitions loaded concurrently over pooled connections, by default None
+        -> the load is all-or-nothing
+        -> 'replace' and new tables load a staging table swapped in by one final transaction
+        -> 'append' copies partitions straight into the target table and publishes them by two-phase commit,
+           requires max_prepared_transactions >= parallelism on the server, otherwise loads on a single connection
+        -> partitions are loaded concurrently up to pool_size + max_overflow of the connection config
+    copy_format : str, optional
+        [postgres] COPY format, by default "csv"
+        -> 'csv' - text serialized by pandas, parsed by the server
+        -> 'binary' - PGCOPY binary encoded column-wise with NumPy in the column types of the target table,
+           values outside a column type fail the upload instead of being cast
+        -> both formats load missing values as NULL and empty strings as empty strings
+    key_columns : list, optional
+        column names identifying a row for if_exists='upsert'/'delta', by default None
+    bulk_load : bool, optional
+        [postgres] defer index and constraint maintenance when appending into an existing table, by default False
+        -> indexes and constraints are captured from the catalog, dropped, rebuilt after COPY and the table analyzed
+        -> all steps share one transaction, the original table state is restored on failure
+        -> combined with parallelism the data is staged in an UNLOGGED table and the target table is locked only while publishing
+    infer_varchar : bool, optional
+        string columns of created tables typed as VARCHAR sized by their longest value, by default False
+
+    Returns
+    -------
+    bool
+        True if upload executed successfully
+    """
+
+    try:
+
+        if if_exists in ['upsert', 'delta'] and not key_columns:
+            raise Exception(f"key_columns are required for if_exists='{if_exists}' -> cancelling data upload")
+        
+        # translate data schema
+        sql_data_schema = _db_sql_data_schema(data, db_connection_config['type'], infer_varchar)
+        
+        # create connection engine
+        db_engine = _db_connection_engine(db_connection_config)
+
+        # check if table already exists, upload decisions are not taken on cached metadata
+        table_exists = db_table_exists(db_connection_config, target_table, refresh=True)
+        if table_exists is None: raise Exception("unable to connect to database")
+
+        # parallel uploads create the target table from a staging table
+        parallel_upload = parallelism is not None and parallelism > 1
+
+        if table_exists == True:
+
+            if if_exists == 'fail':
+                raise Exception(f"table {target_table} already exists -> cancelling data upload")
+            
+            elif if_exists == 'replace' and parallel_upload == False:
+
+                # drop table
+                sql_statement = f"DROP TABLE {target_table};"
+                if db_execute(db_connection_config, sql_statement) == False:
+                    raise Exception(f"unable to drop table {target_table} -> cancelling data upload")
+
+                # create table
+                table_created = db_create_table(
+                    db_connection_config=db_connection_config,
+                    data_schema=sql_data_schema,
+                    table_address=target_table,
+                    ownership=db_connection_config.get('ownership'),
+                    normalize_column_names=normalize_column_names
+                    )
+                if table_created == False: raise Exception(f"unable to create table {target_table} -> cancelling data upload")
+
+        # keyed tables are created in the load transaction together with their unique index
+        keyed_table = if_exists in ['upsert', 'delta'] and table_exists == False
+
+        if table_exists == False and parallel_upload == False and keyed_table == False:
+
+            # create table
+            table_created = db_create_table(
+                db_connection_config=db_connection_config,
+                data_schema=sql_data_schema,
+                table_address=target_table,
+                ownership=db_connection_config.get('ownership'),
+                normalize_column_names=normalize_column_names
+                )
+            if table_created == False: raise Exception(f"unable to create table {target_table} -> cancelling data upload")
+
+        # index maintenance is deferred for appends only, replaced and created tables carry no indexes yet
+        defer_dependencies = bulk_load == True and table_exists == True and if_exists == 'append'
+
+        # upsert keys of the created table
+        if normalize_column_names == True and key_columns is not None:
+            key_columns = [normalize_key(column_name) for column_name in key_columns]
+
+        # ON CONFLICT requires a unique index or constraint on exactly the key columns
+        if if_exists in ['upsert', 'delta'] and table_exists == True:
+
+            # refreshed together with table_exists above
+            table_metadata = db_table_metadata(db_connection_config, target_table)
+            if table_metadata is None: raise Exception("unable to connect to database")
+
+            if set(key_columns) not in [set(k) for k in table_metadata['unique_keys']]:
+                raise Exception(f"key_columns {key_columns} are not covered by a unique index of {target_table} -> cancelling data upload")
+
+        # specify upload method for a given database type
+        if db_connection_config['type'].lower() == "postgres":
+
+            # match column names of the created table
+            if normalize_column_names == True:
+                column_names = [normalize_key(column_name) for column_name in data.columns]
+            else:
+                column_names = list(data.columns)
+
+            # duplicate keys would fail the unique index, the last occurrence is kept like _psql_upsert does
+            if keyed_table == True:
+                data = data.set_axis(column_names, axis=1).drop_duplicates(subset=key_columns, keep='last')
+
+            # binary COPY does not cast, values are encoded in the column types of the target table
+            column_types = None
+            if copy_format == 'binary':
+                if table_exists == True and if_exists != 'replace':
+                    table_metadata = db_table_metadata(db_connection_config, target_table)
+                    if table_metadata is None: raise Exception("unable to connect to database")
+                    column_types = table_metadata['columns']
+                else:
+                    column_types = dict(zip(column_names, sql_data_schema.values()))
+
+            # delta uploads without changes leave the table untouched
+            upload_status = True
+
+            if if_exists == 'delta' and table_exists == True:
+
+                # detect changed rows by content hashes
+                table_diff = db_table_diff(db_connection_config, data, target_table, key_columns, normalize_column_names)
+                if table_diff is None: raise Exception(f"unable to compare data with {target_table} -> cancelling data upload")
+
+                # upload inserted and updated rows, delete missing rows
+                df_changes = pd.concat([table_diff['inserted'], table_diff['updated']], ignore_index=True)
+                df_delta = data.set_axis(column_names, axis=1).merge(df_changes, on=key_columns, how='inner')
+
+                if len(df_delta) > 0 or len(table_diff['deleted']) > 0:
+                    upload_status = _psql_upsert(
+                        db_engine=db_engine,
+                        table_address=target_table,
+                        column_names=column_names,
+                        key_columns=key_columns,
+                        data=df_delta,
+                        slice_size=chunksize or COPY_SLICE_SIZE,
+                        copy_format=copy_format,
+                        delete_keys=table_diff['deleted'],
+                        column_types=column_types
+                        )
+
+            elif if_exists == 'upsert' and table_exists == True:
+
+                # merge data into existing table
+                upload_status = _psql_upsert(
+                    db_engine=db_engine,
+                    table_address=target_table,
+                    column_names=column_names,
+                    key_columns=key_columns,
+                    data=data,
+                    slice_size=chunksize or COPY_SLICE_SIZE,
+                    copy_format=copy_format,
+                    column_types=column_types
+                    )
+
+            elif parallel_upload == True:
+
+                # load partitions concurrently into a staging table
+                upload_status = _psql_parallel_copy(
+                    db_connection_config=db_connection_config,
+                    data=data,
+                    table_address=target_table,
+                    column_names=column_names,
+                    data_schema=sql_data_schema,
+                    swap=(table_exists == False or if_exists == 'replace'),
+                    parallelism=parallelism,
+                    slice_size=chunksize or COPY_SLICE_SIZE,
+                    normalize_column_names=normalize_column_names,
+                    copy_format=copy_format,
+                    defer_dependencies=defer_dependencies,
+                    unique_columns=key_columns if keyed_table == True else None,
+                    column_types=column_types
+                    )
+
+            else:
+
+                # load data on a single connection
+                upload_status = _psql_copy_dataframe(
+                    db_engine=db_engine,
+                    table_address=target_table,
+                    column_names=column_names,
+                    data=data,
+                    slice_size=chunksize or COPY_SLICE_SIZE,
+                    copy_format=copy_format,
+                    defer_dependencies=defer_dependencies,
+                    table_definition=_db_table_definition(
+                        sql_data_schema, target_table, db_connection_config.get('ownership'), normalize_column_names
+                        ) if keyed_table == True else None,
+                    unique_columns=key_columns if keyed_table == True else None,
+                    column_types=column_types
+                    )
+
+            if upload_status != True: raise Exception(f"unable to load data into {target_table} -> cancelling data upload")
+
+            # staging swaps replace the target table outside db_execute
+            db_metadata_invalidate(db_connection_config, target_table)
+
+
+        return True
+    
+    except Exception as e:
+        print(e)
+        return False
+
+
+#############################################################################
+# QUERY CACHE
+#############################################################################
+
+def _query_cache_key(
+    db_connection_config: dict=None,
+    sql_string: str=None,
+    params: dict=None,
+    extract_mode: str="read_sql",
+    downcast: bool=False
+    ) -> str:
+    """
+    generates query cache key from normalized SQL text, connection identity, query parameters 
+    and options shaping the result set dtypes
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    sql_string : str
+        SQL query string, by default None
+    params : dict, optional
+        query parameters, by default None
+    extract_mode : str, optional
+        result set extraction method, by default "read_sql"
+    downcast : bool, optional
+        result set downcast, by default False
+
+    Returns
+    -------
+    str
+        32-char md5 hash
+    """
+
+    normalized_sql = re.sub(r'\s+', ' ', sql_string).strip().rstrip(';').strip()
+
+    tokens = [
+        normalized_sql,
+        str(db_connection_config.get('type')).lower(),
+        str(db_connection_config.get('host')).lower(),
+        db_connection_config.get('port'),
+        db_connection_config.get('database_name'),
+        db_connection_config.get('user_name'),
+        json.dumps(params or {}, sort_keys=True, default=str),
+        extract_mode,
+        downcast
+    ]
+
+    return md5_hash(tokens, case_sensitivity=True)
+
+
+#############################################################################
+
+def _query_cache_tables(
+    sql_string: str=None
+    ) -> list:
+    """
+    extracts table addresses referenced by FROM/JOIN clauses, used for invalidation by table name
+
+    Parameters
+    ----------
+    sql_string : str
+        SQL query string, by default None
+
+    Returns
+    -------
+    list
+        list of lower case table addresses
+    """
+
+    tables = re.findall(r'\b(?:FROM|JOIN)\s+([\w\."]+)', sql_string, flags=re.I)
+
+    return sorted(set(t.replace('"', '').lower() for t in tables))
+
+
+#############################################################################
+
+def _query_cache_index() -> dict:
+    """
+    reads query cache index
+
+    Returns
+    -------
+    dict
+        cache key (key) + entry metadata (value) mapping
+    """
+
+    index_path = f"{QUERY_CACHE_PATH}/cache_index.json"
+
+    if not os.path.exists(index_path): return {}
+
+    try:
+        return read_file(index_path)
+    except Exception:
+        return {}
+
+
+#############################################################################
+
+def _query_cache_save_index(
+    cache_index: dict=None
+    ) -> bool:
+    """
+    writes query cache index atomically
+
+    Parameters
+    ----------
+    cache_index : dict
+        cache key (key) + entry metadata (value) mapping, by default None
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    index_path = f"{QUERY_CACHE_PATH}/cache_index.json"
+    temp_path = f"{QUERY_CACHE_PATH}/cache_index.{uuid.uuid4().hex[:8]}.json"
+
+    write_file(cache_index, temp_path)
+    os.replace(temp_path, index_path)
+
+    return True
+
+
+#############################################################################
+
+def _query_cache_remove(
+    cache_index: dict=None,
+    cache_key: str=None
+    ):
+    """
+    removes cache entry and its result file
+
+    Parameters
+    ----------
+    cache_index : dict
+        cache key (key) + entry metadata (value) mapping, by default None
+    cache_key : str
+        cache key, by default None
+    """
+
+    cache_index.pop(cache_key, None)
+
+    try:
+        os.remove(f"{QUERY_CACHE_PATH}/{cache_key}.parquet")
+    except FileNotFoundError:
+        pass
+
+
+#############################################################################
+
+def _query_cache_last_access(
+    cache_key: str=None
+    ) -> float:
+    """
+    reads last access time of a cache entry from the modification time of its result file
+
+    Parameters
+    ----------
+    cache_key : str
+        cache key, by default None
+
+    Returns
+    -------
+    float
+        last access timestamp, 0 if the result file is missing
+    """
+
+    try:
+        return os.path.getmtime(f"{QUERY_CACHE_PATH}/{cache_key}.parquet")
+    except FileNotFoundError:
+        return 0
+
+
+#############################################################################
+
+def _query_cache_read(
+    cache_key: str=None,
+    cache_ttl: int=None
+    ) -> pd.DataFrame:
+    """
+    reads cached result set if present and not older than cache_ttl, 
+    recency is tracked by the modification time of the result file so hits leave the index untouched
+
+    Parameters
+    ----------
+    cache_key : str
+        cache key, by default None
+    cache_ttl : int
+        maximum age in seconds accepted by the caller, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        cached result set, None on cache miss
+    """
+
+    with _QUERY_CACHE_LOCK:
+
+        cache_index = _query_cache_index()
+        cache_entry = cache_index.get(cache_key)
+        now = datetime.now().timestamp()
+
+        try:
+
+            if cache_entry is None: 
+                raise FileNotFoundError
+            
+            # drop expired entry
+            if cache_entry['expires'] < now:
+                _query_cache_remove(cache_index, cache_key)
+                _query_cache_save_index(cache_index)
+                raise FileNotFoundError
+
+            # entry stored with a longer ttl than the caller accepts
+            if now - cache_entry['created'] > cache_ttl:
+                raise FileNotFoundError
+
+            file_path = f"{QUERY_CACHE_PATH}/{cache_key}.parquet"
+            df = pd.read_parquet(file_path)
+
+        except Exception:
+            QUERY_CACHE_STATS['misses'] += 1
+            return None
+
+        # track recency for LRU eviction
+        os.utime(file_path)
+        QUERY_CACHE_STATS['hits'] += 1
+
+        return df
+
+
+#############################################################################
+
+def _query_cache_write(
+    cache_key: str=None,
+    df: pd.DataFrame=None,
+    sql_string: str=None,
+    cache_ttl: int=None
+    ) -> bool:
+    """
+    stores result set in the query cache and evicts least recently used entries above QUERY_CACHE_MAX_BYTES
+
+    Parameters
+    ----------
+    cache_key : str
+        cache key, by default None
+    df : pd.DataFrame
+        result set, by default None
+    sql_string : str
+        SQL query string, by default None
+    cache_ttl : int
+        seconds the entry stays valid, by default None
+
+    Returns
+    -------
+    bool
+        True if result set was cached
+    """
+
+    with _QUERY_CACHE_LOCK:
+
+        os.makedirs(QUERY_CACHE_PATH, exist_ok=True)
+
+        # write columnar result file, mixed-type object columns are not cached
+        file_path = f"{QUERY_CACHE_PATH}/{cache_key}.parquet"
+        temp_path = f"{QUERY_CACHE_PATH}/{cache_key}.{uuid.uuid4().hex[:8]}.parquet"
+
+        try:
+            df.to_parquet(temp_path, index=False)
+            os.replace(temp_path, file_path)
+        except Exception as e:
+            if os.path.exists(temp_path): os.remove(temp_path)
+            print(f"WARNING: unable to cache query result set")
+            print(e)
+            return False
+
+        # register entry
+        now = datetime.now().timestamp()
+        cache_index = _query_cache_index()
+        cache_index[cache_key] = {
+            "created": now,
+            "expires": now + cache_ttl,
+            "size": os.path.getsize(file_path),
+            "tables": _query_cache_tables(sql_string)
+        }
+
+        # evict least recently used entries
+        cache_size = sum(entry['size'] for entry in cache_index.values())
+        for key in sorted(cache_index, key=lambda k: _query_cache_last_access(k)):
+            if cache_size <= QUERY_CACHE_MAX_BYTES: break
+            cache_size -= cache_index[key]['size']
+            _query_cache_remove(cache_index, key)
+            QUERY_CACHE_STATS['evictions'] += 1
+
+        _query_cache_save_index(cache_index)
+
+    return True
+
+
+#############################################################################
+
+def db_query_cache_invalidate(
+    table_name: str=None
+    ) -> int:
+    """
+    removes cached result sets of queries referencing a table
+
+    Parameters
+    ----------
+    table_name : str, optional
+        table address/name, by default None (whole cache is cleared)
+
+    Returns
+    -------
+    int
+        number of removed cache entries
+    """
+
+    with _QUERY_CACHE_LOCK:
+
+        cache_index = _query_cache_index()
+
+        # match qualified and unqualified table references
+        if table_name is not None:
+            table_name = table_name.replace('"', '').lower()
+            cache_keys = [
+                k for k, entry in cache_index.items() 
+                if any(t == table_name or t.split('.')[-1] == table_name.split('.')[-1] for t in entry['tables'])
+            ]
+        else:
+            cache_keys = list(cache_index.keys())
+
+        for cache_key in cache_keys:
+            _query_cache_remove(cache_index, cache_key)
+
+        if len(cache_keys) > 0: _query_cache_save_index(cache_index)
+
+    return len(cache_keys)
+
+
+#############################################################################
+
+def db_query_cache_stats() -> dict:
+    """
+    returns query cache hit/miss/eviction counts of the current process and cache size
+
+    Returns
+    -------
+    dict
+        query cache statistics
+    """
+
+    with _QUERY_CACHE_LOCK:
+        cache_index = _query_cache_index()
+
+    cache_stats = dict(QUERY_CACHE_STATS)
+    cache_stats['entries'] = len(cache_index)
+    cache_stats['size'] = sum(entry['size'] for entry in cache_index.values())
+
+    lookups = cache_stats['hits'] + cache_stats['misses']
+    cache_stats['hit_ratio'] = cache_stats['hits'] / lookups if lookups > 0 else None
+
+    return cache_stats
+
+
+#############################################################################
+# INCREMENTAL EXTRACTS
+#############################################################################
+
+def _watermark_state() -> dict:
+    """
+    reads watermark state store
+
+    Returns
+    -------
+    dict
+        state key (key) + watermark entry (value) mapping
+    """
+
+    if not os.path.exists(WATERMARK_STATE_PATH): return {}
+
+    return read_file(WATERMARK_STATE_PATH)
+
+
+#############################################################################
+
+def _watermark_encode(
+    watermark=None
+    ) -> dict:
+    """
+    translates watermark value into a JSON serializable entry
+
+    Parameters
+    ----------
+    watermark
+        high-water mark value, by default None
+
+    Returns
+    -------
+    dict
+        {"value": value, "type": 'datetime'|'date'|'number'|'string'}
+    """
+
+    if isinstance(watermark, (pd.Timestamp, datetime, np.datetime64)):
+        return {"value": pd.Timestamp(watermark).isoformat(), "type": 'datetime'}
+
+    if isinstance(watermark, date):
+        return {"value": watermark.isoformat(), "type": 'date'}
+
+    if isinstance(watermark, (int, float, np.integer, np.floating)):
+        return {"value": watermark.item() if isinstance(watermark, np.generic) else watermark, "type": 'number'}
+
+    return {"value": str(watermark), "type": 'string'}
+
+
+#############################################################################
+
+def _watermark_decode(
+    watermark_entry: dict=None
+    ):
+    """
+    translates watermark entry into a bind parameter value
+
+    Parameters
+    ----------
+    watermark_entry : dict
+        entry created by _watermark_encode, by default None
+
+    Returns
+    -------
+    object
+        high-water mark value
+    """
+
+    if watermark_entry['type'] == 'datetime':
+        return pd.Timestamp(watermark_entry['value']).to_pydatetime()
+
+    if watermark_entry['type'] == 'date':
+        return date.fromisoformat(watermark_entry['value'])
+
+    return watermark_entry['value']
+
+
+#############################################################################
+
+def _watermark_commit(
+    state_key: str=None,
+    watermark=None
+    ) -> bool:
+    """
+    writes new watermark of a state key, the state store is replaced atomically 
+
+    Parameters
+    ----------
+    state_key : str
+        watermark state key, by default None
+    watermark
+        high-water mark value, by default None
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    with _WATERMARK_LOCK:
+
+        watermark_state = _watermark_state()
+        watermark_state[state_key] = {
+            **_watermark_encode(watermark),
+            "updated": datetime.now().isoformat(timespec='seconds')
+        }
+
+        os.makedirs(os.path.dirname(WATERMARK_STATE_PATH), exist_ok=True)
+        temp_path = f"{WATERMARK_STATE_PATH[:-5]}.{uuid.uuid4().hex[:8]}.json"
+
+        write_file(watermark_state, temp_path)
+        os.replace(temp_path, WATERMARK_STATE_PATH)
+
+    return True
+
+
+#############################################################################
+
+def _watermark_chunks(
+    df_chunks=None,
+    state_key: str=None,
+    watermark=None
+    ):
+    """
+    passes delta chunks through, the watermark is committed once the last chunk has been consumed
+
+    Parameters
+    ----------
+    df_chunks : iterable
+        delta chunks, by default None
+    state_key : str
+        watermark state key, by default None
+    watermark
+        high-water mark of the delta, by default None
+
+    Yields
+    ------
+    pd.DataFrame
+        pandas dataframe chunk
+    """
+
+    yield from df_chunks
+
+    _watermark_commit(state_key, watermark)
+
+
+#############################################################################
+
+@decorator_timer
+def db_query_incremental(
+    db_connection_config: dict=None,
+    query: str=None,
+    watermark_column: str=None,
+    state_key: str=None,
+    initial_watermark=None,
+    chunksize: int=None,
+    extract_mode: str="read_sql",
+    params: dict=None
+    ):
+    """
+    extracts rows added since the previous run, rows are filtered by a monotonic column 
+    (e.g. updated_at, id) against a high-water mark kept in the local state store (WATERMARK_STATE_PATH)
+        -> the upper bound is fixed before the extract, rows arriving meanwhile are left for the next run
+        -> the new watermark is written only after the extract succeeded
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    query : str
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+    watermark_column : str
+        monotonic column of the query result, by default None
+    state_key : str, optional
+        watermark state key, by default None (derived from connection, query and watermark column)
+    initial_watermark : optional
+        lower bound of the first extract, by default None (full extract)
+    chunksize : int, optional
+        number of records per yielded chunk, by default None
+        -> generator of chunks is returned, the watermark is committed once the generator is exhausted
+    extract_mode : str, optional
+        extract mode of db_query when chunksize is None, by default "read_sql"
+    params : dict, optional
+        values of :name bind parameters in the query, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        pandas dataframe with the delta rows, None if extract failed
+    """
+
+    try:
+
+        # read query
+        sql_string = _db_read_query(query).strip().rstrip(';')
+
+        if state_key is None:
+            state_key = md5_hash([_db_engine_key(db_connection_config), sql_string, watermark_column], case_sensitivity=True)
+
+        # read last high-water mark
+        watermark_entry = _watermark_state().get(state_key)
+        lower_bound = _watermark_decode(watermark_entry) if watermark_entry is not None else initial_watermark
+
+        delta_params = {**(params or {}), "dept_watermark_lower": lower_bound}
+        lower_predicate = f'q."{watermark_column}" > :dept_watermark_lower' if lower_bound is not None else 'TRUE'
+
+        # fix upper bound of the delta
+        db_engine = _db_connection_engine(db_connection_config)
+
+        with db_engine.connect() as c:
+            upper_bound = c.execute(
+                _db_text(f'SELECT max(q."{watermark_column}") FROM {_db_subquery(sql_string)} WHERE {lower_predicate}'), 
+                delta_params
+            ).scalar()
+
+        # no new rows, read empty delta to keep the result columns
+        if upper_bound is None:
+            upper_predicate = 'FALSE'
+        else:
+            upper_predicate = f'q."{watermark_column}" <= :dept_watermark_upper'
+            delta_params["dept_watermark_upper"] = upper_bound
+
+        delta_sql = f"SELECT * FROM {_db_subquery(sql_string)} WHERE {lower_predicate} AND {upper_predicate}"
+
+        # stream delta chunks
+        if chunksize is not None:
+
+            df_chunks = db_query_iter(db_connection_config, delta_sql, chunksize=chunksize, params=delta_params)
+
+            if upper_bound is None: return df_chunks
+
+            return _watermark_chunks(df_chunks, state_key, upper_bound)
+
+        # collect delta
+        df = db_query(db_connection_config, delta_sql, extract_mode=extract_mode, params=delta_params)
+        if df is None: raise Exception(f"delta extract failed -> watermark {state_key} left unchanged")
+
+        if upper_bound is not None:
+            _watermark_commit(state_key, upper_bound)
+
+        return df
+
+    except Exception as e:
+        print(e)
+        return None
+
+
+#############################################################################
+
+def db_watermark(
+    state_key: str=None
+    ):
+    """
+    reads high-water mark of an incremental extract
+
+    Parameters
+    ----------
+    state_key : str
+        watermark state key, by default None
+
+    Returns
+    -------
+    object
+        high-water mark, None if no extract has been committed
+    """
+
+    watermark_entry = _watermark_state().get(state_key)
+
+    return _watermark_decode(watermark_entry) if watermark_entry is not None else None
+
+
+#############################################################################
+
+def db_watermark_reset(
+    state_key: str=None
+    ) -> bool:
+    """
+    removes high-water marks, the next incremental extract starts from its initial watermark
+
+    Parameters
+    ----------
+    state_key : str, optional
+        watermark state key, by default None (all watermarks)
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    with _WATERMARK_LOCK:
+
+        if state_key is None:
+            watermark_state = {}
+        else:
+            watermark_state = _watermark_state()
+            watermark_state.pop(state_key, None)
+
+        if not os.path.exists(WATERMARK_STATE_PATH) and len(watermark_state) == 0: return True
+
+        temp_path = f"{WATERMARK_STATE_PATH[:-5]}.{uuid.uuid4().hex[:8]}.json"
+
+        write_file(watermark_state, temp_path)
+        os.replace(temp_path, WATERMARK_STATE_PATH)
+
+    return True
+
+
+#############################################################################
+# METADATA
+#############################################################################
+
+def db_table_metadata(
+    db_connection_config: dict=None,
+    table_address: str=None,
+    refresh: bool=False
+    ) -> dict:
+    """
+    reads table existence, column names, column types and unique keys from the catalog in a single query,
+    results of existing tables are cached per connection engine for DB_METADATA_CACHE_TTL seconds 
+    or until invalidated by DDL or db_metadata_invalidate
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    table_address : str
+        table address, unqualified names are resolved through the search_path, by default None
+    refresh : bool, optional
+        bypass cached metadata, by default False
+
+    Returns
+    -------
+    dict
+        table metadata, None if the catalog could not be read
+        -> {"exists": bool, "columns": {column_name: data_type}, "unique_keys": [[column_name, ...], ...]}
+        -> unique_keys lists the columns of immediate, non-partial unique indexes usable by ON CONFLICT
+    """
+
+    try:
+
+        # return cached metadata if available and not expired
+        cache_key = (_db_engine_key(db_connection_config), table_address.lower())
+        cache_entry = _DB_METADATA_CACHE.get(cache_key)
+        if cache_entry is not None and refresh == False and perf_counter() - cache_entry[0] < DB_METADATA_CACHE_TTL: 
+            return cache_entry[1]
+
+        if db_connection_config['type'].lower() != 'postgres':
+            raise Exception(f"table metadata is not supported for {db_connection_config['type']} connections")
+
+        # create connection engine
+        db_engine = _db_connection_engine(db_connection_config)
+
+        # resolve table and read its columns without touching table data
+        sql_string = """
+        SELECT 
+            t.oid IS NOT NULL AS table_exists, 
+            a.attname AS column_name, 
+            format_type(a.atttypid, a.atttypmod) AS data_type,
+            (
+                SELECT json_agg(ARRAY(
+                    SELECT ia.attname FROM pg_catalog.pg_attribute AS ia 
+                    WHERE ia.attrelid = i.indrelid AND ia.attnum = ANY(i.indkey)
+                ))
+                FROM pg_catalog.pg_index AS i
+                WHERE i.indrelid = t.oid 
+                    AND i.indisunique 
+                    AND i.indimmediate 
+                    AND i.indisvalid
+                    AND i.indpred IS NULL 
+                    AND i.indexprs IS NULL
+            ) AS unique_keys
+        FROM (SELECT to_regclass(:table_address)::oid AS oid) AS t
+        LEFT JOIN pg_catalog.pg_attribute AS a 
+            ON a.attrelid = t.oid 
+            AND a.attnum > 0 
+            AND NOT a.attisdropped
+        ORDER BY a.attnum
+        """
+
+        with db_engine.connect() as c:
+            catalog_rows = c.execute(text(sql_string), {"table_address": table_address}).all()
+
+        table_metadata = {
+            "exists": bool(catalog_rows[0].table_exists),
+            "columns": {r.column_name: r.data_type for r in catalog_rows if r.column_name is not None},
+            "unique_keys": catalog_rows[0].unique_keys or []
+        }
+
+        # missing tables may be created by any other session
+        if table_metadata['exists'] == True:
+            _DB_METADATA_CACHE[cache_key] = (perf_counter(), table_metadata)
+        else:
+            _DB_METADATA_CACHE.pop(cache_key, None)
+
+        return table_metadata
+
+    except Exception as e:
+        print(f"ERROR: unable to read metadata of {table_address}")
+        print(e)
+        return None
+
 
-#############################################################################
-# DB METHODS
 #############################################################################
 
-def _db_connection_engine(
-    db_connection_config: dict=None
-    ) -> object:
+def db_table_exists(
+    db_connection_config: dict=None,
+    table_address: str=None,
+    refresh: bool=False
+    ) -> bool:
     """
-    creates SQLAlchemy database connection engine
+    checks if a table exists using cached catalog metadata
 
     Parameters
     ----------
     db_connection_config : dict
         database connection configuration dictionary, by default None
+    table_address : str
+        table address, by default None
+    refresh : bool, optional
+        bypass cached metadata, by default False
 
     Returns
     -------
-    object
-        SQLAlchemy database connection engine
-    """    
+    bool
+        True if table exists, None if the catalog could not be read
+    """
+
+    table_metadata = db_table_metadata(db_connection_config, table_address, refresh)
+
+    return table_metadata['exists'] if table_metadata is not None else None
 
-    try:
-        
-        # define connection string
-        if db_connection_config['type'].lower() == 'postgres':
-            
-            connection_string = f"\
-                {db_connection_config.get("user_name")}\
-                :{db_connection_config.get("password")}\
-                @{db_connection_config.get("host")}\
-                :{db_connection_config.get("port")}\
-                /{db_connection_config.get("database_name")}\
-                "
-            
-            # create connection engine
-            db_engine = create_engine(f"postgresql+psycopg2://{connection_string}")\
-                .execution_options(autocommit=True)
-            
-            return db_engine
-        
-        else: 
-            print(f"ERROR: connection type not recognized")
-            return None
-        
-    except Exception as e:
-        print(f"ERROR: unable to connect to database")
-        print(e)
 
-        return None
-    
 #############################################################################
-    
-@decorator_timer
-def db_query(
+
+def db_metadata_invalidate(
     db_connection_config: dict=None,
-    query: str=None,
-    chunksize: int=None
-    ) -> pd.DataFrame:
+    table_address: str=None
+    ) -> int:
     """
-    _summary_
+    removes cached table metadata
+
+    Parameters
+    ----------
+    db_connection_config : dict, optional
+        invalidate only metadata of the given connection, by default None (all connections)
+    table_address : str, optional
+        invalidate only metadata of the given table, by default None (all tables)
+
+    Returns
+    -------
+    int
+        number of removed cache entries
+    """
+
+    engine_key = _db_engine_key(db_connection_config) if db_connection_config is not None else None
+
+    cache_keys = [
+        k for k in list(_DB_METADATA_CACHE.keys())
+        if (engine_key is None or k[0] == engine_key) and (table_address is None or k[1] == table_address.lower())
+    ]
+
+    for cache_key in cache_keys:
+        _DB_METADATA_CACHE.pop(cache_key, None)
+
+    return len(cache_keys)
+
+
+#############################################################################
+# ASYNCIO
+#############################################################################
+
+def _db_async_connection_engine(
+    db_connection_config: dict=None
+    ) -> tuple:
+    """
+    returns SQLAlchemy asyncio connection engine and concurrency semaphore of the running event loop,
+    engines are created once per connection config and event loop
 
     Parameters
     ----------
     db_connection_config : dict
         database connection configuration dictionary, by default None
-    query : str
-        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
-    chunksize : int, optional
-        record chunk size, by default None
+        -> optional keys: pool options of DB_ENGINE_DEFAULTS, max_concurrency (by default pool_size + max_overflow)
 
     Returns
     -------
-    pd.DataFrame
-        pandas dataframe with the result set
+    tuple
+        (SQLAlchemy asyncio connection engine, asyncio.Semaphore)
     """
 
-    try:
+    loop_registry = _DB_ASYNC_ENGINE_REGISTRY.setdefault(asyncio.get_running_loop(), {})
+    engine_key = _db_engine_key(db_connection_config)
 
-        # read sql from file
-        if query[-4:].lower() == ".sql":
+    if engine_key not in loop_registry:
 
-            with open(query) as f:
-                sql_string = f.read()
+        # define connection url
+        connection_url = _db_connection_url(db_connection_config, asynchronous=True)
+        if connection_url is None: raise Exception(f"connection type not recognized")
 
-        # collect everything from object
-        elif re.search(f"^\w+(\.)?\w+$", query, flags= re.I):
+        # create connection engine
+        engine_options = _db_engine_options(db_connection_config)
+        db_engine = create_async_engine(connection_url, **engine_options)
 
-            sql_string = f"SELECT * FROM {query}"
+        # bound concurrent statements to the connection pool capacity by default
+        max_concurrency = db_connection_config.get('max_concurrency') or engine_options['pool_size'] + engine_options['max_overflow']
 
-        else:
-            sql_string = query
+        loop_registry[engine_key] = (db_engine, asyncio.Semaphore(max_concurrency))
 
-        # create connection engine
-        db_engine = _db_connection_engine(db_connection_config)
+    return loop_registry[engine_key]
 
 
-        # collect query
-        if chunksize is None: 
-            df = pd.read_sql(text(sql_string), db_engine)
+#############################################################################
+
+async def dispose_async_engines() -> int:
+    """
+    disposes asyncio connection engines of the running event loop
+
+    Returns
+    -------
+    int
+        number of disposed engines
+    """
+
+    loop_registry = _DB_ASYNC_ENGINE_REGISTRY.pop(asyncio.get_running_loop(), {})
+
+    for db_engine, semaphore in loop_registry.values():
+        await db_engine.dispose()
+
+    return len(loop_registry)
+
+
+#############################################################################
+
+def _records_from_dataframe(
+    data: pd.DataFrame=None,
+    data_schema: dict=None
+    ) -> list:
+    """
+    converts DataFrame rows into records of Python values matching the target column types,
+    missing values are converted to None
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        pandas dataframe, by default None
+    data_schema : dict
+        column_name (key) + data_type (value) mapping, by default None
+
+    Returns
+    -------
+    list
+        list of record tuples
+    """
+
+    columns = []
+
+    for (column_name, column_data), data_type in zip(data.items(), data_schema.values()):
+
+        null_mask = column_data.isna().to_numpy()
+
+        # text columns are passed as strings, other types as their Python values
+        if data_type in ["TEXT"] or data_type.startswith("VARCHAR"):
+            values = column_data.astype(str).to_numpy(dtype=object)
+        elif data_type == "INTERVAL":
+            values = column_data.dt.to_pytimedelta().astype(object)
         else:
-            df = pd.DataFrame()
-            for df_chunk in pd.read_sql(text(sql_string), db_engine, chunksize=chunksize):
-                df = pd.concat([df, df_chunk], ignore_index=True)
+            values = column_data.astype(object).to_numpy()
 
-        return df
-    
-    except Exception as e:
-        print(e)
-        return None
+        values[null_mask] = None
+        columns.append(values)
+
+    return list(zip(*columns))
 
 
 #############################################################################
 
 @decorator_timer
-def db_execute(
+async def db_query_async(
     db_connection_config: dict=None,
     query: str=None,
-    ) -> bool:
+    params: dict=None
+    ) -> pd.DataFrame:
     """
-    _summary_
+    asyncio counterpart of db_query, concurrency is bounded by the connection semaphore
 
     Parameters
     ----------
     db_connection_config : dict
         database connection configuration dictionary, by default None
     query : str
-        SQL statement string/file path to SQL file with a single SQL statement string, by default None
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+    params : dict, optional
+        values of :name bind parameters in the query, by default None
 
     Returns
     -------
-    bool
-        True if statement executed successfully
+    pd.DataFrame
+        pandas dataframe with the result set
     """
 
     try:
 
-        # read sql from file
-        if query[-4:].lower() == ".sql":
-
-            with open(query) as f:
-                sql_string = f.read()
-
-        else:
-            sql_string = query
+        # read query
+        sql_string = _db_read_query(query)
 
         # create connection engine
-        db_engine = _db_connection_engine(db_connection_config)
+        db_engine, semaphore = _db_async_connection_engine(db_connection_config)
 
-        with db_engine.connect() as c:
-            c.execute(text(sql_string))
+        # fetch rows on the event loop, the connection is released before the DataFrame is built
+        async with semaphore:
+            async with db_engine.connect() as c:
+                result = await c.execute(_db_text(sql_string), params)
+                column_names, rows = list(result.keys()), result.all()
 
-        return True
+        # pandas conversion runs in a worker thread to keep the event loop responsive, dtypes follow read_sql
+        df = await asyncio.to_thread(pd.DataFrame.from_records, rows, columns=column_names, coerce_float=True)
+
+        return df
     
     except Exception as e:
         print(e)
-        return False
+        return None
 
 
 #############################################################################
 
 @decorator_timer
-def db_create_table(
+async def db_execute_async(
     db_connection_config: dict=None,
-    data_schema: dict=None, 
-    table_address: str=None, 
-    ownership: str=None,
-    normalize_column_names: bool=True
+    query: str=None
     ) -> bool:
     """
-    creates a database table
+    asyncio counterpart of db_execute, concurrency is bounded by the connection semaphore
 
     Parameters
     ----------
     db_connection_config : dict
         database connection configuration dictionary, by default None
-    data_schema : dict
-        column_name (key) + data_type (value) mapping, by default None
-    table_address : str
-        target table address, by default None
-    ownership : str, optional
-        table ownership assignment, by default None
-    normalize_column_names : bool, optional
-        column names normalized to lower case, special characters replaced with _
+    query : str
+        SQL statement string/file path to SQL file with SQL statements, by default None
 
     Returns
     -------
     bool
-        True if table created successfully
-    """
-
-    # join column definitions into SQL statement 
-    if normalize_column_names == True:
-        sql_columns_defintion = ",\n".join([f"{normalize_key(column_name)} {data_type}" for column_name, data_type in data_schema.items()])
-
-    else:
-        sql_columns_defintion = ",\n".join([f"{column_name} {data_type}" for column_name, data_type in data_schema.items()])
-
-    # generate table definition script
-    sql_table_definition = f"""
-    CREATE TABLE {table_address}(
-        {sql_columns_defintion}
-    );
+        True if statement executed successfully
     """
 
-    # assign ownership
-    if ownership is not None:
-        ownership_assignment = f"ALTER TABLE {table_address} OWNER TO {ownership};"
-    else: 
-        ownership_assignment = ""
-
-    # execute statement
-    sql_execute_statement = sql_table_definition + "\n" + ownership_assignment
-    db_execute(db_connection_config, sql_execute_statement)
-
-    return True
-
-
-#############################################################################
+    try:
 
-def _psql_insert_copy(
-    table_name: str=None,
-    db_engine: object=None,
-    column_names: list=None,
-    data_rows   
-    ):
+        # read sql from file
+        if query[-4:].lower() == ".sql":
 
-    # gets DBAPI connection that can provide a cursor
-    dbapi_connection = db_engine.connection
+            sql_string = _db_read_sql_file(query)
 
-    with dbapi_connection.cursor() as cur:
-        string_buffer = StringIO()
-        writer = csv.writer(string_buffer)
-        writer.writerows(data_rows)
-        string_buffer.seek(0)
+        else:
+            sql_string = query
 
-        data_points = ', '.join('"{}"'.format(k) for k in column_names)
+        # create connection engine
+        db_engine, semaphore = _db_async_connection_engine(db_connection_config)
 
-        if table_name.schema:
-            table_address = f'{table_name.schema}.{table_name.name}'
-        else:
-            table_address = table_name.name
+        # execute through the driver connection, which accepts multiple statements
+        async with semaphore:
+            async with db_engine.begin() as c:
+                raw_connection = await c.get_raw_connection()
+                await raw_connection.driver_connection.execute(sql_string)
 
-        psql_statement = f'COPY {table_address} ({data_points}) FROM STDIN WITH CSV'
-        cur.copy_expert(sql=psql_statement, file=string_buffer)
+        # cached table metadata may be outdated after DDL
+        if re.search(DDL_PATTERN, sql_string, flags=re.I):
+            db_metadata_invalidate(db_connection_config)
 
-    return True
+        return True
+    
+    except Exception as e:
+        print(e)
+        return False
 
 
 #############################################################################
 
 @decorator_timer
-def db_upload(
+async def db_upload_async(
     db_connection_config: dict=None,
     data: pd.DataFrame=None,
     target_table: str=None,
     if_exists: str="fail",
     chunksize: int=None,
-    normalize_column_names: bool=True,
-    **kwargs
+    normalize_column_names: bool=True
     ) -> bool:
     """
-    uploads data from Pandas DataFrame into a database table
-    
+    asyncio counterpart of db_upload, data is loaded by binary COPY of the asyncpg driver,
+    table preparation and load run in a single transaction
+
     Parameters
     ----------
     db_connection_config : dict
@@ -298,7 +4590,9 @@ def db_upload(
         -> 'replace' - existing table is dropped and new one created based on the input data
         -> 'append' 
     chunksize : int, optional
-        _description_, by default None
+        number of records converted per COPY call, by default None (COPY_SLICE_SIZE)
+    normalize_column_names : bool, optional
+        column names normalized to lower case, special characters replaced with _
 
     Returns
     -------
@@ -307,29 +4601,15 @@ def db_upload(
     """
 
     try:
-        
-        # read data schema
-        input_data_schema = data.dtypes.astype(str).to_dict()
-
-        # read data mapping dictionary
-        datatype_mapping = DATATYPE_MAPPING[db_connection_config['type']]
-
-        # translate 
-        sql_data_schema = {}
-        for column_name, data_type in input_data_schema.items():
-            sql_data_schema[column_name] = datatype_mapping[data_type] if data_type in data_type.keys() else datatype_mapping['object']
-        
-        # create connection engine
-        db_engine = _db_connection_engine(db_connection_config)
 
-        # check if table exists
-        query = f"SELECT 1 FROM {target_table}"
-        table_exists_check = db_query(db_connection_config, query)
+        # translate data schema
+        sql_data_schema = _db_sql_data_schema(data, db_connection_config['type'])
 
-        # check if table already exists
-        if table_exists_check is None: raise Exception("unable to connect to database")
-        elif table_exists_check[0,0] == 1: table_exists = True
-        else: table_exists = False
+        # match column names of the created table
+        if normalize_column_names == True:
+            column_names = [normalize_key(column_name) for column_name in data.columns]
+        else:
+            column_names = list(data.columns)
 
         # extract table schema
         table_address = target_table.split('.')
@@ -340,55 +4620,48 @@ def db_upload(
             table_schema = db_connection_config.get('default_schema')
             table_name = table_address[0]
 
-        
-        if table_exists == True:
-
-            if if_exists == 'fail':
-                raise Exception(f"table {target_table} already exists -> cancelling data upload")
-            
-            elif if_exists == 'replace':
+        slice_size = chunksize or COPY_SLICE_SIZE
 
-                # drop table
-                sql_statement = f"DROP TABLE {target_table};"
-                db_execute(db_connection_config, sql_statement)
+        # create connection engine
+        db_engine, semaphore = _db_async_connection_engine(db_connection_config)
 
-                # create table
-                db_create_table(
-                    db_connection_config=db_connection_config,
-                    data_schema=sql_data_schema,
-                    table_address=target_table,
-                    db_engine = db_engine,
-                    ownership=db_connection_config.get('ownership'),
-                    normalize_column_names=normalize_column_names
-                    )
+        async with semaphore:
+            async with db_engine.begin() as c:
+                raw_connection = await c.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
 
-        elif table_exists == False:
+                # check if table already exists
+                table_exists = await driver_connection.fetchval("SELECT to_regclass($1) IS NOT NULL", target_table)
 
-            # create table
-            db_create_table(
-                db_connection_config=db_connection_config,
-                data_schema=sql_data_schema,
-                table_address=target_table,
-                db_engine = db_engine,
-                ownership=db_connection_config.get('ownership'),
-                normalize_column_names=normalize_column_names
-                )
+                if table_exists == True and if_exists == 'fail':
+                    raise Exception(f"table {target_table} already exists -> cancelling data upload")
 
+                elif table_exists == True and if_exists == 'replace':
+                    await driver_connection.execute(f"DROP TABLE {target_table};")
 
-        # specify upload method for a given database type
-        if db_connection_config['type'].lower() == "postgres":
+                # create table
+                if table_exists == False or if_exists == 'replace':
+                    await driver_connection.execute(_db_table_definition(
+                        data_schema=sql_data_schema,
+                        table_address=target_table,
+                        ownership=db_connection_config.get('ownership'),
+                        normalize_column_names=normalize_column_names
+                        ))
 
-            # upload data
-            data.to_sql(
-                name=table_name,
-                con=db_engine,
-                schema=table_schema,
-                method=_psql_insert_copy,
-                if_exists='append',
-                index=False
-                )
+                # upload data slices, records are converted in a worker thread to keep the event loop responsive
+                for start in range(0, len(data), slice_size):
+                    records = await asyncio.to_thread(_records_from_dataframe, data.iloc[start:start + slice_size], sql_data_schema)
+                    await driver_connection.copy_records_to_table(
+                        table_name,
+                        records=records,
+                        columns=column_names,
+                        schema_name=table_schema
+                        )
 
+        db_metadata_invalidate(db_connection_config, target_table)
 
         return True
-
-
+    
+    except Exception as e:
+        print(e)
+        return False
@@ -0,0 +1,559 @@
+from dept.base import *
+from dept.modules.database import _db_connection_engine, _db_read_query, _db_subquery, _psql_render_params, _psql_copy_stream, db_query_iter
+from dept.modules.database import PSQL_OID_DTYPE_MAPPING
+from dept.modules.aws import _aws_connection, _S3MultipartWriter, _s3_object_slices, s3_scan_repository, S3_PART_SIZE, S3_UPLOAD_CONCURRENCY
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import csv
+
+#############################################################################
+# DB -> S3
+#############################################################################
+
+def _psql_copy_to_stream(
+    db_engine: object=None,
+    sql_string: str=None,
+    target_stream: object=None
+    ) -> bool:
+    """
+    streams query result set as CSV with header through COPY TO STDOUT into a writable binary stream,
+    the server sends rows as they are produced and the client never holds the whole result set
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    sql_string : str
+        SQL query string, by default None
+    target_stream : object
+        writable binary file object, by default None
+
+    Returns
+    -------
+    bool
+        True upon success
+    """
+
+    # COPY does not accept statement terminators inside the query
+    sql_string = sql_string.strip().rstrip(';')
+
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+        with dbapi_connection.cursor() as cur:
+            cur.copy_expert(sql=f"COPY ({sql_string}) TO STDOUT WITH (FORMAT csv, HEADER)", file=target_stream)
+        dbapi_connection.commit()
+
+    finally:
+        dbapi_connection.close()
+
+    return True
+
+
+#############################################################################
+
+def _psql_parquet_types(
+    db_engine: object=None,
+    sql_string: str=None
+    ) -> dict:
+    """
+    reads result column types of a query without fetching rows and maps them to Arrow types,
+    so Parquet columns do not depend on the values of the first chunk
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    sql_string : str
+        SQL query string without bind parameters, by default None
+
+    Returns
+    -------
+    dict
+        column_name (key) + Arrow data type (value) mapping, None for types inferred from the data
+    """
+
+    import pyarrow as pa
+
+    arrow_types = {
+        "bool": pa.bool_(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "date": pa.date32(),
+        "datetime64[ns]": pa.timestamp('ns'),
+        "datetime64[ns, UTC]": pa.timestamp('ns', tz='UTC'),
+        "timedelta64[ns]": pa.duration('ns')
+    }
+
+    # text, varchar, bpchar, name
+    text_oids = [25, 1043, 1042, 19]
+
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+        with dbapi_connection.cursor() as cur:
+            cur.execute(f"SELECT * FROM {_db_subquery(sql_string)} LIMIT 0")
+            column_oids = {d.name: d.type_code for d in cur.description}
+        dbapi_connection.rollback()
+
+    finally:
+        dbapi_connection.close()
+
+    return {
+        k: pa.string() if v in text_oids else arrow_types.get(PSQL_OID_DTYPE_MAPPING.get(v))
+        for k, v in column_oids.items()
+    }
+
+
+#############################################################################
+
+def _parquet_write_chunks(
+    df_chunks=None,
+    target_stream: object=None,
+    compression: str=None,
+    column_types: dict=None
+    ) -> int:
+    """
+    writes DataFrame chunks as row groups of a single Parquet file into a writable binary stream
+
+    Parameters
+    ----------
+    df_chunks : iterable
+        pandas dataframe chunks, by default None
+    target_stream : object
+        writable binary file object, by default None
+    compression : str, optional
+        Parquet column compression codec, by default None
+    column_types : dict, optional
+        column_name (key) + Arrow data type (value) mapping of the file schema, by default None
+        -> columns missing from the mapping are typed by the first chunk and later chunks are cast to it
+
+    Returns
+    -------
+    int
+        number of records written
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet_writer = None
+    record_count = 0
+
+    try:
+        for df_chunk in df_chunks:
+
+            # file schema is fixed by the first chunk, result column types take precedence over its values
+            if parquet_writer is None:
+                schema = pa.Table.from_pandas(df_chunk, preserve_index=False).schema
+                for k, v in (column_types or {}).items():
+                    if v is not None and k in schema.names:
+                        schema = schema.set(schema.get_field_index(k), pa.field(k, v))
+                parquet_writer = pq.ParquetWriter(target_stream, schema, compression=compression or 'none')
+
+            table = pa.Table.from_pandas(df_chunk, schema=parquet_writer.schema, preserve_index=False)
+
+            parquet_writer.write_table(table)
+            record_count += len(df_chunk)
+
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    return record_count
+
+
+#############################################################################
+
+@decorator_timer
+def db_to_s3(
+    db_connection_config: dict=None,
+    s3_connection_config: dict=None,
+    query: str=None,
+    s3_bucket: str=None,
+    s3_file_path: str=None,
+    file_format: str="csv",
+    compression: str="gzip",
+    chunksize: int=100000,
+    part_size: int=S3_PART_SIZE,
+    max_concurrency: int=S3_UPLOAD_CONCURRENCY,
+    params: dict=None
+    ) -> dict:
+    """
+    exports query result set into an S3 object without local files, the result set is streamed from
+    the database, encoded and uploaded in multipart upload parts while the next part is being encoded
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    query : str
+        SQL query string/file path to SQL file with a single SQL query string/database object address, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_path : str
+        S3 object key of the export, by default None
+    file_format : str, optional
+        export file format, by default "csv"
+        -> 'csv' - [postgres] COPY TO STDOUT output with header, rows never pass through pandas
+        -> 'parquet' - chunks read through a server-side cursor are written as Parquet row groups,
+           [postgres] column types follow the result column types instead of the values of the first chunk
+    compression : str, optional
+        compression codec, by default "gzip"
+        -> 'csv' - ['gzip', None]
+        -> 'parquet' - ['gzip', 'snappy', 'zstd', None] column compression inside the Parquet file
+    chunksize : int, optional
+        number of records per Parquet row group, by default 100000
+    part_size : int, optional
+        multipart upload part size in bytes, by default S3_PART_SIZE
+    max_concurrency : int, optional
+        number of parts uploaded concurrently, by default S3_UPLOAD_CONCURRENCY
+    params : dict, optional
+        values of :name bind parameters in the query, by default None
+
+    Returns
+    -------
+    dict
+        export summary
+        -> {"s3_bucket": str, "s3_file_path": str, "parts": int, "size": int}
+    """
+
+    try:
+
+        if file_format == 'csv' and compression not in ['gzip', None]:
+            raise Exception(f"compression {compression} is not supported for csv exports")
+
+        # read query
+        sql_string = _db_read_query(query)
+
+        # establish S3 client connection
+        s3 = _aws_connection(s3_connection_config, 's3', 'client')
+
+        # open multipart upload
+        s3_stream = _S3MultipartWriter(s3, s3_bucket, s3_file_path, part_size, max_concurrency)
+
+    except Exception as e:
+        print(f"failed to start export into S3: {s3_bucket}/{s3_file_path}")
+        print(e)
+        raise ValueError
+
+    try:
+
+        if file_format == 'csv':
+
+            if db_connection_config['type'].lower() != 'postgres':
+                raise Exception(f"csv exports are not supported for {db_connection_config['type']} connections")
+
+            db_engine = _db_connection_engine(db_connection_config)
+
+            # COPY cannot bind parameters
+            if params is not None:
+                sql_string = _psql_render_params(db_engine, sql_string, params)
+
+            # compress on the fly between COPY and the multipart stream
+            if compression == 'gzip':
+                with gzip.GzipFile(fileobj=s3_stream, mode='wb', compresslevel=6) as gzip_stream:
+                    _psql_copy_to_stream(db_engine, sql_string, gzip_stream)
+            else:
+                _psql_copy_to_stream(db_engine, sql_string, s3_stream)
+
+        elif file_format == 'parquet':
+
+            # type Parquet columns from the result columns, chunks may hold only missing values of a column
+            column_types = None
+            if db_connection_config['type'].lower() == 'postgres':
+                db_engine = _db_connection_engine(db_connection_config)
+                probe_string = _psql_render_params(db_engine, sql_string, params) if params is not None else sql_string
+                column_types = _psql_parquet_types(db_engine, probe_string)
+
+            df_chunks = db_query_iter(db_connection_config, sql_string, chunksize=chunksize, params=params)
+            _parquet_write_chunks(df_chunks, s3_stream, compression, column_types)
+
+        else:
+            raise Exception(f"file format {file_format} is not supported")
+
+        # publish object
+        s3_stream.close()
+
+    except Exception as e:
+        s3_stream.abort()
+        print(f"failed to export into S3: {s3_bucket}/{s3_file_path}")
+        print(e)
+        raise ValueError
+
+    return {
+        "s3_bucket": s3_bucket,
+        "s3_file_path": s3_file_path,
+        "parts": len(s3_stream.futures),
+        "size": s3_stream.tell()
+    }
+
+
+#############################################################################
+# S3 -> DB
+#############################################################################
+
+def _csv_header_split(
+    copy_slices=None
+    ) -> tuple:
+    """
+    separates CSV header from streamed content slices
+
+    Parameters
+    ----------
+    copy_slices : iterable
+        CSV content byte slices, by default None
+
+    Returns
+    -------
+    tuple
+        (column names, iterator of content slices without header)
+    """
+
+    copy_slices = iter(copy_slices)
+    header = b''
+
+    # read until the end of the first line
+    for copy_slice in copy_slices:
+        header += copy_slice
+        if b'\n' in header: break
+
+    header, _, content = header.partition(b'\n')
+    column_names = next(csv.reader([header.decode('utf-8-sig').rstrip('\r')]), [])
+
+    def content_slices():
+        if content: yield content
+        yield from copy_slices
+
+    return column_names, content_slices()
+
+
+#############################################################################
+
+def _psql_copy_s3_object(
+    db_engine: object=None,
+    s3_client: object=None,
+    s3_bucket: str=None,
+    s3_file_path: str=None,
+    table_address: str=None,
+    column_names: list=None,
+    header: bool=True,
+    compression: str="infer",
+    normalize_column_names: bool=True
+    ) -> list:
+    """
+    streams CSV S3 object into a table through COPY FROM STDIN on one pooled connection in a single transaction,
+    empty objects are skipped
+
+    Parameters
+    ----------
+    db_engine : object
+        SQLAlchemy database connection engine, by default None
+    s3_client : object
+        S3 client, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_path : str
+        S3 object key, by default None
+    table_address : str
+        target table address, by default None
+    column_names : list, optional
+        target column names, by default None (header of the object)
+    header : bool, optional
+        first line of the object is a header, by default True
+    compression : str, optional
+        compression of the object, by default "infer" (gzip for .gz keys)
+    normalize_column_names : bool, optional
+        header column names normalized to lower case, special characters replaced with _
+
+    Returns
+    -------
+    list
+        loaded target column names, None if the object is empty
+    """
+
+    if compression == 'infer':
+        compression = 'gzip' if s3_file_path.lower().endswith('.gz') else None
+
+    copy_slices = _s3_object_slices(s3_client, s3_bucket, s3_file_path, compression)
+
+    # read target columns from the header
+    if header == True:
+        header_names, copy_slices = _csv_header_split(copy_slices)
+
+        # objects without a header line hold no rows
+        if len(header_names) == 0:
+            print(f"skipping empty S3 object: {s3_bucket}/{s3_file_path}")
+            return None
+
+        if column_names is None:
+            column_names = [normalize_key(k) for k in header_names] if normalize_column_names == True else header_names
+
+    if column_names is None:
+        raise Exception(f"column_names are required for {s3_file_path} without header")
+
+    dbapi_connection = db_engine.raw_connection()
+
+    try:
+
+        # S3 reads overlap with COPY through the background serializer of the copy stream
+        _psql_copy_stream(
+            dbapi_connection=dbapi_connection,
+            table_address=table_address,
+            column_names=column_names,
+            copy_slices=copy_slices
+            )
+        dbapi_connection.commit()
+
+    except Exception:
+        dbapi_connection.rollback()
+        raise
+
+    finally:
+        dbapi_connection.close()
+
+    return column_names
+
+
+#############################################################################
+
+@decorator_timer
+def s3_to_db(
+    s3_connection_config: dict=None,
+    db_connection_config: dict=None,
+    s3_bucket: str=None,
+    s3_file_path=None,
+    target_table: str=None,
+    s3_path: str=None,
+    file_types: list=None,
+    regex_pattern: str=None,
+    parallelism: int=4,
+    column_names: list=None,
+    header: bool=True,
+    compression: str="infer",
+    normalize_column_names: bool=True
+    ) -> int:
+    """
+    loads CSV S3 objects into an existing table without local files or pandas, object bodies 
+    are streamed and decompressed straight into COPY FROM STDIN
+        -> single object is loaded in one transaction
+        -> multiple objects are loaded concurrently into an UNLOGGED staging table, 
+           the staging rows are published in one final transaction (all-or-nothing)
+           -> columns missing from all objects get the defaults of the target table
+        -> empty objects are skipped
+
+    Parameters
+    ----------
+    s3_connection_config : dict
+        S3 connection configuration, by default None
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    s3_bucket : str
+        S3 bucket name, by default None
+    s3_file_path : str/list, optional
+        S3 object key/list of S3 object keys, by default None
+    target_table : str
+        target table address, by default None
+    s3_path : str, optional
+        S3 path scanned for objects by s3_scan_repository if s3_file_path is not provided, by default None
+    file_types : list, optional
+        list of file types to pick while scanning, by default None
+    regex_pattern : str, optional
+        object key regex pattern to use while scanning, by default None
+    parallelism : int, optional
+        number of objects loaded concurrently over pooled connections, by default 4
+    column_names : list, optional
+        target column names, by default None (header of each object)
+    header : bool, optional
+        first line of each object is a header, by default True
+    compression : str, optional
+        compression of the objects, by default "infer"
+        -> 'infer' - gzip for keys ending with .gz
+        -> ['gzip', None]
+    normalize_column_names : bool, optional
+        header column names normalized to lower case, special characters replaced with _
+
+    Returns
+    -------
+    int
+        number of loaded objects, empty objects excluded
+    """
+
+    try:
+
+        if db_connection_config['type'].lower() != 'postgres':
+            raise Exception(f"S3 loads are not supported for {db_connection_config['type']} connections")
+
+        # establish S3 client connection, clients are shared by the load threads
+        s3 = _aws_connection(s3_connection_config, 's3', 'client')
+
+        # collect object keys
+        if s3_file_path is None:
+            s3_objects = s3_scan_repository(s3_connection_config, s3_bucket, s3_path, file_types, regex_pattern)
+            s3_file_paths = [obj['Key'] for obj in s3_objects]
+        elif isinstance(s3_file_path, str):
+            s3_file_paths = [s3_file_path]
+        else:
+            s3_file_paths = list(s3_file_path)
+
+        if len(s3_file_paths) == 0: return 0
+
+        # create connection engine
+        db_engine = _db_connection_engine(db_connection_config)
+
+        load_arguments = dict(
+            column_names=column_names, 
+            header=header, 
+            compression=compression, 
+            normalize_column_names=normalize_column_names
+        )
+
+        # load single object directly
+        if len(s3_file_paths) == 1:
+            loaded_columns = _psql_copy_s3_object(db_engine, s3, s3_bucket, s3_file_paths[0], target_table, **load_arguments)
+            return int(loaded_columns is not None)
+
+        # define staging table address next to the target table
+        table_name = target_table.split('.')[-1]
+        staging_address = f"{target_table[:-len(table_name)]}{table_name[:40]}__stage_{uuid.uuid4().hex[:8]}"
+
+        with db_engine.begin() as c:
+            c.exec_driver_sql(f"CREATE UNLOGGED TABLE {staging_address} (LIKE {target_table} INCLUDING DEFAULTS);")
+
+        try:
+
+            # load objects concurrently
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                futures = [
+                    executor.submit(_psql_copy_s3_object, db_engine, s3, s3_bucket, k, staging_address, **load_arguments) 
+                    for k in s3_file_paths
+                ]
+                loaded_columns = [future.result() for future in futures]
+
+            # publish staging rows of the loaded columns, matched by name rather than by position
+            data_points = ', '.join('"{}"'.format(k) for k in dict.fromkeys(sum([k for k in loaded_columns if k is not None], [])))
+
+            with db_engine.begin() as c:
+                if data_points != '':
+                    c.exec_driver_sql(f"INSERT INTO {target_table} ({data_points}) SELECT {data_points} FROM {staging_address};")
+                c.exec_driver_sql(f"DROP TABLE {staging_address};")
+
+        except Exception:
+
+            # remove staging table, target table stays untouched
+            with db_engine.begin() as c:
+                c.exec_driver_sql(f"DROP TABLE IF EXISTS {staging_address};")
+            raise
+
+        return len([k for k in loaded_columns if k is not None])
+
+    except Exception as e:
+        print(f"failed to load from S3: {s3_bucket}/{s3_file_path or s3_path} into {target_table}")
+        print(e)
+        raise ValueError
+
+
+#############################################################################
+#############################################################################
@@ -0,0 +1,157 @@
+# add parent repository path to find dept
+import sys; sys.path.append('..')
+from dept.base import *
+from dept.modules.database import *
+from dept.modules.database import _db_connection_engine, _psql_copy_dataframe
+from time import perf_counter
+
+#############################################################################
+# BENCHMARKS
+#############################################################################
+
+def benchmark(
+    func,
+    *args,
+    repeat: int=3,
+    setup=None,
+    **kwargs
+    ) -> float:
+    """
+    measures best runtime of a function call
+
+    Parameters
+    ----------
+    func
+        function to benchmark
+    repeat : int, optional
+        number of runs, by default 3
+    setup : optional
+        function called before each run, excluded from the runtime, by default None
+
+    Returns
+    -------
+    float
+        best runtime in seconds
+    """
+
+    runtimes = []
+    for i in range(repeat):
+        if setup is not None: setup()
+        f_start = perf_counter()
+        func(*args, **kwargs)
+        runtimes.append(perf_counter() - f_start)
+
+    return min(runtimes)
+
+
+#############################################################################
+
+def benchmark_db_query_extract_mode(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_benchmark_extract",
+    row_count: int=1000000
+    ) -> dict:
+    """
+    compares db_query read_sql and COPY extract modes on a generated table
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    table_address : str, optional
+        benchmark table address, by default "public.dept_benchmark_extract"
+    row_count : int, optional
+        number of generated rows, by default 1000000
+
+    Returns
+    -------
+    dict
+        best runtime in seconds per extract mode
+    """
+
+    # generate benchmark table
+    db_execute(db_connection_config, f"""
+        DROP TABLE IF EXISTS {table_address};
+        CREATE TABLE {table_address} AS
+        SELECT 
+            g AS id, 
+            random() * 1000 AS amount, 
+            md5(g::text) AS label, 
+            g % 2 = 0 AS flag, 
+            now() - g * interval '1 second' AS created_at
+        FROM generate_series(1, {row_count}) AS g;
+    """)
+
+    results = {
+        extract_mode: benchmark(db_query, db_connection_config, table_address, extract_mode=extract_mode)
+        for extract_mode in ['read_sql', 'copy']
+    }
+
+    # clean up
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+    return results
+
+
+#############################################################################
+
+def benchmark_db_upload_copy_format(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_benchmark_upload",
+    row_count: int=1000000,
+    column_count: int=50
+    ) -> dict:
+    """
+    compares CSV and binary COPY formats used by db_upload on a generated wide numeric frame
+
+    Parameters
+    ----------
+    db_connection_config : dict
+        database connection configuration dictionary, by default None
+    table_address : str, optional
+        benchmark table address, by default "public.dept_benchmark_upload"
+    row_count : int, optional
+        number of generated rows, by default 1000000
+    column_count : int, optional
+        number of generated float columns, by default 50
+
+    Returns
+    -------
+    dict
+        best runtime in seconds per COPY format
+    """
+
+    # generate wide numeric frame
+    data = pd.DataFrame(np.random.rand(row_count, column_count), columns=[f"c{i}" for i in range(column_count)])
+    data["id"] = np.arange(row_count)
+
+    # create benchmark table
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+    db_create_table(db_connection_config, {k: DATATYPE_MAPPING["postgres"][str(v)] for k, v in data.dtypes.items()}, table_address)
+    db_engine = _db_connection_engine(db_connection_config)
+
+    # every run loads into an empty table
+    results = {
+        copy_format: benchmark(
+            _psql_copy_dataframe, db_engine, table_address, list(data.columns), data, copy_format=copy_format,
+            setup=lambda: db_execute(db_connection_config, f"TRUNCATE TABLE {table_address};")
+            )
+        for copy_format in ['csv', 'binary']
+    }
+
+    # clean up
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+    return results
+
+
+#############################################################################
+#############################################################################
+
+
+if __name__ == "__main__":
+
+    db_connection_config = read_file(f"{DEPT_PATH}/configs/postgres.json")
+
+    print_dict(benchmark_db_query_extract_mode(db_connection_config))
+    print_dict(benchmark_db_upload_copy_format(db_connection_config))
@@ -2,12 +2,340 @@
 import sys; sys.path.append('..')
 from dept.base import *
 from dept.modules.aws import *
+from dept.modules.aws import _regex_literal_prefix
+from dept.modules.database import *
+from dept.modules.database import _db_connection_engine, _row_hash_token
+from decimal import Decimal
 
+#############################################################################
+# DATABASE
+#############################################################################
 
-if __name__ == "__main__":
+def check_row_hash_float_tokens():
+    """
+    checks float row hash tokens against postgres float8::text output
+    """
 
-    s3_connection_config = read_file(f"{DEPT_PATH}/configs/aws.json")
-    file_details = s3_scan_repository(
+    expected_tokens = {
+        42.0: '42',
+        123.25: '123.25',
+        0.0001: '0.0001',
+        1e-05: '1e-05',
+        999999999999999.9: '999999999999999.9',
+        1e15: '1e+15',
+        1.5e15: '1.5e+15',
+        -1.5e15: '-1.5e+15',
+        1234567890123456.8: '1.2345678901234568e+15',
+        2.5e16: '2.5e+16',
+        float('inf'): 'Infinity'
+    }
+
+    for value, expected_token in expected_tokens.items():
+        assert _row_hash_token(value) == expected_token, f"{value}: {_row_hash_token(value)} != {expected_token}"
+
+
+#############################################################################
+
+def check_copy_extract_dtypes(
+    db_connection_config: dict=None
+    ):
+    """
+    checks that extract_mode='copy' returns the dtypes and values of read_sql
+    """
+
+    query = """
+    SELECT * FROM (VALUES 
+        (1, 1.5::float8, 1.25::numeric, true, 'x', '2020-01-01'::date, '2020-01-01 01:00'::timestamp, 
+         '2020-01-01 01:00+00'::timestamptz, '1 hour 30 minutes'::interval, '{"a": 1}'::jsonb),
+        (NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL)
+    ) AS t(i, f, n, b, s, d, ts, tstz, iv, j) -- trailing comment
+    """
+
+    df_read_sql = db_query(db_connection_config, query)
+    df_copy = db_query(db_connection_config, query, extract_mode='copy')
+
+    assert dict(df_copy.dtypes) == dict(df_read_sql.dtypes), f"{dict(df_copy.dtypes)} != {dict(df_read_sql.dtypes)}"
+    assert df_copy.iloc[:1].to_dict('records') == df_read_sql.iloc[:1].to_dict('records')
+    assert df_copy.iloc[1].isna().all()
+
+
+#############################################################################
+
+def check_copy_format_upload_equivalence(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_check_copy_format"
+    ):
+    """
+    checks that CSV and binary COPY load identical rows into existing typed columns, 
+    missing values as NULL and empty strings as empty strings
+    """
+
+    data = pd.DataFrame({
+        "id": [1, 2, 3],
+        "amount": [1.25, None, 0.001],
+        "ratio": [0.1, 1e-05, None],
+        "label": ["x", "", None]
+    })
+
+    table_rows = {}
+
+    for copy_format in ['csv', 'binary']:
+
+        db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+        db_execute(db_connection_config, f"CREATE TABLE {table_address} (id int4, amount numeric(12, 3), ratio float4, label varchar(10));")
+
+        assert db_upload(db_connection_config, data, table_address, if_exists='append', copy_format=copy_format)
+
+        table_rows[copy_format] = db_query(
+            db_connection_config, 
+            f"SELECT id, amount::text, ratio::text, label, label IS NULL AS label_null FROM {table_address} ORDER BY id;"
+            ).to_dict('records')
+
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+    assert table_rows['csv'] == table_rows['binary'], f"{table_rows['csv']} != {table_rows['binary']}"
+    assert [r['label_null'] for r in table_rows['csv']] == [False, False, True]
+
+
+#############################################################################
+
+def check_upsert_duplicate_keys(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_check_upsert"
+    ):
+    """
+    checks that upserts into new and existing tables keep the last row of duplicate keys
+    """
+
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+    # new table is created with its unique index
+    data = pd.DataFrame({"id": [1, 2, 1], "value": ["a", "b", "c"]})
+    assert db_upload(db_connection_config, data, table_address, if_exists='upsert', key_columns=['id'])
+
+    # existing rows are updated, new rows inserted
+    data = pd.DataFrame({"id": [2, 3, 2, 3], "value": ["d", "e", "f", "g"]})
+    assert db_upload(db_connection_config, data, table_address, if_exists='upsert', key_columns=['id'])
+
+    table_rows = db_query(db_connection_config, f"SELECT id, value FROM {table_address} ORDER BY id;").to_dict('records')
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+    assert table_rows == [{"id": 1, "value": "c"}, {"id": 2, "value": "f"}, {"id": 3, "value": "g"}], table_rows
+
+
+#############################################################################
+
+def check_query_cache_staleness(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_check_query_cache"
+    ):
+    """
+    checks that cached result sets are only served within the caller's cache_ttl and per extract_mode
+    """
+
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address}; CREATE TABLE {table_address} AS SELECT 1 AS id;")
+    db_query_cache_invalidate(table_address)
+    query = f"SELECT id FROM {table_address}"
+
+    assert len(db_query(db_connection_config, query, cache_ttl=3600)) == 1
+
+    db_execute(db_connection_config, f"INSERT INTO {table_address} VALUES (2);")
+
+    # cached entry is served within the ttl, other extract modes are cached separately
+    assert len(db_query(db_connection_config, query, cache_ttl=3600)) == 1
+    assert len(db_query(db_connection_config, query, cache_ttl=3600, extract_mode='copy')) == 2
+
+    # a shorter ttl of the caller rejects the older entry
+    assert len(db_query(db_connection_config, query, cache_ttl=0)) == 2
+
+    db_query_cache_invalidate(table_address)
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+
+#############################################################################
+
+def check_table_metadata_staleness(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_check_metadata"
+    ):
+    """
+    checks that missing tables are not cached and uploads read table metadata changed by other sessions
+    """
+
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+    assert db_table_exists(db_connection_config, table_address) == False
+
+    # statements of other sessions do not invalidate cached metadata like db_execute does
+    db_engine = _db_connection_engine(db_connection_config)
+    with db_engine.begin() as c:
+        c.execute(text(f"CREATE TABLE {table_address} (id int PRIMARY KEY, value text);"))
+
+    assert db_table_exists(db_connection_config, table_address) == True
+
+    with db_engine.begin() as c:
+        c.execute(text(f"ALTER TABLE {table_address} ADD COLUMN amount numeric;"))
+
+    # binary COPY fails on column types taken from outdated metadata
+    data = pd.DataFrame({"id": [1], "value": ["a"], "amount": [1.5]})
+    assert db_upload(db_connection_config, data, table_address, if_exists='append', copy_format='binary')
+
+    table_rows = db_query(db_connection_config, f"SELECT id, value, amount::text FROM {table_address};").to_dict('records')
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+    assert table_rows == [{"id": 1, "value": "a", "amount": "1.5"}], table_rows
+
+
+#############################################################################
+
+def check_delta_unchanged_rows(
+    db_connection_config: dict=None,
+    table_address: str="public.dept_check_delta"
+    ):
+    """
+    checks that numeric, real and double precision values read back from a table are not detected as changes
+    """
+
+    data = pd.DataFrame({
+        "id": [1, 2, 3, 4],
+        "amount": [0.1 + 0.2, 1.5, 1e20, None],
+        "ratio": [0.1, 1234567.0, 1.2e-05, None],
+        "price": [0.1, 1e15, 1234567890123456.8, None],
+        "quantity": pd.array([1, 2, None, 4], dtype="Int64")
+    })
+
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+    db_execute(db_connection_config, f"CREATE TABLE {table_address} (id int PRIMARY KEY, amount numeric(30, 3), ratio real, price float8, quantity bigint);")
+    assert db_upload(db_connection_config, data, table_address, if_exists='append')
+
+    # uploaded DataFrame and table content read back as floats/Decimals hash like the table rows
+    df_table = db_query(db_connection_config, f"SELECT * FROM {table_address} ORDER BY id;")
+    df_decimal = data.assign(amount=[Decimal('0.300'), Decimal('1.50'), Decimal('1E+20'), None])
+
+    for df in [data, df_table, df_decimal]:
+        table_diff = db_table_diff(db_connection_config, df, table_address, ['id'])
+        assert all(len(v) == 0 for v in table_diff.values()), table_diff
+
+    # changed values are detected
+    table_diff = db_table_diff(db_connection_config, data.assign(ratio=[0.1, 1234568.0, 1.2e-05, None]), table_address, ['id'])
+    assert table_diff['updated']['id'].tolist() == [2], table_diff
+
+    db_execute(db_connection_config, f"DROP TABLE IF EXISTS {table_address};")
+
+
+#############################################################################
+# AWS
+#############################################################################
+
+def check_regex_literal_prefix():
+    """
+    checks that listing prefixes derived from regex patterns are shared by all matching keys
+    """
+
+    expected_prefixes = {
+        None: '',
+        'data/2024': '',
+        '^data/2024/': 'data/2024/',
+        '^data/\\d{4}/': 'data/',
+        '^data\\.csv': 'data.csv',
+        '^data/x?y': 'data/',
+        '^data/x*': 'data/',
+        '^data/x+': 'data/x',
+        '^data/x{0,2}': 'data/',
+        '^data/(a|b)': 'data/',
+        '^a/|^b/': '',
+        '^data/[a|b]': 'data/',
+        '^data/\\|x': 'data/|x',
+        '^data/[ab]': 'data/',
+        '^data.csv': 'data'
+    }
+
+    for regex_pattern, expected_prefix in expected_prefixes.items():
+        assert _regex_literal_prefix(regex_pattern) == expected_prefix, f"{regex_pattern}: {_regex_literal_prefix(regex_pattern)} != {expected_prefix}"
+
+    object_keys = ['data/2024/a.csv', 'data/y', 'data/xxy', 'data/', 'data.csv', 'dataxcsv', 'b/data/2024/', 'data/b']
+
+    for regex_pattern in expected_prefixes:
+        if regex_pattern is None: continue
+        for k in object_keys:
+            if re.search(regex_pattern, k): assert k.startswith(_regex_literal_prefix(regex_pattern)), f"{regex_pattern}: {k}"
+
+
+#############################################################################
+
+def check_s3_scan_repository(
+    s3_connection_config: dict=None
+    ):
+    """
+    checks that the repository of the connection config can be scanned
+    """
+
+    s3_scan_repository(
         s3_connection_config = s3_connection_config,
         s3_bucket=s3_connection_config.get('bucket_name')
-    )
\ No newline at end of file
+    )
+
+
+#############################################################################
+
+def check_s3_sync_delete_report(
+    s3_connection_config: dict=None
+    ):
+    """
+    checks that s3_sync counts deletions confirmed by S3 and skips deletions after failed transfers
+    """
+
+    import tempfile
+
+    s3_bucket = s3_connection_config.get('bucket_name')
+    s3_path = f"dept_checks/sync_{uuid.uuid4().hex[:8]}"
+
+    with tempfile.TemporaryDirectory() as local_path:
+
+        upload_path = os.path.join(local_path, 'upload')
+        download_path = os.path.join(local_path, 'download')
+
+        os.makedirs(upload_path)
+        for file_name in ['a.txt', 'b.txt']:
+            with open(os.path.join(upload_path, file_name), 'w') as f: f.write(file_name)
+
+        sync_report = s3_sync(s3_connection_config, s3_bucket, s3_path, upload_path, direction='upload')
+        assert sync_report['transfer_results']['succeeded'] == 2, sync_report
+
+        # files missing locally are deleted from S3
+        os.remove(os.path.join(upload_path, 'a.txt'))
+        sync_report = s3_sync(s3_connection_config, s3_bucket, s3_path, upload_path, direction='upload', delete=True)
+        assert sync_report['deleted'] == 1 and sync_report['delete_errors'] == [], sync_report
+
+        # a folder in place of b.txt fails its download, old.txt must survive
+        os.makedirs(os.path.join(download_path, 'b.txt'))
+        with open(os.path.join(download_path, 'old.txt'), 'w') as f: f.write('old.txt')
+
+        sync_report = s3_sync(s3_connection_config, s3_bucket, s3_path, download_path, direction='download', delete=True)
+        assert sync_report['transfer_results']['failed'] == 1 and sync_report['delete_skipped'] == True, sync_report
+        assert os.path.exists(os.path.join(download_path, 'old.txt'))
+
+        # clean up
+        os.remove(os.path.join(upload_path, 'b.txt'))
+        sync_report = s3_sync(s3_connection_config, s3_bucket, s3_path, upload_path, direction='upload', delete=True)
+        assert sync_report['deleted'] == 1, sync_report
+
+
+#############################################################################
+
+if __name__ == "__main__":
+
+    check_row_hash_float_tokens()
+
+    db_connection_config = read_file(f"{DEPT_PATH}/configs/postgres.json")
+    check_copy_extract_dtypes(db_connection_config)
+    check_copy_format_upload_equivalence(db_connection_config)
+    check_upsert_duplicate_keys(db_connection_config)
+    check_query_cache_staleness(db_connection_config)
+    check_table_metadata_staleness(db_connection_config)
+    check_delta_unchanged_rows(db_connection_config)
+
+    check_regex_literal_prefix()
+
+    s3_connection_config = read_file(f"{DEPT_PATH}/configs/aws.json")
+    check_s3_scan_repository(s3_connection_config)
+    check_s3_sync_delete_report(s3_connection_config)